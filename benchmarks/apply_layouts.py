@@ -0,0 +1,43 @@
+"""
+Benchmark the rate at which aircraft layouts can be applied to a schedule of flights.
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.apply_layouts [number of flights]
+"""
+
+import sys
+from benchmarks.utils import use_scratch_database, timer, report, create_reference_data, create_flights, \
+    get_layout_id
+
+use_scratch_database()
+
+from flight_model.model import create_database  # noqa: E402
+from flight_model.logic import apply_aircraft_layout  # noqa: E402
+
+
+def main(number_of_flights):
+    create_database()
+    create_reference_data()
+    flight_ids = create_flights(number_of_flights)
+    a321_layout_id = get_layout_id("A321", "neo")
+    a320_layout_id = get_layout_id("A320", "1")
+
+    timings = {}
+    with timer(timings, "apply"):
+        for flight_id in flight_ids:
+            apply_aircraft_layout(flight_id, a321_layout_id)
+
+    with timer(timings, "swap"):
+        for flight_id in flight_ids:
+            apply_aircraft_layout(flight_id, a320_layout_id)
+
+    report("Apply A321neo layout to flights with no seats", number_of_flights, timings["apply"], "flights")
+    report("Swap A321neo layout for A320 layout", number_of_flights, timings["swap"], "flights")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,188 @@
+"""
+Benchmark the rate at which boarding cards are generated for a full flight. A stub card generator plugin is used so
+the timings reflect the cost of building the card details and writing the card files rather than rendering.
+
+The same measurement is made writing the cards to a single archive rather than one file per seat. The time taken to
+regenerate the cards incrementally after a single passenger's details change is also measured.
+
+A second, CPU-bound stub plugin is then used to compare the serial path with rendering on thread and process pools and
+report the wall-clock speedup of each.
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.boarding_cards [number of runs] [number of workers]
+"""
+
+import datetime
+import os
+import sys
+import sqlalchemy as db
+from benchmarks.utils import use_scratch_database, timer, report, create_reference_data, create_flights
+
+use_scratch_database()
+
+from flight_model.model import create_database, Session, Airline, Flight, Passenger, FlightPassenger  # noqa: E402
+from flight_model.logic import create_layout, add_row_to_layout, apply_aircraft_layout, allocate_seats  # noqa: E402
+from flight_model.logic import BoardingCardsGenerator  # noqa: E402
+from flight_model.logic import boarding_cards_generator  # noqa: E402
+
+CARD_FORMAT = "bench"
+CPU_CARD_FORMAT = "cpu"
+ROWS = 46
+SEAT_LETTERS = "ABCDE"
+
+
+def stub_card_generator(card_details):
+    """
+    Stub card generator plugin that returns the card details as text
+
+    :param card_details: Boarding card details
+    :return: The card details, one per line
+    """
+    return "\n".join(card_details.values())
+
+
+def cpu_card_generator(card_details):
+    """
+    Stub card generator plugin that holds the GIL for a few milliseconds per card, to simulate a rendering plugin
+
+    :param card_details: Boarding card details
+    :return: The card details, one per line
+    """
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return "\n".join(card_details.values())
+
+
+def create_full_flight():
+    """
+    Create a flight with a 230-seat layout and allocate a passenger to every seat
+
+    :return: The flight and a list of its seat numbers
+    """
+    with Session.begin() as session:
+        airline_id = session.query(Airline.id).filter(Airline.name == "EasyJet").scalar()
+
+    aircraft_layout = create_layout(airline_id, "A321", "Benchmark")
+    for row in range(1, ROWS + 1):
+        add_row_to_layout(aircraft_layout.id, row, "Economy", SEAT_LETTERS)
+
+    flight_id = create_flights(1)[0]
+    apply_aircraft_layout(flight_id, aircraft_layout.id)
+
+    seat_numbers = [f"{row}{letter}" for row in range(1, ROWS + 1) for letter in SEAT_LETTERS]
+    with Session.begin() as session:
+        session.execute(db.insert(Passenger), [{
+            "name": f"Passenger {i}",
+            "gender": "M",
+            "dob": datetime.date(1970, 1, 1),
+            "nationality": "UK",
+            "residency": "UK",
+            "passport_number": f"BM{i:06d}"
+        } for i in range(len(seat_numbers))])
+        passenger_ids = [passenger_id for passenger_id, in session.query(Passenger.id).order_by(Passenger.id)]
+        session.execute(db.insert(FlightPassenger), [{"flight_id": flight_id, "passenger_id": passenger_id}
+                                                     for passenger_id in passenger_ids])
+
+    allocate_seats(flight_id, zip(passenger_ids, seat_numbers))
+
+    with Session.begin() as session:
+        flight = session.query(Flight).get(flight_id)
+
+    return flight, seat_numbers
+
+
+def generate_cards(flight, card_format, number_of_runs, **kwargs):
+    """
+    Generate the boarding cards for a flight a number of times
+
+    :param flight: Flight to generate cards for
+    :param card_format: Format of the card generator plugin to use
+    :param number_of_runs: Number of times to generate the cards
+    :param kwargs: Keyword arguments passed to the boarding card generator
+    """
+    for _ in range(number_of_runs):
+        generator = BoardingCardsGenerator(flight.id, card_format, "28A", incremental=False, **kwargs)
+        generator.generate_cards()
+
+
+def remove_cards(flight, seat_numbers, card_format):
+    """
+    Remove the generated cards and their manifest from the data folder
+
+    :param flight: Flight the cards were generated for
+    :param seat_numbers: List of seat numbers
+    :param card_format: Format of the generated cards
+    """
+    for seat_number in seat_numbers:
+        card_file_path = BoardingCardsGenerator.get_boarding_card_path(flight.number,
+                                                                       seat_number,
+                                                                       flight.departure_date,
+                                                                       card_format)
+        if os.path.exists(card_file_path):
+            os.unlink(card_file_path)
+
+    file_paths = [BoardingCardsGenerator.get_manifest_path(flight.number, flight.departure_date, card_format, output)
+                  for output in boarding_cards_generator.OUTPUT_MODES]
+    file_paths.append(BoardingCardsGenerator.get_archive_path(flight.number, flight.departure_date, card_format))
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+
+def main(number_of_runs, number_of_workers):
+    create_database()
+    create_reference_data()
+    flight, seat_numbers = create_full_flight()
+    boarding_cards_generator.card_generator_map[CARD_FORMAT] = stub_card_generator
+    boarding_cards_generator.card_generator_map[CPU_CARD_FORMAT] = cpu_card_generator
+    number_of_cards = number_of_runs * len(seat_numbers)
+
+    timings = {}
+    with timer(timings, "archive"):
+        generate_cards(flight, CARD_FORMAT, number_of_runs, output="archive")
+
+    with timer(timings, "generate"):
+        generate_cards(flight, CARD_FORMAT, number_of_runs)
+
+    # Change the name of one passenger and regenerate the cards incrementally, so only their card is rendered
+    with Session.begin() as session:
+        session.query(Passenger) \
+            .filter(Passenger.id == flight.seats[0].passenger_id) \
+            .update({"name": "Renamed Passenger"}, synchronize_session=False)
+
+    with timer(timings, "incremental"):
+        generator = BoardingCardsGenerator(flight.id, CARD_FORMAT, "28A")
+        generator.generate_cards()
+    remove_cards(flight, seat_numbers, CARD_FORMAT)
+
+    with timer(timings, "serial"):
+        generate_cards(flight, CPU_CARD_FORMAT, number_of_runs)
+
+    for pool in ["thread", "process"]:
+        with timer(timings, pool):
+            generate_cards(flight, CPU_CARD_FORMAT, number_of_runs, workers=number_of_workers, pool=pool)
+    remove_cards(flight, seat_numbers, CPU_CARD_FORMAT)
+
+    report(f"Generate cards for a {len(seat_numbers)}-seat flight (files)", number_of_cards,
+           timings["generate"], "cards")
+    report(f"Generate cards for a {len(seat_numbers)}-seat flight (archive)", number_of_cards,
+           timings["archive"], "cards")
+    report(f"Regenerate after one change ({generator.cards_rendered} rendered)", 1, timings["incremental"],
+           "runs")
+    print(f"    Speedup over full regeneration: "
+          f"{timings['generate'] / number_of_runs / timings['incremental']:.2f}x")
+    report("Render CPU-bound cards serially", number_of_cards, timings["serial"], "cards")
+    for pool in ["thread", "process"]:
+        report(f"Render CPU-bound cards on a {number_of_workers}-worker {pool} pool", number_of_cards,
+               timings[pool], "cards")
+        print(f"    Speedup over serial: {timings['serial'] / timings[pool]:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+         int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count())
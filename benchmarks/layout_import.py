@@ -0,0 +1,134 @@
+"""
+Benchmark the rate at which synthetic aircraft layouts of increasing size can be imported from CSV files, and the
+peak memory allocated by Python while importing each of them, then the time taken to import a folder containing the
+layouts for a whole fleet, reading the files serially and in parallel worker processes. If the openpyxl package is
+installed, the same layouts are also imported from XLSX workbooks.
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.layout_import [largest number of rows] [number of fleet layouts] [workers]
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import tracemalloc
+from benchmarks.utils import use_scratch_database, timer, report
+
+use_scratch_database()
+
+from flight_model.model import create_database  # noqa: E402
+from flight_model.logic import create_airline  # noqa: E402
+from flight_model.data_exchange import import_aircraft_layout_from_stream, import_aircraft_layout_from_workbook, \
+    import_aircraft_layouts_from_folder  # noqa: E402
+
+
+def write_layout_file(folder, number_of_rows, file_name=None):
+    """
+    Write a synthetic layout file with six economy seats in each row
+
+    :param folder: Folder in which to write the file
+    :param number_of_rows: Number of rows in the layout
+    :param file_name: Name of the file or None to name it after the number of rows
+    :return: Path to the layout file
+    """
+    file_path = os.path.join(folder, file_name or f"layout_{number_of_rows}.csv")
+    with open(file_path, mode="wt", encoding="utf-8", newline="") as f:
+        f.write("Row,Class,Seats\r\n")
+        for row in range(1, number_of_rows + 1):
+            f.write(f"{row},Economy,ABCDEF\r\n")
+    return file_path
+
+
+def write_layout_workbook(folder, number_of_rows):
+    """
+    Write a synthetic layout workbook with six economy seats in each row
+
+    :param folder: Folder in which to write the workbook
+    :param number_of_rows: Number of rows in the layout
+    :return: Path to the layout workbook
+    """
+    import openpyxl
+
+    file_path = os.path.join(folder, f"layout_{number_of_rows}.xlsx")
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(["Row", "Class", "Seats"])
+    for row in range(1, number_of_rows + 1):
+        worksheet.append([row, "Economy", "ABCDEF"])
+    workbook.save(file_path)
+    return file_path
+
+
+def import_fleet(number_of_layouts, workers):
+    """
+    Time the import of a folder of layout files for a fleet of aircraft, each with 30 rows, into a new database
+
+    :param number_of_layouts: Number of layout files in the folder
+    :param workers: Number of worker processes used to read the files or None to read them serially
+    :return: Elapsed time in seconds
+    """
+    create_database()
+    create_airline("EasyJet")
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for layout in range(number_of_layouts):
+            write_layout_file(folder, 30, f"easyjet_fleet_{layout}.csv")
+
+        with timer(timings, "import"):
+            results = import_aircraft_layouts_from_folder(folder, workers)
+
+    errors = [result for result in results if result.error]
+    if errors:
+        raise ValueError(f"Unable to import {errors[0].file_name}: {errors[0].error}")
+
+    return timings["import"]
+
+
+def main(largest_number_of_rows, number_of_fleet_layouts, workers):
+    create_database()
+    create_airline("EasyJet")
+
+    sizes = []
+    number_of_rows = 1000
+    while number_of_rows <= largest_number_of_rows:
+        sizes.append(number_of_rows)
+        number_of_rows *= 10
+
+    formats = [("CSV", write_layout_file, import_aircraft_layout_from_stream)]
+    if importlib.util.find_spec("openpyxl"):
+        formats.append(("XLSX", write_layout_workbook, import_aircraft_layout_from_workbook))
+
+    with tempfile.TemporaryDirectory() as folder:
+        for file_format, writer, importer in formats:
+            for number_of_rows in sizes:
+                file_path = writer(folder, number_of_rows)
+                timings = {}
+                with open(file_path, mode="rb") as f, timer(timings, "import"):
+                    importer("EasyJet", f"Synthetic {file_format}", str(number_of_rows), f)
+
+                # Tracing allocations slows the import down, so the memory used is measured using a second import
+                tracemalloc.start()
+                with open(file_path, mode="rb") as f:
+                    importer("EasyJet", f"Traced {file_format}", str(number_of_rows), f)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                report(f"Import {number_of_rows}-row {file_format} layout, peak {peak / 1024 / 1024:.1f} MB",
+                       number_of_rows, timings["import"], "rows")
+
+    report("Import fleet layouts from a folder, serially", number_of_fleet_layouts,
+           import_fleet(number_of_fleet_layouts, None), "layouts")
+    report(f"Import fleet layouts from a folder, {workers} workers", number_of_fleet_layouts,
+           import_fleet(number_of_fleet_layouts, workers), "layouts")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+         int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count())
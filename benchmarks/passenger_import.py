@@ -0,0 +1,108 @@
+"""
+Benchmark the rate at which passengers can be added to a flight:
+
++---------------+-----------------------------------------------------------------------------------------------+
+| one at a time | Calling create_passenger then add_passenger for each passenger, as the web application does   |
++---------------+-----------------------------------------------------------------------------------------------+
+| CSV manifest  | Bulk import of a synthetic CSV passenger manifest                                             |
++---------------+-----------------------------------------------------------------------------------------------+
+| JSON manifest | Bulk import of the same manifest in JSON format                                               |
++---------------+-----------------------------------------------------------------------------------------------+
+
+Adding passengers one at a time is slow, so the baseline adds fewer passengers than the manifest imports.
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.passenger_import [number of passengers] [number of passengers added one at a time]
+"""
+
+import datetime
+import json
+import os
+import sys
+import tempfile
+from benchmarks.utils import use_scratch_database, timer, report, create_reference_data, create_flights
+
+use_scratch_database()
+
+from flight_model.model import create_database  # noqa: E402
+from flight_model.logic import create_passenger, add_passenger  # noqa: E402
+from flight_model.data_exchange import import_passenger_manifest_from_file  # noqa: E402
+from flight_model.data_exchange.passengers import MANIFEST_COLUMNS  # noqa: E402
+
+
+def get_passengers(number_of_passengers, prefix):
+    """
+    Return a list of synthetic passengers
+
+    :param number_of_passengers: Number of passengers
+    :param prefix: Prefix for the passport numbers, so several lists can be added without collisions
+    :return: List of dictionaries of passenger properties
+    """
+    return [{"name": f"Passenger {i}", "gender": "MF"[i % 2], "dob": "01/02/1970", "nationality": "UK",
+             "residency": "UK", "passport_number": f"{prefix}{i:09d}"} for i in range(number_of_passengers)]
+
+
+def write_csv_manifest(folder, passengers):
+    """
+    Write a CSV passenger manifest
+
+    :param folder: Folder in which to write the manifest
+    :param passengers: List of dictionaries of passenger properties
+    :return: Path to the manifest
+    """
+    file_path = os.path.join(folder, "manifest.csv")
+    with open(file_path, mode="wt", encoding="utf-8", newline="") as f:
+        f.write(",".join(MANIFEST_COLUMNS) + "\r\n")
+        for passenger in passengers:
+            f.write(",".join(passenger[column] for column in MANIFEST_COLUMNS) + "\r\n")
+    return file_path
+
+
+def write_json_manifest(folder, passengers):
+    """
+    Write a JSON passenger manifest
+
+    :param folder: Folder in which to write the manifest
+    :param passengers: List of dictionaries of passenger properties
+    :return: Path to the manifest
+    """
+    file_path = os.path.join(folder, "manifest.json")
+    with open(file_path, mode="wt", encoding="utf-8") as f:
+        json.dump({"passengers": passengers}, f)
+    return file_path
+
+
+def main(number_of_passengers, number_added_individually):
+    create_database()
+    create_reference_data()
+    flight_ids = create_flights(3)
+
+    timings = {}
+    with timer(timings, "one at a time"):
+        for passenger in get_passengers(number_added_individually, "S"):
+            dob = datetime.datetime.strptime(passenger["dob"], "%d/%m/%Y").date()
+            added = create_passenger(passenger["name"], passenger["gender"], dob, passenger["nationality"],
+                                     passenger["residency"], passenger["passport_number"])
+            add_passenger(flight_ids[0], added)
+
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = write_csv_manifest(folder, get_passengers(number_of_passengers, "C"))
+        with timer(timings, "csv"):
+            import_passenger_manifest_from_file(flight_ids[1], file_path)
+
+        file_path = write_json_manifest(folder, get_passengers(number_of_passengers, "J"))
+        with timer(timings, "json"):
+            import_passenger_manifest_from_file(flight_ids[2], file_path)
+
+    report("Add passengers one at a time", number_added_individually, timings["one at a time"], "passengers")
+    report("Import a CSV passenger manifest", number_of_passengers, timings["csv"], "passengers")
+    report("Import a JSON passenger manifest", number_of_passengers, timings["json"], "passengers")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 500)
@@ -0,0 +1,100 @@
+"""
+Benchmark the rate at which a large, synthetic airport list can be imported:
+
++---------------+-----------------------------------------------------------------------------------------------+
+| orm           | Adding one Airport instance per airport to the session, as a baseline                         |
++---------------+-----------------------------------------------------------------------------------------------+
+| initial       | Bulk upsert of the airport list into an empty database                                        |
++---------------+-----------------------------------------------------------------------------------------------+
+| unchanged     | Re-running the bulk upsert with the same airport list                                         |
++---------------+-----------------------------------------------------------------------------------------------+
+| refresh       | Bulk upsert of the airport list with 10% of the airports renamed and 10% added                |
++---------------+-----------------------------------------------------------------------------------------------+
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.reference_import [number of airports]
+"""
+
+import json
+import os
+import sys
+import tempfile
+from benchmarks.utils import use_scratch_database, timer, report
+
+use_scratch_database()
+
+from flight_model.model import create_database, Session, Airport  # noqa: E402
+from flight_model.data_exchange import import_airport_details  # noqa: E402
+
+
+def get_airport_code(index):
+    """
+    Return a unique synthetic airport code
+
+    :param index: Index of the airport
+    :return: Airport code
+    """
+    code = ""
+    for _ in range(4):
+        index, remainder = divmod(index, 26)
+        code = chr(ord("A") + remainder) + code
+    return code
+
+
+def write_airports_file(folder, airports):
+    """
+    Write an airport definition data file
+
+    :param folder: Folder in which to write the file
+    :param airports: Dictionary of airport names keyed by airport code
+    :return: Path to the data file
+    """
+    file_path = os.path.join(folder, "airports.json")
+    with open(file_path, mode="wt", encoding="utf-8") as f:
+        json.dump({"airports": {code: {"code": code, "name": name, "tz": "Europe/London"}
+                                for code, name in airports.items()}}, f)
+    return file_path
+
+
+def main(number_of_airports):
+    airports = {get_airport_code(i): f"Airport {i}" for i in range(number_of_airports)}
+    refreshed = dict(airports)
+    for i in range(0, number_of_airports, 10):
+        refreshed[get_airport_code(i)] = f"Renamed airport {i}"
+        refreshed[get_airport_code(number_of_airports + i)] = f"New airport {i}"
+
+    timings = {}
+    summaries = {}
+    with tempfile.TemporaryDirectory() as folder:
+        create_database()
+        with timer(timings, "orm"), Session.begin() as session:
+            for code, name in airports.items():
+                session.add(Airport(code=code, name=name, timezone="Europe/London"))
+
+        create_database()
+        file_path = write_airports_file(folder, airports)
+        with timer(timings, "initial"):
+            summaries["initial"] = import_airport_details(file_path)
+
+        with timer(timings, "unchanged"):
+            summaries["unchanged"] = import_airport_details(file_path)
+
+        file_path = write_airports_file(folder, refreshed)
+        with timer(timings, "refresh"):
+            summaries["refresh"] = import_airport_details(file_path)
+
+    report("Add airports using the ORM", number_of_airports, timings["orm"], "airports")
+    for name, title in [("initial", "Upsert airports into an empty table"),
+                        ("unchanged", "Upsert unchanged airports"),
+                        ("refresh", "Upsert renamed and new airports")]:
+        summary = summaries[name]
+        report(title, summary.inserted + summary.updated + summary.unchanged, timings[name], "airports")
+        print(f"{'':<50} {summary!r}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
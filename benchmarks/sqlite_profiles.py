@@ -0,0 +1,149 @@
+"""
+Benchmark the SQLite performance profiles under a mixed read and write load. For each profile, a set of reader
+threads repeatedly list the flights and load a flight's seating plan while writer threads repeatedly move
+passengers between seats. Each profile is run in a separate process, as the profile is applied when the flight
+model is imported.
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.sqlite_profiles [seconds per profile]
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from benchmarks.utils import use_scratch_database, create_reference_data, create_flights, get_layout_id
+
+READERS = 4
+WRITERS = 2
+PROFILES = ["default", "performance"]
+
+
+def _count(counts, lock, name):
+    """
+    Increment one of the load counters
+
+    :param counts: Dictionary of counters shared by the reader and writer threads
+    :param lock: Lock protecting the counters
+    :param name: Name of the counter to increment
+    """
+    with lock:
+        counts[name] += 1
+
+
+def _read_flights(flight_id, end, counts, lock):
+    """
+    Repeatedly list the flights and load a flight's seating plan until the end of the load
+
+    :param flight_id: ID of the flight to load
+    :param end: Performance counter value at which the load ends
+    :param counts: Dictionary of counters shared by the reader and writer threads
+    :param lock: Lock protecting the counters
+    """
+    from sqlalchemy.exc import OperationalError
+    from flight_model.logic import list_flights, get_flight
+
+    while time.perf_counter() < end:
+        try:
+            list_flights(summary=True)
+            get_flight(flight_id, passengers=False)
+            _count(counts, lock, "reads")
+        except OperationalError:
+            _count(counts, lock, "errors")
+
+
+def _move_passenger(flight_id, writer, passenger_id, end, counts, lock):
+    """
+    Repeatedly move a passenger back and forth between two seats, in a row of its own, until the end of the load
+
+    :param flight_id: ID of the flight the passenger is on
+    :param writer: Index of the writer, used to select the row
+    :param passenger_id: ID of the passenger to move
+    :param end: Performance counter value at which the load ends
+    :param counts: Dictionary of counters shared by the reader and writer threads
+    :param lock: Lock protecting the counters
+    """
+    from sqlalchemy.exc import OperationalError
+    from flight_model.logic import allocate_seat
+
+    seats = [f"{writer + 1}A", f"{writer + 1}B"]
+    i = 0
+    while time.perf_counter() < end:
+        try:
+            allocate_seat(flight_id, passenger_id, seats[i % 2])
+            _count(counts, lock, "writes")
+            i += 1
+        except OperationalError:
+            _count(counts, lock, "errors")
+
+
+def _run_load(flight_id, passenger_ids, duration):
+    """
+    Run the mixed read and write load against a flight for a fixed period
+
+    :param flight_id: ID of the flight to load
+    :param passenger_ids: IDs of the passengers on the flight, one per writer
+    :param duration: Duration of the load, in seconds
+    :return: A tuple of the number of reads, the number of writes and the number of errors
+    """
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    end = time.perf_counter() + duration
+
+    threads = [threading.Thread(target=_read_flights, args=(flight_id, end, counts, lock)) for _ in range(READERS)]
+    threads += [threading.Thread(target=_move_passenger, args=(flight_id, i, passenger_id, end, counts, lock))
+                for i, passenger_id in enumerate(passenger_ids)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return counts["reads"], counts["writes"], counts["errors"]
+
+
+def run_profile(profile, duration):
+    """
+    Set up a scratch database and run the load using the profile selected via the environment
+
+    :param profile: Name of the profile under test
+    :param duration: Duration of the load, in seconds
+    """
+    use_scratch_database(f"flight_booking_benchmark_{profile}.db")
+
+    import datetime
+    from flight_model.model import create_database
+    from flight_model.logic import apply_aircraft_layout, create_passenger, add_passenger
+
+    create_database()
+    create_reference_data()
+    flight_ids = create_flights(50)
+    apply_aircraft_layout(flight_ids[0], get_layout_id("A321", "neo"))
+
+    passenger_ids = []
+    for i in range(WRITERS):
+        passenger = create_passenger(f"Passenger {i}", "F", datetime.date(1970, 1, 1), "UK", "UK", str(i))
+        add_passenger(flight_ids[0], passenger)
+        passenger_ids.append(passenger.id)
+
+    reads, writes, errors = _run_load(flight_ids[0], passenger_ids, duration)
+    print(f"{profile:<15} {reads / duration:>10.1f} reads/s {writes / duration:>10.1f} writes/s {errors:>8} errors")
+
+
+def main(duration):
+    for profile in PROFILES:
+        environment = dict(os.environ, FLIGHT_BOOKING_DB_PROFILE=profile)
+        subprocess.run([sys.executable, "-m", "benchmarks.sqlite_profiles", "--profile", profile, str(duration)],
+                       env=environment,
+                       check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--profile":
+        run_profile(sys.argv[2], float(sys.argv[3]))
+    else:
+        main(float(sys.argv[1]) if len(sys.argv) > 1 else 10)
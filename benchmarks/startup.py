@@ -0,0 +1,121 @@
+"""
+Benchmark the cold start time of the command line and web applications, measured from launching a new interpreter:
+
++--------------+------------------------------------------------------------------------------------------------+
+| interpreter  | Time to start and exit an interpreter that does nothing, as a baseline                         |
++--------------+------------------------------------------------------------------------------------------------+
+| flight_model | Time for "python -m flight_model --upgrade" to run to completion on an up-to-date database     |
++--------------+------------------------------------------------------------------------------------------------+
+| booking_web  | Time for "python -m booking_web" to serve its first response for the flights list. The first   |
+|              | start uses an empty template cache and is reported separately                                  |
++--------------+------------------------------------------------------------------------------------------------+
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.startup [number of runs]
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from benchmarks.utils import use_scratch_database
+
+use_scratch_database()
+
+#: Maximum time to wait for the web application to respond, in seconds
+RESPONSE_TIMEOUT = 30
+
+
+def time_command(arguments, env=None):
+    """
+    Run a command to completion and return the elapsed time
+
+    :param arguments: List of command line arguments
+    :param env: Environment for the command
+    :return: Elapsed time in seconds
+    """
+    start = time.perf_counter()
+    subprocess.run(arguments, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def get_free_port():
+    """
+    Return a TCP port that's currently free on the loopback interface
+
+    :return: Port number
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_first_response(env):
+    """
+    Start the web application and return the time taken for it to serve the flights list
+
+    :param env: Environment for the web application
+    :return: Elapsed time in seconds
+    """
+    port = get_free_port()
+    url = f"http://127.0.0.1:{port}/flights/list"
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "booking_web"],
+                               env={**env, "FLASK_RUN_PORT": str(port)},
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < RESPONSE_TIMEOUT:
+            try:
+                with urllib.request.urlopen(url) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+
+        raise TimeoutError(f"No response from {url} after {RESPONSE_TIMEOUT} seconds")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def report_startup(title, timings):
+    """
+    Print the mean and minimum of a set of start up timings
+
+    :param title: Description of the benchmark
+    :param timings: List of elapsed times, in seconds
+    """
+    mean = sum(timings) / len(timings)
+    print(f"{title:<50} {len(timings):>8} runs {mean * 1000:>10.1f} ms mean {min(timings) * 1000:>10.1f} ms min")
+
+
+def main(number_of_runs):
+    env = {key: value for key, value in os.environ.items() if key != "FLASK_ENV"}
+    time_command([sys.executable, "-m", "flight_model"], env)
+
+    with tempfile.TemporaryDirectory() as template_cache_folder:
+        env["FLIGHT_BOOKING_TEMPLATE_CACHE"] = template_cache_folder
+
+        interpreter = [time_command([sys.executable, "-c", "pass"], env) for _ in range(number_of_runs)]
+        flight_model = [time_command([sys.executable, "-m", "flight_model", "--upgrade"], env)
+                        for _ in range(number_of_runs)]
+        cold_web = [time_first_response(env)]
+        warm_web = [time_first_response(env) for _ in range(number_of_runs)]
+
+    report_startup("Start and exit the interpreter", interpreter)
+    report_startup("python -m flight_model --upgrade", flight_model)
+    report_startup("python -m booking_web, empty template cache", cold_web)
+    report_startup("python -m booking_web, warm template cache", warm_web)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,93 @@
+"""
+Benchmark the cost of formatting the local departure and arrival dates and times when rendering a list of flights,
+as the flights list page does, comparing:
+
++-----------------+---------------------------------------------------------------------------------------------+
+| uncached pytz   | A pytz timezone is looked up and the time converted on every access, as a baseline          |
++-----------------+---------------------------------------------------------------------------------------------+
+| pytz            | Cached pytz timezones, with local times calculated once per flight                          |
++-----------------+---------------------------------------------------------------------------------------------+
+| zoneinfo        | Cached zoneinfo timezones, with local times calculated once per flight                      |
++-----------------+---------------------------------------------------------------------------------------------+
+
+To run the benchmark, enter the following from the root of the project folder:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.timezones [number of flights] [number of runs]
+"""
+
+import sys
+import pytz
+from benchmarks.utils import use_scratch_database, timer, report, create_reference_data, create_flights
+
+use_scratch_database()
+
+from flight_model.model import create_database, set_timezone_backend  # noqa: E402
+from flight_model.logic import list_flights  # noqa: E402
+
+
+def _uncached_departs_localtime(flight):
+    return pytz.UTC.localize(flight.departure_date).astimezone(pytz.timezone(flight.embarkation_airport.timezone))
+
+
+def _uncached_arrives_localtime(flight):
+    arrives_utc = pytz.UTC.localize(flight.departure_date) + flight.duration
+    return arrives_utc.astimezone(pytz.timezone(flight.destination_airport.timezone))
+
+
+def render_uncached(flights):
+    """
+    Format the local dates and times for a list of flights, looking up the timezones on every access
+
+    :param flights: List of flights
+    """
+    for flight in flights:
+        _uncached_departs_localtime(flight).strftime("%d/%m/%Y")
+        _uncached_departs_localtime(flight).strftime("%H:%M")
+        _uncached_arrives_localtime(flight).strftime("%d/%m/%Y")
+        _uncached_arrives_localtime(flight).strftime("%H:%M")
+
+
+def render(flights):
+    """
+    Format the local dates and times for a list of flights, in the same way as the flights list template
+
+    :param flights: List of flights
+    """
+    for flight in flights:
+        flight.departs_localtime.strftime("%d/%m/%Y")
+        flight.departs_localtime.strftime("%H:%M")
+        flight.arrives_localtime.strftime("%d/%m/%Y")
+        flight.arrives_localtime.strftime("%H:%M")
+
+
+def main(number_of_flights, number_of_runs):
+    create_database()
+    create_reference_data()
+    create_flights(number_of_flights)
+
+    # Each run renders a freshly loaded list, so local times calculated by an earlier run aren't reused
+    timings = {}
+    for name, backend, renderer in [("uncached pytz", "pytz", render_uncached),
+                                    ("pytz", "pytz", render),
+                                    ("zoneinfo", "zoneinfo", render)]:
+        set_timezone_backend(backend)
+        elapsed = 0
+        for _ in range(number_of_runs):
+            flights = list_flights(summary=True)
+            with timer(timings, name):
+                renderer(flights)
+            elapsed += timings[name]
+        timings[name] = elapsed
+
+    total = number_of_flights * number_of_runs
+    report("Render local times, uncached pytz", total, timings["uncached pytz"], "flights")
+    report("Render local times, cached pytz", total, timings["pytz"], "flights")
+    report("Render local times, cached zoneinfo", total, timings["zoneinfo"], "flights")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 5)
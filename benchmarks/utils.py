@@ -0,0 +1,114 @@
+"""
+Utility methods used by the benchmarks to set up a scratch database and report timings
+"""
+
+import datetime
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+def use_scratch_database(name="flight_booking_benchmark.db"):
+    """
+    Point the flight model at a scratch database file in the temporary folder. Benchmarks re-create the database,
+    so this must be called before the flight model is imported to ensure the application database isn't touched
+
+    :param name: Name of the scratch database file
+    :return: The path to the scratch database file
+    """
+    db_path = os.path.join(tempfile.gettempdir(), name)
+    os.environ["FLIGHT_BOOKING_DB"] = db_path
+    return db_path
+
+
+@contextmanager
+def timer(timings, name):
+    """
+    Context manager that records the elapsed wall-clock time for the enclosed block
+
+    :param timings: Dictionary in which to record the timing
+    :param name: Key under which to record the elapsed time, in seconds
+    """
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+
+
+def report(title, count, elapsed, unit):
+    """
+    Print a single benchmark result as a throughput figure
+
+    :param title: Description of the benchmark
+    :param count: Number of items processed
+    :param elapsed: Elapsed time in seconds
+    :param unit: Name of the items processed e.g. flights
+    """
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{title:<50} {count:>8} {unit:<10} {elapsed:>9.3f} s {rate:>12.1f} {unit}/s")
+
+
+def create_reference_data():
+    """
+    Create the airports, airlines and sample aircraft layouts used by the benchmarks
+    """
+    from flight_model.data_exchange import import_airport_details, import_airline_details, \
+        import_aircraft_layout_from_file
+
+    import_airport_details()
+    import_airline_details()
+    import_aircraft_layout_from_file("EasyJet", "A320", None)
+    import_aircraft_layout_from_file("EasyJet", "A320", "1")
+    import_aircraft_layout_from_file("EasyJet", "A321", "neo")
+
+
+def create_flights(count, airline_name="EasyJet", embarkation_code="LGW", destination_code="RMU"):
+    """
+    Create a schedule of flights using a single bulk insert, one flight per hour from a fixed start date
+
+    :param count: Number of flights to create
+    :param airline_name: Name of the airline operating the flights
+    :param embarkation_code: 3-letter IATA code for the airport of embarkation
+    :param destination_code: 3-letter IATA code for the destination airport
+    :return: A list of IDs for the created flights
+    """
+    import sqlalchemy as db
+    from flight_model.model import Session, Airline, Airport, Flight
+
+    start = datetime.datetime(2021, 1, 1, 6, 0)
+    with Session.begin() as session:
+        airline_id = session.query(Airline.id).filter(Airline.name == airline_name).scalar()
+        embarkation_id = session.query(Airport.id).filter(Airport.code == embarkation_code).scalar()
+        destination_id = session.query(Airport.id).filter(Airport.code == destination_code).scalar()
+        session.execute(db.insert(Flight), [{
+            "airline_id": airline_id,
+            "embarkation_airport_id": embarkation_id,
+            "destination_airport_id": destination_id,
+            "number": f"BM{i % 10000:04d}",
+            "departure_date": start + datetime.timedelta(hours=i),
+            "duration": datetime.timedelta(hours=2, minutes=25)
+        } for i in range(count)])
+
+        flight_ids = [flight_id for flight_id, in session.query(Flight.id).order_by(Flight.id)]
+
+    return flight_ids
+
+
+def get_layout_id(aircraft, layout_name, airline_name="EasyJet"):
+    """
+    Return the ID of one of the sample aircraft layouts
+
+    :param aircraft: Aircraft model e.g. A321
+    :param layout_name: Layout name e.g. neo
+    :param airline_name: Name of the airline the layout belongs to
+    :return: The ID of the aircraft layout
+    """
+    from flight_model.model import Session, Airline, AircraftLayout
+
+    with Session.begin() as session:
+        return session.query(AircraftLayout.id) \
+            .join(Airline) \
+            .filter(Airline.name == airline_name,
+                    AircraftLayout.aircraft == aircraft,
+                    AircraftLayout.name == layout_name) \
+            .scalar()
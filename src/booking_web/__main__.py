@@ -1,10 +1,13 @@
 import os
 from booking_web.booking import app
 
+# The port defaults to 5000 but can be overridden in the same way as for "flask run"
+port = int(os.environ.get("FLASK_RUN_PORT", "5000"))
+
 try:
     if os.environ["FLASK_ENV"] == "development":
-        app.run(debug=True, use_reloader=True)
+        app.run(debug=True, use_reloader=True, port=port)
     else:
-        app.run(host="0.0.0.0")
+        app.run(host="0.0.0.0", port=port)
 except KeyError:
-    app.run(host="0.0.0.0")
+    app.run(host="0.0.0.0", port=port)
@@ -2,8 +2,10 @@
 The airlines blueprint supplies view functions and templates for airline management
 """
 
-from flask import Blueprint, render_template, redirect, request
-from flight_model.logic import list_airlines, create_airline, delete_airline, get_airline, update_airline
+from flask import Blueprint, render_template, redirect, request, current_app
+from flight_model.logic import list_airlines_page, create_airline, delete_airline, get_airline, update_airline
+from flight_model.model import Airline
+from booking_web.etags import conditional_get
 
 
 airlines_bp = Blueprint("airlines", __name__, template_folder='templates')
@@ -24,14 +26,19 @@ def _render_airline_editing_page(airline_id, error):
 
 
 @airlines_bp.route("/list")
+@conditional_get(Airline.__tablename__)
 def list_all():
     """
     Show the page that lists all airlines and is the entry point for adding new ones
 
     :return: The HTML for the airline listing page
     """
+    page = list_airlines_page(current_app.config["PAGE_SIZE"],
+                              request.args.get("after", type=int),
+                              request.args.get("before", type=int))
     return render_template("airlines/list.html",
-                           airlines=list_airlines(),
+                           airlines=page.items,
+                           page=page,
                            edit_enabled=True)
 
 
@@ -2,9 +2,10 @@
 The airports blueprint supplies view functions and templates for airport management
 """
 
-import pytz
-from flask import Blueprint, render_template, redirect, request
-from flight_model.logic import list_airports, create_airport, get_airport, delete_airport, update_airport
+from flask import Blueprint, render_template, redirect, request, current_app
+from flight_model.logic import list_airports_page, create_airport, get_airport, delete_airport, update_airport
+from flight_model.model import Airport, list_timezone_names
+from booking_web.etags import conditional_get
 
 airports_bp = Blueprint("airports", __name__, template_folder='templates')
 
@@ -19,7 +20,7 @@ def _render_airport_editing_page(airport_id, error):
     """
     airport = get_airport(airport_id) if airport_id else None
     return render_template("airports/edit.html",
-                           timezones=pytz.all_timezones,
+                           timezones=list_timezone_names(),
                            airport=airport,
                            error=error)
 
@@ -39,19 +40,25 @@ def _render_airport_deletion_page(airport_id, error):
 
 
 @airports_bp.route("/list")
+@conditional_get(Airport.__tablename__)
 def list_all():
     """
     Show the page that lists all airports and is the entry point for adding new ones
 
     :return: The HTML for the airport listing page
     """
+    page = list_airports_page(current_app.config["PAGE_SIZE"],
+                              request.args.get("after", type=int),
+                              request.args.get("before", type=int))
     return render_template("airports/list.html",
-                           airports=list_airports(),
+                           airports=page.items,
+                           page=page,
                            edit_enabled=True)
 
 
 @airports_bp.route("/edit", defaults={"airport_id": None}, methods=["GET", "POST"])
 @airports_bp.route("/add/<int:airport_id>", methods=["GET", "POST"])
+@conditional_get(Airport.__tablename__)
 def edit(airport_id):
     """
     Serve the page to add  new airport or edit an existing one and handle the appropriate action
@@ -2,7 +2,7 @@
 The boarding cards blueprint supplies view functions and templates for printing boarding cards
 """
 
-from flask import Blueprint, render_template, redirect, request, session
+from flask import Blueprint, render_template, redirect, request, session, current_app, jsonify, abort, Response
 from flight_model.logic import get_flight
 from flight_model.logic import BoardingCardsGenerator, InvalidOperationError, MissingBoardingCardPluginError
 
@@ -18,16 +18,56 @@ def print_cards(flight_id):
     """
     if request.method == "POST":
         try:
-            generator = BoardingCardsGenerator(flight_id, "pdf", request.form["gate_number"])
-            generator.start()
-            session["message"] = "Boarding cards are being generated in the background"
+            job = current_app.extensions["card_jobs"].submit(flight_id, "pdf", request.form["gate_number"])
+            session["message"] = f"Boarding cards are being generated in the background (job {job.job_id})"
         except (ValueError, InvalidOperationError, MissingBoardingCardPluginError) as e:
             return render_template("boarding_cards/print.html",
-                                   flight=get_flight(flight_id),
+                                   flight=get_flight(flight_id, seats=False, passengers=False),
                                    error=e)
         else:
             return redirect("/flights/list")
     else:
         return render_template("boarding_cards/print.html",
-                               flight=get_flight(flight_id),
+                               flight=get_flight(flight_id, seats=False, passengers=False),
                                error=None)
+
+
+@boarding_cards_bp.route("/download/<int:flight_id>")
+def download_cards(flight_id):
+    """
+    Stream a zip archive of the boarding cards for a flight, rendering the cards as the archive is sent
+
+    :param flight_id: ID of the flight
+    :return: A streamed response containing the archive or the HTML for the boarding card generation page on error
+    """
+    try:
+        generator = BoardingCardsGenerator(flight_id,
+                                           "pdf",
+                                           request.args.get("gate_number"),
+                                           workers=current_app.config["CARD_WORKERS"],
+                                           pool=current_app.config["CARD_POOL"])
+    except (ValueError, InvalidOperationError, MissingBoardingCardPluginError) as e:
+        return render_template("boarding_cards/print.html",
+                               flight=get_flight(flight_id, seats=False, passengers=False),
+                               error=e)
+
+    flight = generator.flight
+    file_name = BoardingCardsGenerator.get_archive_file_name(flight.number, flight.departure_date, "pdf")
+    return Response(generator.stream_archive(),
+                    mimetype="application/zip",
+                    headers={"Content-Disposition": f"attachment; filename={file_name}"})
+
+
+@boarding_cards_bp.route("/status/<int:job_id>")
+def job_status(job_id):
+    """
+    Serve the status of a boarding card generation job
+
+    :param job_id: ID of the job
+    :return: JSON containing the job state and the number of cards rendered
+    """
+    job = current_app.extensions["card_jobs"].get_job(job_id)
+    if not job:
+        abort(404)
+
+    return jsonify(job.to_dict())
@@ -8,6 +8,8 @@ to provide button and form element styling.
 
 import os
 from flask import Flask, redirect
+from jinja2 import FileSystemBytecodeCache
+from flight_model.logic import BoardingCardJobQueue
 from booking_web.airports import airports_bp
 from booking_web.airlines import airlines_bp
 from booking_web.layouts import layouts_bp
@@ -21,6 +23,34 @@ app = Flask("Flight Booking",
             template_folder=os.path.join(os.path.dirname(__file__), "templates"))
 
 app.secret_key = b'some secret key'
+
+# Compiled templates are cached on disk so they don't need to be recompiled each time the application starts. The
+# cache is in the system temporary folder unless the FLIGHT_BOOKING_TEMPLATE_CACHE environment variable is set
+template_cache_folder = os.environ.get("FLIGHT_BOOKING_TEMPLATE_CACHE")
+if template_cache_folder:
+    os.makedirs(template_cache_folder, exist_ok=True)
+app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(template_cache_folder or None)}
+
+# Maximum number of entries shown on each page of the flight, airport, airline and aircraft layout lists
+app.config["PAGE_SIZE"] = int(os.environ.get("FLIGHT_BOOKING_PAGE_SIZE", "50"))
+
+# Number of workers and type of pool used to render boarding cards in parallel. If the number of workers isn't set,
+# cards are rendered serially
+app.config["CARD_WORKERS"] = int(os.environ["FLIGHT_BOOKING_CARD_WORKERS"]) \
+    if os.environ.get("FLIGHT_BOOKING_CARD_WORKERS") else None
+app.config["CARD_POOL"] = os.environ.get("FLIGHT_BOOKING_CARD_POOL", "process")
+
+# Boarding cards are written to one file per seat by default or, if this is set to "archive", to one archive per flight
+app.config["CARD_OUTPUT"] = os.environ.get("FLIGHT_BOOKING_CARD_OUTPUT", "files")
+
+# Boarding card jobs are run by a fixed number of worker threads, with a limit on the number waiting to be run
+app.extensions["card_jobs"] = BoardingCardJobQueue(
+    workers=int(os.environ.get("FLIGHT_BOOKING_CARD_JOB_WORKERS", "2")),
+    max_queued=int(os.environ.get("FLIGHT_BOOKING_CARD_QUEUE_SIZE", "20")),
+    card_workers=app.config["CARD_WORKERS"],
+    card_pool=app.config["CARD_POOL"],
+    card_output=app.config["CARD_OUTPUT"])
+
 app.register_blueprint(airports_bp, url_prefix='/airports')
 app.register_blueprint(airlines_bp, url_prefix='/airlines')
 app.register_blueprint(layouts_bp, url_prefix='/layouts')
@@ -0,0 +1,44 @@
+"""
+Support for conditional GET requests. Pages built from reference data are sent with an entity tag derived from the
+versions of the tables they're built from and, if the browser's cached copy is still current, requests for them are
+answered with "304 Not Modified" without querying the database or rendering the page.
+"""
+
+import functools
+from flask import request, session, make_response
+from flight_model.model import reference_cache
+
+
+def conditional_get(*table_names):
+    """
+    Decorator for view functions that serve pages built only from the specified tables and the request URL
+
+    Pages that display a message held in the session, such as the flights list after boarding card generation has
+    been requested, are always rendered, as are responses to requests other than GET
+
+    :param table_names: Names of the tables the page is built from
+    :return: The decorator
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET" or "error" in session or "message" in session:
+                return view(*args, **kwargs)
+
+            etag = reference_cache.get_version_tag(*table_names)
+            if etag is None:
+                return view(*args, **kwargs)
+
+            if request.if_none_match.contains(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # Browsers are asked to revalidate each time, so changes are shown as soon as they're made
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -2,10 +2,12 @@
 The flights blueprint supplies view functions and templates for flight management
 """
 
-from flask import Blueprint, render_template, redirect, request, session
-from flight_model.logic import list_flights, create_flight, get_flight, delete_flight
+from flask import Blueprint, render_template, redirect, request, session, current_app
+from flight_model.logic import list_flights_page, create_flight, get_flight, delete_flight
 from flight_model.logic import list_airlines
 from flight_model.logic import list_airports
+from flight_model.model import Flight, FlightPassenger, Airline, Airport
+from booking_web.etags import conditional_get
 
 flights_bp = Blueprint("flights", __name__, template_folder='templates')
 
@@ -24,6 +26,7 @@ def _render_flight_addition_page(error):
 
 
 @flights_bp.route("/list")
+@conditional_get(Flight.__tablename__, FlightPassenger.__tablename__, Airline.__tablename__, Airport.__tablename__)
 def list_all():
     """
     Serve the home page for the flight booking site, listing the current flights
@@ -32,8 +35,13 @@ def list_all():
     """
     error = session.pop("error") if "error" in session else None
     message = session.pop("message") if "message" in session else None
+    page = list_flights_page(current_app.config["PAGE_SIZE"],
+                             request.args.get("after", type=int),
+                             request.args.get("before", type=int),
+                             summary=True)
     return render_template("flights/list.html",
-                           flights=list_flights(),
+                           flights=page.items,
+                           page=page,
                            edit_enabled=True,
                            error=error,
                            message=message)
@@ -76,5 +84,5 @@ def delete(flight_id):
         return redirect("/flights/list")
     else:
         return render_template("flights/delete.html",
-                               flights=[get_flight(flight_id)],
+                               flights=[get_flight(flight_id, seats=False, passengers=False, summary=True)],
                                edit_enabled=False)
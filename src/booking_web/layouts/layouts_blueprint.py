@@ -2,12 +2,14 @@
 The layouts blueprint supplies view functions and templates for aircraft layout management
 """
 
-from flask import Blueprint, render_template, redirect, request
+from flask import Blueprint, render_template, redirect, request, current_app
 from flight_model.logic import get_flight
 from flight_model.logic import list_airlines
-from flight_model.logic import list_layouts, apply_aircraft_layout, get_layout, delete_layout, update_layout
+from flight_model.logic import list_layouts, list_layouts_page, apply_aircraft_layout, get_layout, delete_layout, update_layout
 from flight_model.logic import delete_row_from_layout, update_row_definition
-from flight_model.data_exchange import import_aircraft_layout_from_stream
+from flight_model.data_exchange import import_aircraft_layout_from_stream, import_aircraft_layout_from_workbook
+from flight_model.model import AircraftLayout, Airline
+from booking_web.etags import conditional_get
 
 
 layouts_bp = Blueprint("layouts", __name__, template_folder='templates')
@@ -22,7 +24,7 @@ def _render_layout_selection_page(flight_id, error):
     :return: The rendered layout selection template
     """
     # Get the flight, airline and, if there's a seating plan on the flight, the aircraft layout
-    flight = get_flight(flight_id)
+    flight = get_flight(flight_id, seats=False, passengers=False)
     airline_id = flight.airline_id
     aircraft_layout_id = flight.aircraft_layout_id if flight.aircraft_layout_id else 0
 
@@ -127,14 +129,19 @@ def select(flight_id):
 
 
 @layouts_bp.route("/list")
+@conditional_get(AircraftLayout.__tablename__, Airline.__tablename__)
 def list_all():
     """
     Show the page that lists all airlines and is the entry point for adding new ones
 
     :return: The HTML for the airline listing page
     """
+    page = list_layouts_page(current_app.config["PAGE_SIZE"],
+                             request.args.get("after", type=int),
+                             request.args.get("before", type=int))
     return render_template("layouts/list.html",
-                           layouts=list_layouts(None),
+                           layouts=page.items,
+                           page=page,
                            edit_enabled=True)
 
 
@@ -162,10 +169,11 @@ def add():
     """
     if request.method == "POST":
         try:
-            import_aircraft_layout_from_stream(request.form["airline"],
-                                               request.form["aircraft"],
-                                               request.form["layout_name"],
-                                               request.files["csv_file_name"])
+            # Uploaded workbooks are imported from their first worksheet and anything else is treated as CSV
+            layout_file = request.files["csv_file_name"]
+            is_workbook = layout_file.filename.lower().endswith(".xlsx")
+            importer = import_aircraft_layout_from_workbook if is_workbook else import_aircraft_layout_from_stream
+            importer(request.form["airline"], request.form["aircraft"], request.form["layout_name"], layout_file)
             return redirect("/layouts/list")
         except ValueError as e:
             return _render_layout_addition_page(e)
@@ -7,6 +7,7 @@ from flask import Blueprint, render_template, redirect, request, session
 from flight_model.logic import get_flight, add_passenger
 from flight_model.logic import allocate_seat
 from flight_model.logic import create_passenger, delete_passenger
+from flight_model.data_exchange import import_passenger_manifest
 
 
 passengers_bp = Blueprint("passengers", __name__, template_folder='templates')
@@ -21,7 +22,20 @@ def _render_passenger_addition_page(flight_id, error):
     :return: The rendered passenger addition template
     """
     return render_template("passengers/add.html",
-                           flight=get_flight(flight_id),
+                           flight=get_flight(flight_id, seats=False, passengers=False, summary=True),
+                           error=error)
+
+
+def _render_passenger_import_page(flight_id, error):
+    """
+    Helper to render the page to import a passenger manifest
+
+    :param flight_id: ID for the flight to which to add passengers
+    :param error: Error message to display on the page or None
+    :return: The rendered passenger import template
+    """
+    return render_template("passengers/import.html",
+                           flight=get_flight(flight_id, seats=False, passengers=False, summary=True),
                            error=error)
 
 
@@ -34,7 +48,7 @@ def _render_seat_allocation_page(flight_id, passenger_id, error):
     :param error: Error message to display on the page or None
     :return: The HTML for the seat allocation page
     """
-    flight = get_flight(flight_id)
+    flight = get_flight(flight_id, seats=False)
     passengers = [p for p in flight.passengers if p.id == passenger_id]
     return render_template("passengers/allocate.html",
                            flight=flight,
@@ -50,7 +64,7 @@ def list_all(flight_id):
 
     :return: The HTML for the passenger details page
     """
-    flight = get_flight(flight_id)
+    flight = get_flight(flight_id, seats=False)
     if flight.passenger_count > 0:
         return render_template("passengers/list.html",
                                flight=flight,
@@ -85,6 +99,27 @@ def add(flight_id):
         return _render_passenger_addition_page(flight_id, None)
 
 
+@passengers_bp.route("/import/<int:flight_id>", methods=["GET", "POST"])
+def import_manifest(flight_id):
+    """
+    Serve the page to import a manifest of passengers for a flight and handle the import when the form is submitted
+
+    :param flight_id: ID of the flight to add the passengers to
+    :return: The HTML for the manifest import page or a response object redirecting to the passenger list page
+    """
+    if request.method == "POST":
+        try:
+            # Uploaded JSON files are imported as JSON manifests and anything else is treated as CSV
+            manifest_file = request.files["manifest_file_name"]
+            file_format = "json" if manifest_file.filename.lower().endswith(".json") else "csv"
+            import_passenger_manifest(flight_id, manifest_file, file_format)
+            return redirect(f"/passengers/list/{flight_id}")
+        except ValueError as e:
+            return _render_passenger_import_page(flight_id, e)
+    else:
+        return _render_passenger_import_page(flight_id, None)
+
+
 @passengers_bp.route("/delete/<int:flight_id>/<int:passenger_id>", methods=["GET", "POST"])
 def delete(flight_id, passenger_id):
     """
@@ -99,7 +134,7 @@ def delete(flight_id, passenger_id):
         return redirect(f"/passengers/list/{flight_id}")
 
     # Render the passenger list for the flight
-    flight = get_flight(flight_id)
+    flight = get_flight(flight_id, seats=False)
     passengers = [p for p in flight.passengers if p.id == passenger_id]
     return render_template("passengers/delete.html",
                            passengers=passengers,
@@ -1,13 +1,15 @@
+import argparse
 import datetime
+import os
+import sys
 from random import randint
 
-import pytz
-
-from .model import create_database, Session, Airline, Airport, Flight, AircraftLayout, Passenger
+from .model import create_database, upgrade_database, Session, Airline, Airport, Flight, AircraftLayout, Passenger, \
+    local_to_utc
 from .logic import apply_aircraft_layout
 from .data_exchange.airports import import_airport_details
 from .data_exchange.airlines import import_airline_details
-from .data_exchange.aircraft_layouts import import_aircraft_layout_from_file
+from .data_exchange.aircraft_layouts import import_aircraft_layouts_from_folder
 
 
 def import_reference_data():
@@ -16,9 +18,9 @@ def import_reference_data():
     """
     import_airport_details()
     import_airline_details()
-    import_aircraft_layout_from_file("EasyJet", "A320", None)
-    import_aircraft_layout_from_file("EasyJet", "A320", "1")
-    import_aircraft_layout_from_file("EasyJet", "A321", "neo")
+    for result in import_aircraft_layouts_from_folder():
+        if result.error:
+            raise ValueError(f"Unable to import {result.file_name}: {result.error}")
 
 
 def create_sample_flight(airline_name, embarkation_code, destination_code, number, departure_date, duration):
@@ -37,7 +39,7 @@ def create_sample_flight(airline_name, embarkation_code, destination_code, numbe
         airline = session.query(Airline).filter(Airline.name == airline_name).one()
         embarkation = session.query(Airport).filter(Airport.code == embarkation_code).one()
         destination = session.query(Airport).filter(Airport.code == destination_code).one()
-        utc_departure_date = pytz.timezone(embarkation.timezone).localize(departure_date).astimezone(pytz.UTC)
+        utc_departure_date = local_to_utc(departure_date, embarkation.timezone)
         flight = Flight(airline=airline,
                         embarkation_airport=embarkation,
                         destination_airport=destination,
@@ -154,4 +156,94 @@ def create_database_with_sample_data():
     allocate_available_seats("U28549")
 
 
-create_database_with_sample_data()
+def upgrade_existing_database():
+    """
+    Upgrade the existing SQLite database in place, adding any missing tables and indexes. If the upgrade can't be
+    completed, the reason is reported and the program exits with a non-zero status
+    """
+    try:
+        created = upgrade_database()
+    except ValueError as e:
+        sys.exit(f"Unable to upgrade the database: {e}")
+
+    for index_name in created:
+        print(f"Created index {index_name}")
+
+
+def import_reference_data_file(name, importer, file_path):
+    """
+    Insert or update reference data records in the existing SQLite database from a data file and report the number of
+    records inserted, updated and left unchanged
+
+    :param name: Name of the records being imported e.g. airports
+    :param importer: Function that imports the data file and returns an UpsertSummary
+    :param file_path: Path to the data file
+    """
+    summary = importer(file_path)
+    print(f"{name}: {summary.inserted} inserted, {summary.updated} updated, {summary.unchanged} unchanged")
+
+
+def import_layouts(folder, file_format):
+    """
+    Import all the aircraft layout files of one format in a folder into the existing SQLite database, reading them in
+    parallel, and report the outcome for each file
+
+    :param folder: Folder containing the layout files
+    :param file_format: Format of the files to import, csv or xlsx
+    """
+    for result in import_aircraft_layouts_from_folder(folder, workers=os.cpu_count(), file_format=file_format):
+        if result.error:
+            print(f"{result.file_name}: {result.error}")
+        else:
+            layout = " ".join(name for name in [result.airline_name, result.aircraft, result.layout_name] if name)
+            print(f"{result.file_name}: {layout}, {result.rows} rows, {result.capacity} seats")
+
+
+def parse_arguments(argv):
+    """
+    Parse the command line arguments. At most one action can be requested and, if none is, the database is recreated
+    with the sample data
+
+    :param argv: List of command line arguments, excluding the program name
+    :return: Namespace containing the parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog="python -m flight_model",
+                                     description="Create, upgrade or import data into the flight booking database")
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument("--sample-data", action="store_true",
+                         help="delete and recreate the database with the sample data (the default with no arguments)")
+    actions.add_argument("--upgrade", action="store_true",
+                         help="add missing tables and indexes to the existing database")
+    actions.add_argument("--import-airports", metavar="FILE", help="insert or update airports from a JSON file")
+    actions.add_argument("--import-airlines", metavar="FILE", help="insert or update airlines from a JSON file")
+    actions.add_argument("--import-layouts", metavar="FOLDER", help="import the aircraft layout files in a folder")
+    parser.add_argument("--xlsx", action="store_true",
+                        help="import XLSX workbooks rather than CSV files with --import-layouts")
+    args = parser.parse_args(argv)
+    if args.xlsx and not args.import_layouts:
+        parser.error("argument --xlsx: can only be used with --import-layouts")
+
+    return args
+
+
+def main(argv=None):
+    """
+    Entry point for the command line interface
+
+    :param argv: List of command line arguments, excluding the program name, or None to use sys.argv
+    """
+    args = parse_arguments(sys.argv[1:] if argv is None else argv)
+    if args.upgrade:
+        upgrade_existing_database()
+    elif args.import_airports:
+        import_reference_data_file("Airports", import_airport_details, args.import_airports)
+    elif args.import_airlines:
+        import_reference_data_file("Airlines", import_airline_details, args.import_airlines)
+    elif args.import_layouts:
+        import_layouts(args.import_layouts, "xlsx" if args.xlsx else "csv")
+    else:
+        create_database_with_sample_data()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 from .airports import import_airport_details
 from .airlines import import_airline_details
-from .aircraft_layouts import import_aircraft_layout_from_stream, import_aircraft_layout_from_file, \
-    get_layout_file_path
+from .upserts import UpsertSummary
+from .aircraft_layouts import import_aircraft_layout_from_stream, import_aircraft_layout_from_workbook, \
+    import_aircraft_layout_from_file, import_aircraft_layouts_from_folder, get_layout_file_path, LayoutImportResult, \
+    LAYOUT_FILE_FORMATS
+from .passengers import import_passenger_manifest, import_passenger_manifest_from_file, MANIFEST_FILE_FORMATS
 
 __all__ = [
     "import_airport_details",
     "import_airline_details",
+    "UpsertSummary",
     "import_aircraft_layout_from_stream",
+    "import_aircraft_layout_from_workbook",
     "import_aircraft_layout_from_file",
-    "get_layout_file_path"
+    "import_aircraft_layouts_from_folder",
+    "LayoutImportResult",
+    "LAYOUT_FILE_FORMATS",
+    "get_layout_file_path",
+    "import_passenger_manifest",
+    "import_passenger_manifest_from_file",
+    "MANIFEST_FILE_FORMATS"
 ]
@@ -17,19 +17,127 @@ For example, if row number 28 of a seating plan contains 6 economy class seats w
 CSV row would be:
 
 28,Economy,ABCDEF
+
+Layouts are imported as a stream: the data is decoded and validated one row at a time and the row definitions are
+inserted in batches, so the memory used doesn't depend on the size of the file. Layouts can also be imported from the
+first worksheet of an XLSX workbook with the same columns, using the openpyxl package. Workbooks are opened in
+read-only mode, so their rows are read as they're imported, in the same way as CSV files.
+
+A whole folder of layout files of one format can be imported at once. The airline, aircraft and layout for each file
+are taken from its name, which follows the same airline_aircraft_layout.csv convention as the sample data files. The
+airline is the existing airline whose name matches the start of the file name, the aircraft model is the next part of
+the name, upper-cased, and the layout name is the remainder, if any. For example, easyjet_a321_neo.csv is imported as
+the "neo" layout for EasyJet's A321 aircraft.
 """
 
 import csv
+import glob
 import os
 import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from sqlalchemy.exc import IntegrityError
-from io import StringIO
-from ..model import get_data_path, Session, Airline, AircraftLayout, RowDefinition
+from .streams import open_text_stream
+from ..model import get_data_path, Session, Airline, AircraftLayout, RowDefinition, reference_cache
 
 ROW_NUMBER_COLUMN = 0
 CLASS_COLUMN = 1
 SEAT_LETTERS_COLUMN = 2
 
+#: Number of row definitions inserted in each batch
+ROW_BATCH_SIZE = 1000
+
+#: File formats, identified by their file extension, that layouts can be imported from
+LAYOUT_FILE_FORMATS = ["csv", "xlsx"]
+
+
+def _read_csv_rows(f):
+    """
+    Generator that reads the rows from a CSV layout, after the header row
+
+    :param f: IO stream (result of open() or a FileStorage object)
+    :return: Iterator of (line number, list of column values) tuples
+    """
+    reader = csv.reader(open_text_stream(f))
+    _ = next(reader, None)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _cell_text(value):
+    """
+    Return the text for a worksheet cell value. Numbers are stored as floats by some spreadsheet applications, so
+    whole numbers are converted to integers first so they can be read as row numbers
+
+    :param value: Cell value
+    :return: Text for the value
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _read_workbook_rows(f):
+    """
+    Generator that reads the rows from the first worksheet of an XLSX layout, after the header row. The workbook is
+    opened in read-only mode, so rows are read from the file as they're requested rather than being loaded up front.
+    Requires the openpyxl package
+
+    :param f: Path to the workbook or a binary IO stream (result of open() or a FileStorage object)
+    :return: Iterator of (row number, list of column values) tuples
+    :raises ValueError: If openpyxl isn't installed or the workbook can't be read
+    """
+    try:
+        import openpyxl
+    except ImportError as e:
+        raise ValueError("The openpyxl package must be installed to import XLSX layouts") from e
+
+    try:
+        workbook = openpyxl.load_workbook(f, read_only=True, data_only=True)
+    except (OSError, KeyError, zipfile.BadZipFile, openpyxl.utils.exceptions.InvalidFileException) as e:
+        raise ValueError("The layout is not a valid XLSX workbook") from e
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(min_row=2, values_only=True)
+        for row_number, row in enumerate(rows, start=2):
+            yield row_number, [_cell_text(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def _read_row_definitions(rows):
+    """
+    Generator that validates each row read from a layout and yields the values for the corresponding row definition
+
+    :param rows: Iterator of (line number, list of column values) tuples for the rows after the header row
+    :return: Iterator of dictionaries of row definition column values
+    :raises ValueError: If a row is invalid
+    """
+    for line_number, row in rows:
+        # Skip blank lines, such as those at the end of a file
+        if not any(value.strip() for value in row):
+            continue
+
+        if len(row) < 3:
+            raise ValueError(f"Row definition on line {line_number} must have a row number, class and seats")
+
+        row_number = row[ROW_NUMBER_COLUMN].strip()
+        seating_class = row[CLASS_COLUMN].strip()
+        seat_letters = row[SEAT_LETTERS_COLUMN].strip()
+        if not row_number.isdigit():
+            raise ValueError(f"Row number on line {line_number} must be a whole number")
+
+        if not seating_class or not seat_letters:
+            raise ValueError(f"Seat letters and the seating class on line {line_number} cannot be empty")
+
+        if len(set(seat_letters)) != len(seat_letters):
+            raise ValueError(f"Seat letters on line {line_number} cannot be repeated")
+
+        yield {"number": int(row_number), "seating_class": seating_class, "seats": seat_letters}
+
 
 def get_layout_file_path(airline, aircraft, layout=None):
     """
@@ -46,15 +154,19 @@ def get_layout_file_path(airline, aircraft, layout=None):
     return os.path.join(get_data_path(), "sample_data", "layouts", file_name)
 
 
-def import_aircraft_layout_from_stream(airline_name, aircraft, layout_name, f):
+def _import_layout(airline_name, aircraft, layout_name, row_definitions):
     """
-    Import an aircraft layout from a stream
+    Create an aircraft layout and insert its row definitions in batches, in a single transaction
 
     :param airline_name: Name of the airline the layout belongs to
     :param aircraft: Aircraft model name e.g. A320
     :param layout_name: Name of the layout for the aircraft or None
-    :param f: IO stream (result of open() or a FileStorage object)
+    :param row_definitions: Iterable of dictionaries of row definition column values
+    :return: A tuple of the number of rows and the number of seats in the layout
+    :raises ValueError: If the layout is a duplicate or contains an invalid or duplicate row definition
     """
+    rows = 0
+    capacity = 0
     try:
         with Session.begin() as session:
             airline = session.query(Airline).filter(Airline.name == airline_name).one()
@@ -62,27 +174,55 @@ def import_aircraft_layout_from_stream(airline_name, aircraft, layout_name, f):
                                              aircraft=aircraft,
                                              name="" if layout_name is None else layout_name)
             session.add(aircraft_layout)
+            session.flush()
+
+            batch = []
+            for row_definition in row_definitions:
+                batch.append({**row_definition, "aircraft_layout_id": aircraft_layout.id})
+                rows += 1
+                capacity += len(row_definition["seats"])
+                if len(batch) >= ROW_BATCH_SIZE:
+                    session.execute(RowDefinition.__table__.insert(), batch)
+                    batch = []
 
-            # The data source could've been opened in binary or text mode, so read it all then decode it if necessary.
-            # Layout files are small so reading all their content into memory shouldn't be problematic
-            data = f.read()
-            csv_text = data if isinstance(data, str) else data.decode("UTF-8")
-
-            # Initialise a CSV reader over the string memory buffer and read and discard the header row
-            csv_io = StringIO(csv_text)
-            reader = csv.reader(csv_io)
-            _ = next(reader, None)
-
-            # The remaining rows contain the row definitions to be added to the aircraft layout
-            for row in reader:
-                row_definition = RowDefinition(number=row[ROW_NUMBER_COLUMN],
-                                               seating_class=row[CLASS_COLUMN],
-                                               seats=row[SEAT_LETTERS_COLUMN])
-                aircraft_layout.row_definitions.append(row_definition)
-                session.add(row_definition)
+            if batch:
+                session.execute(RowDefinition.__table__.insert(), batch)
+        reference_cache.invalidate(AircraftLayout.__tablename__, RowDefinition.__tablename__)
     except IntegrityError as e:
         raise ValueError("Duplicate layout or row definition detected") from e
 
+    return rows, capacity
+
+
+def import_aircraft_layout_from_stream(airline_name, aircraft, layout_name, f):
+    """
+    Import an aircraft layout from a stream. The stream is read incrementally and the row definitions are inserted in
+    batches, in a single transaction, so either the whole layout is imported or, on error, nothing is
+
+    :param airline_name: Name of the airline the layout belongs to
+    :param aircraft: Aircraft model name e.g. A320
+    :param layout_name: Name of the layout for the aircraft or None
+    :param f: IO stream (result of open() or a FileStorage object)
+    :raises ValueError: If the layout is a duplicate or contains an invalid or duplicate row definition
+    """
+    _import_layout(airline_name, aircraft, layout_name, _read_row_definitions(_read_csv_rows(f)))
+
+
+def import_aircraft_layout_from_workbook(airline_name, aircraft, layout_name, f):
+    """
+    Import an aircraft layout from the first worksheet of an XLSX workbook, with the same columns as a CSV layout
+    file. The worksheet rows are read and inserted in batches as they're read, in a single transaction. Requires the
+    openpyxl package
+
+    :param airline_name: Name of the airline the layout belongs to
+    :param aircraft: Aircraft model name e.g. A320
+    :param layout_name: Name of the layout for the aircraft or None
+    :param f: Path to the workbook or a binary IO stream (result of open() or a FileStorage object)
+    :raises ValueError: If openpyxl isn't installed, the layout is a duplicate or the workbook is invalid or contains
+        an invalid or duplicate row definition
+    """
+    _import_layout(airline_name, aircraft, layout_name, _read_row_definitions(_read_workbook_rows(f)))
+
 
 def import_aircraft_layout_from_file(airline_name, aircraft, layout_name):
     """
@@ -95,3 +235,148 @@ def import_aircraft_layout_from_file(airline_name, aircraft, layout_name):
     file_path = get_layout_file_path(airline_name, aircraft, layout_name)
     with open(file_path, mode="rt", encoding="utf-8") as f:
         import_aircraft_layout_from_stream(airline_name, aircraft, layout_name, f)
+
+
+class LayoutImportResult:
+    """
+    The outcome of importing one file from a folder of aircraft layout files
+    """
+
+    def __init__(self, file_name, airline_name=None, aircraft=None, layout_name=None, rows=0, capacity=0, error=None):
+        self._file_name = file_name
+        self._airline_name = airline_name
+        self._aircraft = aircraft
+        self._layout_name = layout_name
+        self._rows = rows
+        self._capacity = capacity
+        self._error = error
+
+    @property
+    def file_name(self):
+        return self._file_name
+
+    @property
+    def airline_name(self):
+        return self._airline_name
+
+    @property
+    def aircraft(self):
+        return self._aircraft
+
+    @property
+    def layout_name(self):
+        return self._layout_name
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def error(self):
+        return self._error
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" \
+               f"file_name={self._file_name!r}, " \
+               f"airline_name={self._airline_name!r}, " \
+               f"aircraft={self._aircraft!r}, " \
+               f"layout_name={self._layout_name!r}, " \
+               f"rows={self._rows}, " \
+               f"capacity={self._capacity}, " \
+               f"error={self._error!r})"
+
+
+def _parse_layout_file_name(file_name, airline_names):
+    """
+    Identify the airline, aircraft and layout for a layout file from its name
+
+    :param file_name: Layout file name e.g. easyjet_a321_neo.csv
+    :param airline_names: Names of the airlines in the database
+    :return: A tuple of the airline name, aircraft model and layout name (None if there isn't one)
+    :raises ValueError: If the name doesn't identify an airline and aircraft model
+    """
+    stem = os.path.splitext(file_name)[0].lower()
+
+    # Try the longest names first, so an airline whose name starts with the name of another is matched correctly
+    for airline_name in sorted(airline_names, key=len, reverse=True):
+        prefix = re.sub("\\W", "_", airline_name).lower() + "_"
+        if stem.startswith(prefix):
+            aircraft, _, layout_name = stem[len(prefix):].partition("_")
+            if aircraft:
+                return airline_name, aircraft.upper(), layout_name or None
+
+    raise ValueError("The file name doesn't start with the name of an airline followed by an aircraft model")
+
+
+def _parse_layout_file(file_path):
+    """
+    Read and validate the row definitions in a layout file. This is run in the worker processes, so it doesn't use
+    the database
+
+    :param file_path: Path to the layout file
+    :return: A tuple of the list of row definitions and an error message, one of which will be None
+    """
+    try:
+        if file_path.lower().endswith(".xlsx"):
+            return list(_read_row_definitions(_read_workbook_rows(file_path))), None
+
+        with open(file_path, mode="rt", encoding="utf-8-sig", newline="") as f:
+            return list(_read_row_definitions(_read_csv_rows(f))), None
+    except (OSError, ValueError) as e:
+        return None, str(e)
+
+
+def import_aircraft_layouts_from_folder(folder=None, workers=None, file_format="csv"):
+    """
+    Import all the aircraft layout files of one format in a folder. The files are read and validated in parallel, in
+    worker processes, and each layout is imported in its own transaction, so one invalid file doesn't prevent the
+    others from being imported
+
+    :param folder: Folder containing the layout files. Defaults to the sample data layouts folder
+    :param workers: Number of worker processes used to read the files or None to read them in this process
+    :param file_format: Format of the files to import, one of LAYOUT_FILE_FORMATS
+    :return: A list of LayoutImportResult instances, one per file, in file name order
+    :raises ValueError: If the file format is not supported
+    """
+    if file_format not in LAYOUT_FILE_FORMATS:
+        raise ValueError(f"Layout file format must be one of {', '.join(LAYOUT_FILE_FORMATS)}")
+
+    if folder is None:
+        folder = os.path.join(get_data_path(), "sample_data", "layouts")
+
+    with Session.begin() as session:
+        airline_names = [name for name, in session.query(Airline.name)]
+
+    # Identify the layout in each file from its name and report files that can't be identified without reading them
+    results = {}
+    layouts = {}
+    for file_path in sorted(glob.glob(os.path.join(folder, f"*.{file_format}"))):
+        file_name = os.path.basename(file_path)
+        try:
+            layouts[file_path] = _parse_layout_file_name(file_name, airline_names)
+        except ValueError as e:
+            results[file_path] = LayoutImportResult(file_name, error=str(e))
+
+    # Layouts are imported as the workers finish reading them, in file name order
+    with ProcessPoolExecutor(max_workers=workers) if workers else nullcontext() as executor:
+        parsed_layouts = executor.map(_parse_layout_file, layouts.keys()) if executor \
+            else map(_parse_layout_file, layouts.keys())
+
+        for file_path, (row_definitions, error) in zip(layouts.keys(), parsed_layouts):
+            airline_name, aircraft, layout_name = layouts[file_path]
+            rows = 0
+            capacity = 0
+            if error is None:
+                try:
+                    rows, capacity = _import_layout(airline_name, aircraft, layout_name, row_definitions)
+                except ValueError as e:
+                    error = str(e)
+
+            results[file_path] = LayoutImportResult(os.path.basename(file_path), airline_name, aircraft, layout_name,
+                                                    rows, capacity, error)
+
+    return [results[file_path] for file_path in sorted(results.keys())]
@@ -4,19 +4,29 @@ Utilities for data exchange of airline data between the database and data files
 
 import json
 import os
-from ..model import get_data_path, Session, Airline
+from .upserts import upsert_records
+from ..model import get_data_path, Session, Airline, reference_cache
 
 
-def import_airline_details():
+def import_airline_details(file_path=None):
     """
-    Read the airport definition data file and create one airport record in the database for each airport. The
-    data file is in JSON format in the data folder of the application
+    Read an airline data file and create one airline record in the database for each airline that doesn't already
+    exist, so the import can be re-run to refresh the airline list. The data file is a JSON list of airline names
+    and, by default, is the sample data file in the data folder of the application
+
+    :param file_path: Path to the airline data file or None to import the sample data file
+    :return: An UpsertSummary instance giving the number of airlines inserted and left unchanged
     """
-    code_file = os.path.join(get_data_path(), "sample_data", "airlines", "airlines.json")
-    with open(code_file, mode="rt", encoding="utf-8") as f:
+    if file_path is None:
+        file_path = os.path.join(get_data_path(), "sample_data", "airlines", "airlines.json")
+
+    with open(file_path, mode="rt", encoding="utf-8") as f:
         json_data = json.load(f)
 
     with Session.begin() as session:
-        for airline_name in json_data:
-            airline = Airline(name=airline_name)
-            session.add(airline)
+        summary = upsert_records(session, Airline.__table__, "name", [{"name": name} for name in json_data])
+
+    if summary.inserted:
+        reference_cache.invalidate(Airline.__tablename__)
+
+    return summary
@@ -4,19 +4,37 @@ Utilities for data exchange of airport data between the database and data files
 
 import json
 import os
-from ..model import get_data_path, Session, Airport
+from .upserts import upsert_records
+from ..model import get_data_path, Session, Airport, reference_cache
 
 
-def import_airport_details():
+def import_airport_details(file_path=None):
     """
-    Read the airport definition data file and create one airport record in the database for each airport. The
-    data file is in JSON format in the data folder of the application
+    Read an airport definition data file and create or update one airport record in the database for each airport,
+    identified by its code. Airports that already exist with the same details are left unchanged, so the import can
+    be re-run to refresh the airport list. The data file is in JSON format and, by default, is the sample data file
+    in the data folder of the application
+
+    :param file_path: Path to the airport definition data file or None to import the sample data file
+    :return: An UpsertSummary instance giving the number of airports inserted, updated and left unchanged
+    :raises ValueError: If an airport definition doesn't have a code, name and timezone
     """
-    code_file = os.path.join(get_data_path(), "sample_data", "airports", "airports.json")
-    with open(code_file, mode="rt", encoding="utf-8") as f:
+    if file_path is None:
+        file_path = os.path.join(get_data_path(), "sample_data", "airports", "airports.json")
+
+    with open(file_path, mode="rt", encoding="utf-8") as f:
         json_data = json.load(f)
 
+    try:
+        records = [{"code": airport_dict["code"], "name": airport_dict["name"], "timezone": airport_dict["tz"]}
+                   for airport_dict in json_data["airports"].values()]
+    except KeyError as e:
+        raise ValueError(f"Airport definitions must include the code, name and tz: {e} is missing") from e
+
     with Session.begin() as session:
-        for airport_dict in json_data["airports"].values():
-            airport = Airport(code=airport_dict["code"], name=airport_dict["name"], timezone=airport_dict["tz"])
-            session.add(airport)
+        summary = upsert_records(session, Airport.__table__, "code", records)
+
+    if summary.inserted or summary.updated:
+        reference_cache.invalidate(Airport.__tablename__)
+
+    return summary
@@ -0,0 +1,215 @@
+"""
+Utilities for importing a manifest of passengers for a flight from a data file. Manifests are in either CSV or JSON
+format and each passenger has the following properties:
+
++-----------------+-------------------------------------------------------------------------------------------+
+| name            | Passenger name                                                                            |
++-----------------+-------------------------------------------------------------------------------------------+
+| gender          | Passenger gender M/F                                                                      |
++-----------------+-------------------------------------------------------------------------------------------+
+| dob             | Date of birth, either DD/MM/YYYY or YYYY-MM-DD                                            |
++-----------------+-------------------------------------------------------------------------------------------+
+| nationality     | Passenger nationality                                                                     |
++-----------------+-------------------------------------------------------------------------------------------+
+| residency       | Passenger's country of residency                                                          |
++-----------------+-------------------------------------------------------------------------------------------+
+| passport_number | Passport number, which must not be used by an existing passenger                          |
++-----------------+-------------------------------------------------------------------------------------------+
+
+CSV manifests have a header row giving the property names, in any order, followed by one row per passenger. JSON
+manifests contain an object with a "passengers" property that is a list of objects, one per passenger.
+
+Passengers are inserted in batches, checking for existing passengers with the same passport numbers with a single
+query per batch, and the whole manifest is imported in one transaction so nothing is imported if any part of it is
+invalid.
+"""
+
+import csv
+import datetime
+import json
+import sqlalchemy as db
+from sqlalchemy.exc import IntegrityError
+from .streams import open_text_stream
+from ..model import Session, Flight, Passenger, FlightPassenger, reference_cache
+
+#: Properties that must be given for each passenger in a manifest
+MANIFEST_COLUMNS = ["name", "gender", "dob", "nationality", "residency", "passport_number"]
+
+#: File formats, identified by their file extension, that manifests can be imported from
+MANIFEST_FILE_FORMATS = ["csv", "json"]
+
+#: Number of passengers inserted in each batch
+PASSENGER_BATCH_SIZE = 500
+
+
+def _read_csv_records(f):
+    """
+    Generator that reads the passenger records from a CSV manifest
+
+    :param f: IO stream (result of open() or a FileStorage object)
+    :return: Iterator of (line number, dictionary of passenger properties) tuples
+    :raises ValueError: If the header row doesn't include all the passenger properties
+    """
+    reader = csv.DictReader(open_text_stream(f))
+    missing = [column for column in MANIFEST_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"The manifest header row must include {', '.join(missing)}")
+
+    for record in reader:
+        yield f"line {reader.line_num}", record
+
+
+def _read_json_records(f):
+    """
+    Generator that reads the passenger records from a JSON manifest
+
+    :param f: IO stream (result of open() or a FileStorage object)
+    :return: Iterator of (record number, dictionary of passenger properties) tuples
+    :raises ValueError: If the manifest isn't valid JSON or doesn't contain a list of passengers
+    """
+    try:
+        json_data = json.load(open_text_stream(f))
+    except json.JSONDecodeError as e:
+        raise ValueError("The manifest is not valid JSON") from e
+
+    passengers = json_data.get("passengers") if isinstance(json_data, dict) else None
+    if not isinstance(passengers, list):
+        raise ValueError("The manifest must contain a list of passengers")
+
+    for record_number, record in enumerate(passengers, start=1):
+        if not isinstance(record, dict):
+            raise ValueError(f"Passenger {record_number} must be an object")
+        yield f"passenger {record_number}", record
+
+
+def _parse_date(value):
+    """
+    Parse a date of birth in either of the supported formats
+
+    :param value: Date string in the format DD/MM/YYYY or YYYY-MM-DD
+    :return: A date object or None if the string isn't a valid date
+    """
+    for date_format in ["%d/%m/%Y", "%Y-%m-%d"]:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def _read_passengers(records):
+    """
+    Generator that validates each passenger record read from a manifest and yields the values for the corresponding
+    passenger
+
+    :param records: Iterator of (location, dictionary of passenger properties) tuples
+    :return: Iterator of dictionaries of passenger column values
+    :raises ValueError: If a passenger is invalid or a passport number appears more than once in the manifest
+    """
+    passport_numbers = set()
+    for location, record in records:
+        values = {column: str(record.get(column) or "").strip() for column in MANIFEST_COLUMNS}
+
+        # Skip blank lines, such as those at the end of a file
+        if not any(values.values()):
+            continue
+
+        missing = [column for column in MANIFEST_COLUMNS if not values[column]]
+        if missing:
+            raise ValueError(f"The passenger on {location} must have a {', '.join(missing)}")
+
+        values["gender"] = values["gender"].upper()
+        if values["gender"] not in ["M", "F"]:
+            raise ValueError(f"The gender of the passenger on {location} must be M or F")
+
+        values["dob"] = _parse_date(values["dob"])
+        if values["dob"] is None:
+            raise ValueError(f"The date of birth of the passenger on {location} must be DD/MM/YYYY or YYYY-MM-DD")
+
+        if values["passport_number"] in passport_numbers:
+            raise ValueError(f"Passport number {values['passport_number']} on {location} appears more than once")
+        passport_numbers.add(values["passport_number"])
+
+        yield values
+
+
+def _insert_passenger_batch(session, flight_id, batch):
+    """
+    Insert a batch of passengers and add them to a flight
+
+    :param session: Session in which to insert the passengers
+    :param flight_id: ID of the flight to add the passengers to
+    :param batch: List of dictionaries of passenger column values
+    :raises ValueError: If any of the passport numbers belong to existing passengers
+    """
+    passport_numbers = [passenger["passport_number"] for passenger in batch]
+    query = db.select(Passenger.passport_number).where(Passenger.passport_number.in_(passport_numbers))
+    existing = session.execute(query).scalars().all()
+    if existing:
+        raise ValueError(f"Passengers with passport numbers {', '.join(sorted(existing))} already exist")
+
+    session.execute(Passenger.__table__.insert(), batch)
+
+    # Read back the IDs of the new passengers so they can be added to the flight
+    query = db.select(Passenger.id).where(Passenger.passport_number.in_(passport_numbers))
+    passenger_ids = session.execute(query).scalars().all()
+    session.execute(FlightPassenger.__table__.insert(),
+                    [{"flight_id": flight_id, "passenger_id": passenger_id} for passenger_id in passenger_ids])
+
+
+def import_passenger_manifest(flight_id, f, file_format="csv"):
+    """
+    Import a manifest of passengers and add them to a flight. The manifest is imported in a single transaction, so
+    either all the passengers are added or none of them are
+
+    :param flight_id: ID of the flight to add the passengers to
+    :param f: IO stream (result of open() or a FileStorage object)
+    :param file_format: Format of the manifest, one of MANIFEST_FILE_FORMATS
+    :return: The number of passengers added to the flight
+    :raises ValueError: If the flight doesn't exist, the manifest is invalid or a passport number is already in use
+    """
+    if file_format not in MANIFEST_FILE_FORMATS:
+        raise ValueError(f"Unsupported manifest file format {file_format}")
+
+    records = _read_json_records(f) if file_format == "json" else _read_csv_records(f)
+
+    count = 0
+    try:
+        with Session.begin() as session:
+            if session.query(Flight.id).filter(Flight.id == flight_id).scalar() is None:
+                raise ValueError(f"Flight with ID {flight_id} not found")
+
+            batch = []
+            for passenger in _read_passengers(records):
+                batch.append(passenger)
+                if len(batch) >= PASSENGER_BATCH_SIZE:
+                    _insert_passenger_batch(session, flight_id, batch)
+                    count += len(batch)
+                    batch = []
+
+            if batch:
+                _insert_passenger_batch(session, flight_id, batch)
+                count += len(batch)
+    except IntegrityError as e:
+        # A passenger with one of the passport numbers was added after the check for existing passengers
+        raise ValueError("A passenger with one of the passport numbers in the manifest already exists") from e
+
+    if count:
+        reference_cache.invalidate(Passenger.__tablename__, FlightPassenger.__tablename__)
+
+    return count
+
+
+def import_passenger_manifest_from_file(flight_id, file_path):
+    """
+    Import a manifest of passengers from a data file and add them to a flight. The format is determined from the
+    file extension
+
+    :param flight_id: ID of the flight to add the passengers to
+    :param file_path: Path to the CSV or JSON manifest
+    :return: The number of passengers added to the flight
+    :raises ValueError: If the flight doesn't exist, the manifest is invalid or a passport number is already in use
+    """
+    file_format = file_path.rsplit(".", 1)[-1].lower()
+    with open(file_path, mode="rb") as f:
+        return import_passenger_manifest(flight_id, f, file_format)
@@ -0,0 +1,39 @@
+"""
+Utilities for reading data files from streams that may have been opened in either text or binary mode, such as files
+opened using open() and files uploaded to the web application
+"""
+
+import io
+
+
+class _BinaryReader(io.RawIOBase):
+    """
+    Raw, read-only view of a binary stream that may not implement the full io interface, such as the stream behind
+    an uploaded file, so it can be buffered and decoded incrementally
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_text_stream(f):
+    """
+    Return a text stream for reading a data file, decoding the source incrementally if it's been opened in binary mode.
+    UTF-8 encoding is assumed and a leading byte order mark is skipped
+
+    :param f: IO stream (result of open() or a FileStorage object)
+    :return: Text stream
+    """
+    # Reading no data returns an empty string or bytes object, revealing the mode without consuming anything
+    if isinstance(f.read(0), str):
+        return f
+
+    return io.TextIOWrapper(io.BufferedReader(_BinaryReader(f)), encoding="utf-8-sig", newline="")
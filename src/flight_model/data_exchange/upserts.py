@@ -0,0 +1,108 @@
+"""
+Utilities for bulk "upserts" of reference data, inserting records that don't exist and updating those that do, so an
+import can be re-run to refresh the data rather than failing because the records already exist.
+
+Records are identified by a column with a unique constraint and written in batches. For each batch, the current
+values of the records in the database are read in a single query and compared with the imported values, then only
+the new and changed records are written, using a single executemany with an INSERT ... ON CONFLICT DO UPDATE
+statement. The update only changes a row if its values differ, in case it's changed between being read and written.
+"""
+
+import sqlalchemy as db
+from sqlalchemy.dialects.sqlite import insert
+
+#: Number of records read and written in each batch
+UPSERT_BATCH_SIZE = 500
+
+
+class UpsertSummary:
+    """
+    The number of records inserted, updated and left unchanged by a bulk upsert
+    """
+
+    def __init__(self, inserted=0, updated=0, unchanged=0):
+        self._inserted = inserted
+        self._updated = updated
+        self._unchanged = unchanged
+
+    @property
+    def inserted(self):
+        return self._inserted
+
+    @property
+    def updated(self):
+        return self._updated
+
+    @property
+    def unchanged(self):
+        return self._unchanged
+
+    def __add__(self, other):
+        return UpsertSummary(self._inserted + other.inserted,
+                             self._updated + other.updated,
+                             self._unchanged + other.unchanged)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" \
+               f"inserted={self._inserted}, " \
+               f"updated={self._updated}, " \
+               f"unchanged={self._unchanged})"
+
+
+def _upsert_batch(session, table, key_column, batch):
+    """
+    Insert or update a batch of records, writing only those that are new or have changed
+
+    :param session: Session in which to write the records
+    :param table: Table to write to
+    :param key_column: Name of the uniquely-constrained column identifying each record
+    :param batch: Dictionary of records, each a dictionary of column values, keyed by the value of the key column
+    :return: An UpsertSummary instance for the batch
+    """
+    value_columns = [column for column in next(iter(batch.values())).keys() if column != key_column]
+    query = db.select(table.c[key_column], *[table.c[column] for column in value_columns]) \
+        .where(table.c[key_column].in_(batch.keys()))
+    existing = {row[0]: tuple(row[1:]) for row in session.execute(query)}
+
+    changed = [record for key, record in batch.items()
+               if existing.get(key) != tuple(record[column] for column in value_columns)]
+    inserted = sum(1 for record in changed if record[key_column] not in existing)
+
+    if changed:
+        statement = insert(table)
+        if value_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=[key_column],
+                set_={column: statement.excluded[column] for column in value_columns},
+                where=db.or_(*[table.c[column].is_distinct_from(statement.excluded[column])
+                               for column in value_columns]))
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[key_column])
+        session.execute(statement, changed)
+
+    return UpsertSummary(inserted, len(changed) - inserted, len(batch) - len(changed))
+
+
+def upsert_records(session, table, key_column, records):
+    """
+    Insert or update records in a table, in batches. If the same key appears more than once in a batch, the last
+    record with that key is used
+
+    :param session: Session in which to write the records
+    :param table: Table to write to
+    :param key_column: Name of the uniquely-constrained column identifying each record
+    :param records: Iterable of records, each a dictionary of column values including the key column
+    :return: An UpsertSummary instance giving the number of records inserted, updated and left unchanged
+    """
+    summary = UpsertSummary()
+    batch = {}
+    for record in records:
+        batch[record[key_column]] = record
+        if len(batch) >= UPSERT_BATCH_SIZE:
+            summary += _upsert_batch(session, table, key_column, batch)
+            batch = {}
+
+    if batch:
+        summary += _upsert_batch(session, table, key_column, batch)
+
+    return summary
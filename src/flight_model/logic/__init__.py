@@ -1,33 +1,39 @@
-from .airports import create_airport, list_airports, get_airport, delete_airport, update_airport
-from .airlines import create_airline, list_airlines, get_airline, delete_airline, update_airline
-from .flights import create_flight, list_flights, get_flight, delete_flight, add_passenger
+from .airports import create_airport, list_airports, list_airports_page, get_airport, delete_airport, update_airport
+from .airlines import create_airline, list_airlines, list_airlines_page, get_airline, delete_airline, update_airline
+from .flights import create_flight, list_flights, list_flights_page, get_flight, delete_flight, add_passenger
 from .passengers import create_passenger, delete_passenger
-from .aircraft_layouts import list_layouts, apply_aircraft_layout, create_layout, get_layout, delete_layout, \
-    update_layout
-from .seat_allocations import allocate_seat
+from .aircraft_layouts import list_layouts, list_layouts_page, apply_aircraft_layout, create_layout, get_layout, \
+    delete_layout, update_layout
+from .seat_allocations import allocate_seat, allocate_seats
 from .row_definitions import add_row_to_layout, delete_row_from_layout, update_row_definition
 from .boarding_cards_generator import BoardingCardsGenerator
+from .boarding_card_jobs import BoardingCardJob, BoardingCardJobQueue
+from .pagination import Page
 from .exceptions import InvalidOperationError, MissingBoardingCardPluginError
 
 __all__ = [
     "create_airport",
     "list_airports",
+    "list_airports_page",
     "get_airport",
     "delete_airport",
     "update_airport",
     "create_airline",
     "list_airlines",
+    "list_airlines_page",
     "get_airline",
     "delete_airline",
     "update_airline",
     "create_flight",
     "list_flights",
+    "list_flights_page",
     "get_flight",
     "delete_flight",
     "add_passenger",
     "create_passenger",
     "delete_passenger",
     "list_layouts",
+    "list_layouts_page",
     "create_layout",
     "update_layout",
     "add_row_to_layout",
@@ -35,9 +41,13 @@ __all__ = [
     "delete_row_from_layout",
     "apply_aircraft_layout",
     "allocate_seat",
+    "allocate_seats",
     "get_layout",
     "delete_layout",
     "BoardingCardsGenerator",
+    "BoardingCardJob",
+    "BoardingCardJobQueue",
+    "Page",
     "InvalidOperationError",
     "MissingBoardingCardPluginError"
 ]
@@ -3,93 +3,121 @@ Aircraft layout business logic
 """
 
 import sqlalchemy as db
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, raiseload
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from .seat_allocations import allocate_available_seats, copy_seat_allocations, get_current_seat_allocations, \
-    remove_seats
-from ..model import Session, AircraftLayout, Flight, Seat
+from .flights import flight_loader_options, summary_options
+from .pagination import paginate
+from ..model import Session, Airline, AircraftLayout, RowDefinition, Flight, Seat, reference_cache
 
 
-def _retrieve_and_validate_new_layout(flight_id, aircraft_layout_id):
+def _validate_new_layout(flight, aircraft_layout):
     """
-    Retrieve an aircraft layout and confirm that it's suitable to be applied to a given flight
+    Confirm that an aircraft layout is suitable to be applied to a given flight
 
-    :param flight_id: ID for the flight to validate the layout for
-    :param aircraft_layout_id: ID for the aircraft layout
-    :return: Instance of the AircraftLayout with the specified ID
+    :param flight: Flight instance, loaded with the passenger count
+    :param aircraft_layout: AircraftLayout instance to validate
+    :raises ValueError: If the layout can't be applied to the flight
     """
-    with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+    if aircraft_layout is None:
+        raise ValueError("Aircraft layout not found")
 
-        aircraft_layout = session.query(AircraftLayout).get(aircraft_layout_id)
-        if flight.airline_id != aircraft_layout.airline_id:
-            raise ValueError("Aircraft layout is not associated with the airline for the flight")
+    if flight.airline_id != aircraft_layout.airline_id:
+        raise ValueError("Aircraft layout is not associated with the airline for the flight")
 
-        if flight.aircraft_layout_id == aircraft_layout_id:
-            raise ValueError("New aircraft layout is the same as the current aircraft layout")
+    if flight.aircraft_layout_id == aircraft_layout.id:
+        raise ValueError("New aircraft layout is the same as the current aircraft layout")
 
-        if aircraft_layout.capacity < flight.passenger_count:
-            raise ValueError("Aircraft layout doesn't have enough seats to accommodate all passengers")
+    if aircraft_layout.capacity < flight.passenger_count:
+        raise ValueError("Aircraft layout doesn't have enough seats to accommodate all passengers")
 
-    return aircraft_layout
+    seat_numbers = aircraft_layout.seat_numbers
+    if len(set(seat_numbers)) != len(seat_numbers):
+        raise ValueError("Aircraft layout contains repeated seat numbers")
 
 
-def _create_seats_from_layout(flight_id, aircraft_layout):
+def _swap_seats(session, flight_id, seat_numbers):
     """
-    Apply an aircraft layout to the specified flight
+    Bring the seats on a flight into line with a new set of seat numbers. Seats that exist in both the current and
+    new layouts are left in place, with their allocations, seats that aren't in the new layout are deleted and seats
+    that are only in the new layout are inserted. Passengers whose seats are removed are moved to the first available
+    seats, in layout order
 
-    :param flight_id: ID for the flight to apply the layout to
-    :param aircraft_layout: AircraftLayout instance to apply
+    :param session: Session in which to make the changes
+    :param flight_id: ID for the flight to apply the seat numbers to
+    :param seat_numbers: List of seat numbers for the new layout, in layout order
     """
-    with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+    current_seats = session.query(Seat.id, Seat.seat_number, Seat.passenger_id) \
+        .filter(Seat.flight_id == flight_id) \
+        .all()
+
+    # Compute the difference between the current and new seat numbers
+    new_seat_numbers = set(seat_numbers)
+    kept_seats = {seat.seat_number: seat for seat in current_seats if seat.seat_number in new_seat_numbers}
+    removed_seats = [seat for seat in current_seats if seat.seat_number not in new_seat_numbers]
+    added_seat_numbers = [seat_number for seat_number in seat_numbers if seat_number not in kept_seats]
 
-        # Iterate over the row definitions and the seat letters in each, adding a seat in association with the flight
-        for row_definition in aircraft_layout.row_definitions:
-            # Iterate over the seats in the row, adding each to the flight
-            for seat_letter in row_definition.seats:
-                seat = Seat(flight=flight, seat_number=f"{row_definition.number}{seat_letter}")
-                session.add(seat)
+    # Work out where passengers in removed seats will be re-seated
+    displaced_passenger_ids = [seat.passenger_id for seat in removed_seats if seat.passenger_id is not None]
+    available_seat_numbers = [seat_number
+                              for seat_number in seat_numbers
+                              if seat_number not in kept_seats or kept_seats[seat_number].passenger_id is None]
+    reallocations = dict(zip(available_seat_numbers, displaced_passenger_ids))
 
-        # Make the association between flight and layout
-        flight.aircraft_layout = aircraft_layout
+    if removed_seats:
+        session.execute(db.delete(Seat).where(Seat.id.in_([seat.id for seat in removed_seats])))
+
+    if added_seat_numbers:
+        session.execute(db.insert(Seat), [{
+            "flight_id": flight_id,
+            "seat_number": seat_number,
+            "passenger_id": reallocations.get(seat_number)
+        } for seat_number in added_seat_numbers])
+
+    moved_to_kept_seats = [{"seat_id": kept_seats[seat_number].id, "allocated_passenger_id": passenger_id}
+                           for seat_number, passenger_id in reallocations.items()
+                           if seat_number in kept_seats]
+    if moved_to_kept_seats:
+        seats = Seat.__table__
+        session.execute(seats.update()
+                        .where(seats.c.id == db.bindparam("seat_id"))
+                        .values(passenger_id=db.bindparam("allocated_passenger_id")),
+                        moved_to_kept_seats)
 
 
 def apply_aircraft_layout(flight_id, aircraft_layout_id):
     """
-    Apply an aircraft layout to a flight, copying across seat allocations
+    Apply an aircraft layout to a flight, preserving the seats, and their allocations, that exist in both the current
+    and new layouts. The change is made in a single transaction so either the whole layout is applied or, on error,
+    the flight is left unchanged
 
     :param flight_id: ID of the flight to apply the layout to
     :param aircraft_layout_id: ID of the aircraft layout to apply
+    :raises ValueError: If the layout can't be applied to the flight
     """
+    with Session.begin() as session:
+        flight = session.query(Flight) \
+            .options(*summary_options(), *flight_loader_options()) \
+            .get(flight_id)
 
-    # TODO : This needs refactoring but works well enough as a demo for now
-
-    # Get the aircraft layout and make sure it's valid for the specified flight
-    aircraft_layout = _retrieve_and_validate_new_layout(flight_id, aircraft_layout_id)
-
-    # Get the current seating allocations and remove the existing seats
-    current_allocations = get_current_seat_allocations(flight_id)
-    remove_seats(flight_id)
-
-    # Create the new seats
-    _create_seats_from_layout(flight_id, aircraft_layout)
+        # Get the aircraft layout and make sure it's valid for the specified flight
+        aircraft_layout = session.query(AircraftLayout).get(aircraft_layout_id)
+        _validate_new_layout(flight, aircraft_layout)
 
-    # Copy seating allocations across
-    not_allocated = copy_seat_allocations(flight_id, current_allocations)
+        # Replace the seats that differ between the two layouts and make the association between flight and layout
+        _swap_seats(session, flight_id, aircraft_layout.seat_numbers)
+        flight.aircraft_layout_id = aircraft_layout.id
 
-    # It's possible some seats don't exist in the new layout compared to the old. If there are any passengers
-    # who were in those seats, move them to the next available seats
-    if not_allocated:
-        allocate_available_seats(flight_id, not_allocated)
+    reference_cache.invalidate(Flight.__tablename__, Seat.__tablename__)
 
 
+@reference_cache.cached(AircraftLayout.__tablename__, RowDefinition.__tablename__, Airline.__tablename__)
 def list_layouts(airline_id=None):
     """
-    List of aircraft layouts for an airline
+    List of aircraft layouts for an airline. The list is cached until the layouts, their row definitions or the
+    airlines are changed
 
     :param airline_id: ID of the airline for which to load aircraft layouts (or None to list all layouts)
-    :return: A list of Aircraft layout instances with eager loading of related entities
+    :return: A list of read-only snapshots of AircraftLayout instances, including their airline and row definitions
     """
     with Session.begin() as session:
         if airline_id:
@@ -109,6 +137,30 @@ def list_layouts(airline_id=None):
     return layouts
 
 
+@reference_cache.cached(AircraftLayout.__tablename__, Airline.__tablename__)
+def list_layouts_page(page_size, after=None, before=None, airline_id=None):
+    """
+    Return one page of aircraft layouts, ordered by aircraft and layout name, using keyset pagination. The row
+    definitions for the layouts are not loaded. The page is cached until the layouts or airlines are changed
+
+    :param page_size: Maximum number of layouts on the page
+    :param after: ID of the layout after which the page starts or None
+    :param before: ID of the layout before which the page ends or None
+    :param airline_id: ID of the airline for which to list layouts or None to list all layouts
+    :return: A Page instance containing read-only snapshots of AircraftLayout instances, including their airline
+    """
+    with Session.begin() as session:
+        query = session.query(AircraftLayout) \
+            .options(joinedload(AircraftLayout.airline), raiseload(AircraftLayout.row_definitions))
+        if airline_id:
+            query = query.filter(AircraftLayout.airline_id == airline_id)
+
+        page = paginate(query, [AircraftLayout.aircraft, AircraftLayout.name, AircraftLayout.id], page_size, after,
+                        before)
+
+    return page
+
+
 def get_layout(layout_id):
     """
     Get the aircraft layout with the specified ID
@@ -141,6 +193,7 @@ def create_layout(airline_id, aircraft_model, layout_name):
                                          aircraft=aircraft_model,
                                          name="" if layout_name is None else layout_name)
         session.add(aircraft_layout)
+    reference_cache.invalidate(AircraftLayout.__tablename__)
 
     return aircraft_layout
 
@@ -161,6 +214,7 @@ def update_layout(layout_id, aircraft_model, layout_name):
                 .one()
             aircraft_layout.aircraft = aircraft_model
             aircraft_layout.name = layout_name
+        reference_cache.invalidate(AircraftLayout.__tablename__)
     except NoResultFound as e:
         raise ValueError("Aircraft layout not found") from e
     except IntegrityError as e:
@@ -178,5 +232,6 @@ def delete_layout(layout_id):
         with Session.begin() as session:
             layout = session.query(AircraftLayout).get(layout_id)
             session.delete(layout)
+        reference_cache.invalidate(AircraftLayout.__tablename__)
     except IntegrityError as e:
         raise ValueError("Cannot delete an aircraft layout that is referenced by a flight") from e
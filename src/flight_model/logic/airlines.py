@@ -5,7 +5,8 @@ Airline business logic
 import sqlalchemy as db
 from functools import singledispatch
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from ..model import Session, Airline
+from .pagination import paginate
+from ..model import Session, Airline, reference_cache
 
 
 def create_airline(name):
@@ -20,6 +21,7 @@ def create_airline(name):
         with Session.begin() as session:
             airline = Airline(name=name)
             session.add(airline)
+        reference_cache.invalidate(Airline.__tablename__)
     except IntegrityError as e:
         raise ValueError("Cannot create duplicate airline name") from e
 
@@ -61,17 +63,34 @@ def _(airline_id):
     return airline
 
 
+@reference_cache.cached(Airline.__tablename__)
 def list_airlines():
     """
-    List all airlines
+    List all airlines. The list is cached until the airlines are changed
 
-    :return: A list of Airline instances without eager loading of related entities
+    :return: A list of read-only snapshots of Airline instances, without related entities
     """
     with Session.begin() as session:
         airlines = session.query(Airline).order_by(db.asc(Airline.name)).all()
     return airlines
 
 
+@reference_cache.cached(Airline.__tablename__)
+def list_airlines_page(page_size, after=None, before=None):
+    """
+    Return one page of airlines, ordered by name, using keyset pagination. The page is cached until the airlines are
+    changed
+
+    :param page_size: Maximum number of airlines on the page
+    :param after: ID of the airline after which the page starts or None
+    :param before: ID of the airline before which the page ends or None
+    :return: A Page instance containing read-only snapshots of Airline instances
+    """
+    with Session.begin() as session:
+        page = paginate(session.query(Airline), [Airline.name, Airline.id], page_size, after, before)
+    return page
+
+
 def delete_airline(airline_id):
     """
     Delete the airline with the specified ID
@@ -81,6 +100,7 @@ def delete_airline(airline_id):
     with Session.begin() as session:
         airline = session.query(Airline).get(airline_id)
         session.delete(airline)
+    reference_cache.invalidate(Airline.__tablename__)
 
 
 def update_airline(airline_id, name):
@@ -95,6 +115,7 @@ def update_airline(airline_id, name):
         with Session.begin() as session:
             airline = session.query(Airline).filter(Airline.id == airline_id).one()
             airline.name = name
+        reference_cache.invalidate(Airline.__tablename__)
     except NoResultFound as e:
         raise ValueError("Airline not found") from e
     except IntegrityError as e:
@@ -4,7 +4,8 @@ Airport business logic
 
 import sqlalchemy as db
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from ..model import Session, Airport
+from .pagination import paginate
+from ..model import Session, Airport, reference_cache
 
 
 def create_airport(code, name, timezone):
@@ -21,23 +22,41 @@ def create_airport(code, name, timezone):
         with Session.begin() as session:
             airport = Airport(code=code, name=name, timezone=timezone)
             session.add(airport)
+        reference_cache.invalidate(Airport.__tablename__)
     except IntegrityError as e:
         raise ValueError("Cannot create duplicate airport code") from e
 
     return airport
 
 
+@reference_cache.cached(Airport.__tablename__)
 def list_airports():
     """
-    List all airports
+    List all airports. The list is cached until the airports are changed
 
-    :return: A list of Airport instances without eager loading of related entities
+    :return: A list of read-only snapshots of Airport instances, without related entities
     """
     with Session.begin() as session:
         airports = session.query(Airport).order_by(db.asc(Airport.code)).all()
     return airports
 
 
+@reference_cache.cached(Airport.__tablename__)
+def list_airports_page(page_size, after=None, before=None):
+    """
+    Return one page of airports, ordered by airport code, using keyset pagination. The page is cached until the airports
+    are changed
+
+    :param page_size: Maximum number of airports on the page
+    :param after: ID of the airport after which the page starts or None
+    :param before: ID of the airport before which the page ends or None
+    :return: A Page instance containing read-only snapshots of Airport instances
+    """
+    with Session.begin() as session:
+        page = paginate(session.query(Airport), [Airport.code, Airport.id], page_size, after, before)
+    return page
+
+
 def get_airport(airport_id):
     """
     Get the airport with the specified ID
@@ -66,6 +85,7 @@ def delete_airport(airport_id):
         with Session.begin() as session:
             airport = session.query(Airport).get(airport_id)
             session.delete(airport)
+        reference_cache.invalidate(Airport.__tablename__)
     except IntegrityError as e:
         raise ValueError("Cannot delete an airport that is referenced by a flight") from e
 
@@ -86,6 +106,7 @@ def update_airport(airport_id, code, name, timezone):
             airport.code = code
             airport.name = name
             airport.timezone = timezone
+        reference_cache.invalidate(Airport.__tablename__)
     except NoResultFound as e:
         raise ValueError("Airport not found") from e
     except IntegrityError as e:
@@ -0,0 +1,284 @@
+"""
+This module defines a bounded queue of boarding card generation jobs, serviced by a fixed pool of worker threads.
+
+Only one job for a given flight, card format and gate can be queued or running at a time. Submitting a duplicate
+returns the existing job rather than starting another renderer. Jobs for the same flight and card format write the same
+cards, so they run one at a time in the order they were submitted and the cards are left with the gate that was
+requested last. Each job passes through the following states:
+
++---------+-------------------------------------------------------------+
+| queued  | The job is waiting for a worker                             |
++---------+-------------------------------------------------------------+
+| running | A worker is rendering the boarding cards                    |
++---------+-------------------------------------------------------------+
+| done    | All the boarding cards have been written                    |
++---------+-------------------------------------------------------------+
+| failed  | Generation stopped with an error, recorded against the job  |
++---------+-------------------------------------------------------------+
+"""
+
+import itertools
+import queue
+import threading
+from collections import OrderedDict, deque
+from .boarding_cards_generator import BoardingCardsGenerator
+from .exceptions import InvalidOperationError
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class BoardingCardJob:
+    """
+    Class representing a request to generate the boarding cards for a flight, and its progress
+    """
+    def __init__(self, job_id, flight_id, card_format, gate, generator):
+        self._job_id = job_id
+        self._flight_id = flight_id
+        self._card_format = card_format
+        self._gate = gate
+        self._generator = generator
+        self._state = QUEUED
+        self._error = None
+        self._total_cards = 0
+        self._cards_rendered = 0
+        self._cards_unchanged = 0
+
+    @property
+    def job_id(self):
+        return self._job_id
+
+    @property
+    def flight_id(self):
+        return self._flight_id
+
+    @property
+    def card_format(self):
+        return self._card_format
+
+    @property
+    def gate(self):
+        return self._gate
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def total_cards(self):
+        generator = self._generator
+        return generator.total_cards if generator else self._total_cards
+
+    @property
+    def cards_rendered(self):
+        generator = self._generator
+        return generator.cards_rendered if generator else self._cards_rendered
+
+    @property
+    def cards_unchanged(self):
+        generator = self._generator
+        return generator.cards_unchanged if generator else self._cards_unchanged
+
+    @property
+    def is_active(self):
+        return self._state in (QUEUED, RUNNING)
+
+    def run(self):
+        """
+        Generate the boarding cards for this job, recording the outcome in the job state. Once the job has finished,
+        only the card counts are kept and the generator, with the flight, seats and passengers it holds, is released
+        """
+        self._state = RUNNING
+        try:
+            self._generator.generate_cards()
+        except Exception as e:
+            self._error = str(e)
+            self._state = FAILED
+        else:
+            self._state = DONE
+        finally:
+            self._total_cards = self._generator.total_cards
+            self._cards_rendered = self._generator.cards_rendered
+            self._cards_unchanged = self._generator.cards_unchanged
+            self._generator = None
+
+    def to_dict(self):
+        """
+        Return the job status as a dictionary
+
+        :return: Dictionary of job status properties
+        """
+        return {
+            "job_id": self._job_id,
+            "flight_id": self._flight_id,
+            "card_format": self._card_format,
+            "gate": self._gate,
+            "state": self._state,
+            "total_cards": self.total_cards,
+            "cards_rendered": self.cards_rendered,
+            "cards_unchanged": self.cards_unchanged,
+            "error": self._error
+        }
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" \
+               f"job_id={self._job_id!r}, " \
+               f"flight_id={self._flight_id!r}, " \
+               f"card_format={self._card_format!r}, " \
+               f"gate={self._gate!r}, " \
+               f"state={self._state!r})"
+
+
+class BoardingCardJobQueue:
+    """
+    Class representing a bounded queue of boarding card jobs, run by a pool of worker threads
+    """
+    def __init__(self, workers=2, max_queued=20, history=100, card_workers=None, card_pool="process",
+                 card_output="files"):
+        """
+        Initialise the job queue. Worker threads are started when the first job is submitted
+
+        :param workers: Number of worker threads running jobs
+        :param max_queued: Maximum number of jobs waiting for a worker
+        :param history: Number of finished jobs whose status is retained
+        :param card_workers: Number of workers each job uses to render cards in parallel, or None to render serially
+        :param card_pool: Type of pool used to render cards in parallel, either "process" or "thread"
+        :param card_output: Boarding card output mode, either "files" or "archive"
+        :raises ValueError: If the number of workers or maximum queue length is less than 1
+        """
+        if workers < 1:
+            raise ValueError("The number of job queue workers must be at least 1")
+
+        if max_queued < 1:
+            raise ValueError("The maximum number of queued jobs must be at least 1")
+
+        self._workers = workers
+        self._history = history
+        self._card_workers = card_workers
+        self._card_pool = card_pool
+        self._card_output = card_output
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._run_order = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._turn_changed = threading.Condition(self._lock)
+        self._threads = []
+
+    def submit(self, flight_id, card_format, gate):
+        """
+        Queue a job to generate the boarding cards for a flight. If a job for the same flight, card format and gate is
+        already queued or running, that job is returned instead
+
+        :param flight_id: ID of the flight
+        :param card_format: Boarding card format
+        :param gate: Departure gate number
+        :return: The queued or existing job
+        :raises ValueError: If the gate isn't specified
+        :raises InvalidOperationError: If the flight has no layout or passengers or the queue is full
+        :raises MissingBoardingCardPluginError: If there's no plugin for the card format
+        """
+        key = (flight_id, card_format, gate)
+        with self._lock:
+            job = self._active.get(key)
+            if job:
+                return job
+
+        # Creating the generator validates the request and loads the flight before the job is queued. It's created
+        # without holding the lock so status requests aren't blocked while the flight is loaded
+        generator = BoardingCardsGenerator(flight_id,
+                                           card_format,
+                                           gate,
+                                           workers=self._card_workers,
+                                           pool=self._card_pool,
+                                           output=self._card_output)
+
+        with self._lock:
+            # An identical job may have been submitted while the generator was being created
+            job = self._active.get(key)
+            if job:
+                return job
+
+            job = BoardingCardJob(next(self._job_ids), flight_id, card_format, gate, generator)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full as e:
+                raise InvalidOperationError("Too many boarding card jobs are queued. Please try again later") from e
+
+            self._active[key] = job
+            self._run_order.setdefault((flight_id, card_format), deque()).append(job)
+            self._jobs[job.job_id] = job
+            self._trim_history()
+            self._start_workers()
+
+        return job
+
+    def get_job(self, job_id):
+        """
+        Return the job with the specified ID
+
+        :param job_id: Job ID
+        :return: The job or None if it doesn't exist or its status is no longer retained
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """
+        List the jobs whose status is retained, oldest first
+
+        :return: A list of jobs
+        """
+        with self._lock:
+            return list(self._jobs.values())
+
+    def join(self):
+        """
+        Block until all the queued jobs have finished
+        """
+        self._queue.join()
+
+    def _trim_history(self):
+        """
+        Discard the oldest finished jobs once the number retained exceeds the history limit
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if not job.is_active]
+        for job_id in finished[:max(0, len(self._jobs) - self._history)]:
+            del self._jobs[job_id]
+
+    def _start_workers(self):
+        """
+        Start the worker threads if they're not already running
+        """
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(target=self._process_jobs, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _process_jobs(self):
+        """
+        Worker thread loop that runs jobs as they're taken from the queue. Jobs for the same flight and card format
+        wait for those submitted before them to finish, so they don't write the same cards at the same time
+        """
+        while True:
+            job = self._queue.get()
+            run_order = self._run_order[(job.flight_id, job.card_format)]
+            try:
+                with self._turn_changed:
+                    self._turn_changed.wait_for(lambda: run_order[0] is job)
+                job.run()
+            finally:
+                with self._turn_changed:
+                    del self._active[(job.flight_id, job.card_format, job.gate)]
+                    run_order.popleft()
+                    if not run_order:
+                        del self._run_order[(job.flight_id, job.card_format)]
+                    self._turn_changed.notify_all()
+                self._queue.task_done()
@@ -9,7 +9,9 @@ extend the following entry point:
 
     flight_booking.card_generator_plugins
 
-They should expose the following symbols:
+The entry point should be named after the card format, so only the plugin for the format being printed needs to be
+loaded. Plugins are discovered and loaded when they're first used, rather than when the module is imported. They
+should expose the following symbols:
 
 +----------------+---------------------------------------------------------------------------------------------------+
 | card_format    | String containing the format in which boarding card data is generated e.g. html, pdf, txt         |
@@ -40,41 +42,145 @@ The card_generator function receives a dictionary of properties, as follows:
 +------------------+----------------------------------------------------------------------------------+
 | seat_number      | The seat number                                                                  |
 +------------------+----------------------------------------------------------------------------------+
+
+By default, cards are rendered serially on the generator's thread. If a number of workers is specified, rendering is
+fanned out across a pool and each card is written as soon as it has been rendered. The pool types are:
+
++---------+------------------------------------------------------------------------------------------------------+
+| process | Render cards in worker processes. Suited to CPU-bound plugins but the card_generator function must   |
+|         | be defined at module level so it can be pickled                                                      |
++---------+------------------------------------------------------------------------------------------------------+
+| thread  | Render cards on worker threads. Suited to plugins that spend their time waiting on I/O or on         |
+|         | subprocesses                                                                                         |
++---------+------------------------------------------------------------------------------------------------------+
+
+A manifest is kept alongside the cards for each flight, card format and output mode, holding a hash of the details
+each card was rendered from. When cards are regenerated, only those whose details have changed are rendered again and
+the cards for seats that are no longer allocated are deleted.
+
+The cards can be written using one of the following output modes:
+
++---------+------------------------------------------------------------------------------------------------------+
+| files   | Write each card to its own file in the boarding cards folder                                         |
++---------+------------------------------------------------------------------------------------------------------+
+| archive | Write all the cards for the flight, sequentially, to a single uncompressed zip archive in the        |
+|         | boarding cards folder. The archive is only replaced once all the cards have been written             |
++---------+------------------------------------------------------------------------------------------------------+
+
+Alternatively, the stream_archive() method renders the cards into a zip archive that's yielded in chunks as each card
+is completed, without writing anything to disk, so it can be streamed as a download.
 """
 
+import hashlib
+import io
+import json
 import os
 import re
-import pkg_resources
 import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from ..model import Session, Flight, get_data_path
 from .exceptions import InvalidOperationError, MissingBoardingCardPluginError
+from .flights import flight_loader_options
 
 
-# Set comprehension that uses pkg_resources to identify entry point objects
-# for the boarding card printer. The load() method on these returns the module
-card_printer_plugins = {
-    entry_point.load()
-    for entry_point
-    in pkg_resources.iter_entry_points("flight_booking.card_generator_plugins")
-}
+#: Entry point group used to register boarding card generator plugins
+PLUGIN_ENTRY_POINT_GROUP = "flight_booking.card_generator_plugins"
+
+# Dictionary that maps the format string for each plugin that's been loaded to its callable card generator. Plugins
+# are discovered and loaded on first use, rather than when this module is imported
+card_generator_map = {}
+
+_plugin_entry_points = None
+_plugin_lock = threading.Lock()
+
+
+def get_card_generator(card_format):
+    """
+    Return the card generator for a card format, loading the plugin that provides it if it's not already loaded.
+    Entry points named after the card format are tried first so, if plugins follow that convention, only the plugin
+    for the requested format is loaded. Otherwise, the remaining plugins are loaded in turn until one is found
+
+    :param card_format: Boarding card format
+    :return: The card generator function
+    :raises MissingBoardingCardPluginError: If there's no plugin for the card format
+    """
+    try:
+        return card_generator_map[card_format]
+    except KeyError:
+        pass
+
+    global _plugin_entry_points
+    with _plugin_lock:
+        if _plugin_entry_points is None:
+            _plugin_entry_points = _find_plugin_entry_points()
+
+        # Entry points are removed from the list of candidates once loaded, so each plugin is loaded at most once
+        candidates = sorted(_plugin_entry_points, key=lambda entry_point: entry_point.name != card_format)
+        for entry_point in candidates:
+            if card_format in card_generator_map:
+                break
+
+            _plugin_entry_points.remove(entry_point)
+            module = entry_point.load()
+            card_generator_map.setdefault(module.card_format, module.card_generator)
+
+    try:
+        return card_generator_map[card_format]
+    except KeyError as e:
+        raise MissingBoardingCardPluginError(
+            f"Boarding card plugin not registered for format {card_format}",
+            card_format=card_format
+        ) from e
+
+
+def _find_plugin_entry_points():
+    """
+    Find the entry points for the installed boarding card generator plugins, without loading them
+
+    :return: A list of entry points
+    """
+    # Imported here as it's relatively expensive to import and is only needed the first time a plugin is requested
+    import importlib.metadata
 
-# Build a dictionary of plugins that maps their format string to their callable
-# card printer
-card_generator_map = {
-    module.card_format: module.card_generator
-    for module in card_printer_plugins
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=PLUGIN_ENTRY_POINT_GROUP))
+
+    # Before Python 3.10, entry_points() returns a dictionary of entry points keyed by group
+    return list(entry_points.get(PLUGIN_ENTRY_POINT_GROUP, []))
+
+
+#: Executor classes used to render boarding cards in parallel, by pool type
+POOL_EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor
 }
 
+#: Supported boarding card output modes
+OUTPUT_MODES = ["files", "archive"]
+
 
 class BoardingCardsGenerator(threading.Thread):
-    def __init__(self, flight_id, card_format, gate):
+    def __init__(self, flight_id, card_format, gate, workers=None, pool="process", incremental=True, output="files"):
         threading.Thread.__init__(self)
 
         if not gate:
             raise ValueError("Gate must be specified to print boarding cards")
 
+        if workers is not None and workers < 1:
+            raise ValueError("The number of workers must be at least 1")
+
+        if pool not in POOL_EXECUTORS:
+            raise ValueError(f"Unknown boarding card pool type {pool}")
+
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"Unknown boarding card output mode {output}")
+
         with Session.begin() as session:
-            self._flight = session.query(Flight).get(flight_id)
+            self._flight = session.query(Flight) \
+                .options(*flight_loader_options(seats=True, passengers=True)) \
+                .get(flight_id)
 
         if not self._flight.seats:
             # An empty sequence or None will be falsy
@@ -83,52 +189,313 @@ class BoardingCardsGenerator(threading.Thread):
         if not self._flight.passengers:
             raise InvalidOperationError("Cannot print boarding cards if the flight has no passengers")
 
-        try:
-            self._generator = card_generator_map[card_format]
-        except KeyError as e:
-            raise MissingBoardingCardPluginError(
-                f"Boarding card plugin not registered for format {card_format}",
-                card_format=card_format
-            ) from e
+        self._generator = get_card_generator(card_format)
 
         self._card_format = card_format
         self._gate = gate
+        self._workers = workers
+        self._pool = pool
+        self._incremental = incremental
+        self._output = output
+        self._card_folder = None
+        self._total_cards = None
+        self._cards_rendered = 0
+        self._cards_unchanged = 0
+        self._card_hashes = {}
+        self._manifest = {}
 
     def generate_cards(self):
         """
-        Generate boarding cards on the current thread
-        """
-        allocations = [(seat.seat_number, seat.passenger_id)
-                       for seat in self._flight.seats
-                       if seat.passenger_id is not None]
-
-        for seat_number, passenger_id in allocations:
-            # Construct the card details for this passenger and generate the card
-            passengers = [passenger for passenger in self._flight.passengers if passenger.id == passenger_id]
-            card_data = self._generator({
-                "gate": self._gate,
-                "airline": self._flight.airline.name,
-                "embarkation_name": self._flight.embarkation_airport.name,
-                "embarkation": self._flight.embarkation_airport.code,
-                "departs": self._flight.departs_localtime.strftime("%I:%M %p"),
-                "destination_name": self._flight.destination_airport.name,
-                "destination": self._flight.destination_airport.code,
-                "arrives": self._flight.arrives_localtime.strftime("%I:%M %p"),
-                "name": passengers[0].name,
-                "seat_number": seat_number
-            })
-
-            # Write the card to a file
-            card_file_path = BoardingCardsGenerator.get_boarding_card_path(self._flight.number,
-                                                                           seat_number,
-                                                                           self._flight.departure_date,
-                                                                           self._card_format)
-            if isinstance(card_data, str):
-                with open(card_file_path, mode="wt", encoding="utf-8") as f:
-                    f.write(card_data)
-            else:
-                with open(card_file_path, mode="wb") as f:
-                    f.write(card_data)
+        Generate boarding cards on the current thread, rendering them in parallel if a number of workers was specified.
+        In incremental mode, cards whose details are unchanged since they were last generated aren't rendered again
+        """
+        card_details = self._get_card_details()
+        self._card_hashes = {seat_number: self._get_card_hash(details) for seat_number, details in card_details}
+        self._card_folder = BoardingCardsGenerator._get_boarding_card_folder()
+        previous_manifest = self._load_manifest()
+
+        if self._output == "archive":
+            self._generate_archive(card_details, previous_manifest)
+        else:
+            self._generate_files(card_details, previous_manifest)
+
+    def _generate_files(self, card_details, previous_manifest):
+        """
+        Generate boarding cards, writing each one to its own file
+
+        :param card_details: A list of (seat number, card details) tuples
+        :param previous_manifest: Manifest from the last time cards were generated
+        """
+        # Remove the cards for seats that are no longer allocated
+        for seat_number in previous_manifest.keys() - self._card_hashes.keys():
+            card_file_path = self._get_card_path(seat_number)
+            if os.path.exists(card_file_path):
+                os.unlink(card_file_path)
+
+        # Carry forward the cards whose details haven't changed, provided the card file still exists
+        card_details = self._select_cards_to_render(card_details,
+                                                    previous_manifest,
+                                                    lambda seat_number: os.path.exists(self._get_card_path(seat_number)))
+
+        try:
+            self._render_cards(card_details, self._write_card_file)
+        finally:
+            # Save the manifest even if generation fails, so the cards that were written aren't rendered again
+            self._save_manifest()
+
+    def _generate_archive(self, card_details, previous_manifest):
+        """
+        Generate boarding cards, writing them to a single archive. Unchanged cards are copied from the previous archive
+        and the cards for seats that are no longer allocated are left out
+
+        :param card_details: A list of (seat number, card details) tuples
+        :param previous_manifest: Manifest from the last time cards were generated
+        """
+        archive_path = BoardingCardsGenerator.get_archive_path(self._flight.number,
+                                                               self._flight.departure_date,
+                                                               self._card_format)
+        temporary_path = archive_path + ".tmp"
+        previous_archive = None
+        try:
+            if self._incremental and os.path.exists(archive_path):
+                try:
+                    previous_archive = zipfile.ZipFile(archive_path, mode="r")
+                except zipfile.BadZipFile:
+                    pass
+
+            previous_entries = set(previous_archive.namelist()) if previous_archive else set()
+            card_details = self._select_cards_to_render(
+                card_details,
+                previous_manifest,
+                lambda seat_number: self._get_card_file_name(seat_number) in previous_entries)
+
+            with zipfile.ZipFile(temporary_path, mode="w", compression=zipfile.ZIP_STORED) as archive:
+                for seat_number in list(self._manifest.keys()):
+                    entry_name = self._get_card_file_name(seat_number)
+                    archive.writestr(previous_archive.getinfo(entry_name), previous_archive.read(entry_name))
+
+                self._render_cards(card_details,
+                                   lambda seat_number, card_data: archive.writestr(
+                                       self._get_card_file_name(seat_number), card_data))
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.unlink(temporary_path)
+            raise
+        finally:
+            if previous_archive:
+                previous_archive.close()
+
+        os.replace(temporary_path, archive_path)
+        self._save_manifest()
+
+    def _select_cards_to_render(self, card_details, previous_manifest, is_written):
+        """
+        Identify the cards that need to be rendered. In incremental mode, cards whose details match the previous manifest
+        and that have already been written are carried forward into the new manifest rather than being rendered again
+
+        :param card_details: A list of (seat number, card details) tuples
+        :param previous_manifest: Manifest from the last time cards were generated
+        :param is_written: Callable that's passed a seat number and returns True if that seat's card has been written
+        :return: A list of (seat number, card details) tuples for the cards to render
+        """
+        self._manifest = {
+            seat_number: card_hash
+            for seat_number, card_hash in self._card_hashes.items()
+            if previous_manifest.get(seat_number) == card_hash and is_written(seat_number)
+        } if self._incremental else {}
+
+        card_details = [(seat_number, details) for seat_number, details in card_details
+                        if seat_number not in self._manifest]
+        self._cards_unchanged = len(self._manifest)
+        self._total_cards = len(card_details)
+        return card_details
+
+    def _render_cards(self, card_details, write_card):
+        """
+        Render boarding cards and write each one as it's completed
+
+        :param card_details: A list of (seat number, card details) tuples
+        :param write_card: Callable that's passed the seat number and card data for each rendered card
+        """
+        for seat_number, card_data in self._iterate_rendered_cards(card_details):
+            self._card_written(seat_number, write_card, card_data)
+
+    def _iterate_rendered_cards(self, card_details):
+        """
+        Generator that renders boarding cards, in parallel if a number of workers was specified, and yields each one
+        as it's completed
+
+        :param card_details: A list of (seat number, card details) tuples
+        :return: A generator of (seat number, card data) tuples
+        """
+        if self._workers:
+            with POOL_EXECUTORS[self._pool](max_workers=self._workers) as executor:
+                futures = {executor.submit(self._generator, details): seat_number
+                           for seat_number, details in card_details}
+                try:
+                    for future in as_completed(futures):
+                        yield futures[future], future.result()
+                except BaseException:
+                    # Don't wait for the remaining cards to be rendered if one of them has failed or the consumer
+                    # has stopped iterating
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        else:
+            for seat_number, details in card_details:
+                yield seat_number, self._generator(details)
+
+    def stream_archive(self):
+        """
+        Generator that renders every boarding card for the flight and yields a zip archive containing them, in chunks,
+        as the cards are rendered. Nothing is written to disk and the manifest isn't used or updated
+
+        :return: A generator of chunks of archive data
+        """
+        card_details = self._get_card_details()
+        self._cards_unchanged = 0
+        self._total_cards = len(card_details)
+
+        stream = _ArchiveStream()
+        with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for seat_number, card_data in self._iterate_rendered_cards(card_details):
+                archive.writestr(self._get_card_file_name(seat_number), card_data)
+                self._cards_rendered += 1
+                yield stream.read_chunk()
+
+        # Closing the archive writes the central directory
+        yield stream.read_chunk()
+
+    def _card_written(self, seat_number, write_card, card_data):
+        """
+        Write a rendered card and record it in the manifest
+
+        :param seat_number: Seat number the card is for
+        :param write_card: Callable that's passed the seat number and card data to write the card
+        :param card_data: Card data returned by the plugin, either a string or bytes
+        """
+        write_card(seat_number, card_data)
+        self._manifest[seat_number] = self._card_hashes[seat_number]
+        self._cards_rendered += 1
+
+    def _write_card_file(self, seat_number, card_data):
+        """
+        Write the data for a single boarding card to its file
+
+        :param seat_number: Seat number the card is for
+        :param card_data: Card data returned by the plugin, either a string or bytes
+        """
+        card_file_path = self._get_card_path(seat_number)
+        if isinstance(card_data, str):
+            with open(card_file_path, mode="wt", encoding="utf-8") as f:
+                f.write(card_data)
+        else:
+            with open(card_file_path, mode="wb") as f:
+                f.write(card_data)
+
+    def _get_card_file_name(self, seat_number):
+        """
+        Construct the name of the boarding card file for a seat on this flight
+
+        :param seat_number: Seat number
+        :return: The boarding card file name
+        """
+        return BoardingCardsGenerator.get_boarding_card_file_name(self._flight.number,
+                                                                  seat_number,
+                                                                  self._flight.departure_date,
+                                                                  self._card_format)
+
+    def _get_card_path(self, seat_number):
+        """
+        Construct the path to the boarding card file for a seat on this flight
+
+        :param seat_number: Seat number
+        :return: The boarding card path
+        """
+        return os.path.join(self._card_folder, self._get_card_file_name(seat_number))
+
+    def _load_manifest(self):
+        """
+        Load the manifest of card hashes from the last time cards were generated for this flight, format and output
+        mode
+
+        :return: Dictionary of card hashes keyed by seat number, empty if there's no manifest or it can't be read
+        """
+        manifest_path = BoardingCardsGenerator.get_manifest_path(self._flight.number,
+                                                                 self._flight.departure_date,
+                                                                 self._card_format,
+                                                                 self._output)
+        try:
+            with open(manifest_path, mode="rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        """
+        Save the manifest of card hashes for the cards that have been generated. The manifest is written to a temporary
+        file that then replaces the existing one, so a partially written manifest is never left behind
+        """
+        manifest_path = BoardingCardsGenerator.get_manifest_path(self._flight.number,
+                                                                 self._flight.departure_date,
+                                                                 self._card_format,
+                                                                 self._output)
+        temporary_path = manifest_path + ".tmp"
+        with open(temporary_path, mode="wt", encoding="utf-8") as f:
+            json.dump(self._manifest, f, sort_keys=True)
+        os.replace(temporary_path, manifest_path)
+
+    @staticmethod
+    def _get_card_hash(card_details):
+        """
+        Return a hash of the details a boarding card is rendered from
+
+        :param card_details: Boarding card details
+        :return: Hex digest of the card details
+        """
+        return hashlib.sha256(json.dumps(card_details, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _get_card_details(self):
+        """
+        Construct the card details for each allocated seat on the flight. The flight-level details are the same for
+        every card, so they're calculated once and the passenger for each seat is found using an index by ID
+
+        :return: A list of (seat number, card details) tuples
+        """
+        flight_details = {
+            "gate": self._gate,
+            "airline": self._flight.airline.name,
+            "embarkation_name": self._flight.embarkation_airport.name,
+            "embarkation": self._flight.embarkation_airport.code,
+            "departs": self._flight.departs_localtime.strftime("%I:%M %p"),
+            "destination_name": self._flight.destination_airport.name,
+            "destination": self._flight.destination_airport.code,
+            "arrives": self._flight.arrives_localtime.strftime("%I:%M %p")
+        }
+
+        passenger_names = {passenger.id: passenger.name for passenger in self._flight.passengers}
+        return [(seat.seat_number, {
+                    **flight_details,
+                    "name": passenger_names[seat.passenger_id],
+                    "seat_number": seat.seat_number
+                })
+                for seat in self._flight.seats
+                if seat.passenger_id is not None]
+
+    @property
+    def flight(self):
+        return self._flight
+
+    @property
+    def total_cards(self):
+        return self._total_cards
+
+    @property
+    def cards_rendered(self):
+        return self._cards_rendered
+
+    @property
+    def cards_unchanged(self):
+        return self._cards_unchanged
 
     def run(self, *args, **kwargs):
         """
@@ -150,12 +517,82 @@ class BoardingCardsGenerator(threading.Thread):
         :param card_format: Boarding card format, used as the file extension
         :return:
         """
+        return os.path.join(BoardingCardsGenerator._get_boarding_card_folder(),
+                            BoardingCardsGenerator.get_boarding_card_file_name(flight_number,
+                                                                               seat_number,
+                                                                               departure_date,
+                                                                               card_format))
+
+    @staticmethod
+    def get_boarding_card_file_name(flight_number, seat_number, departure_date, card_format):
+        """
+        Construct the name of a boarding card file. This is also the name of the card's entry in an archive
+
+        :param flight_number: Flight number
+        :param seat_number: Seat number
+        :param departure_date: Departure date and time
+        :param card_format: Boarding card format, used as the file extension
+        :return: The boarding card file name
+        """
         # Boarding card file names are flight-number_seat-number_date.csv, with non-alphanumeric characters
         # replaced with underscores
         file_name = "_".join([flight_number, seat_number, departure_date.strftime("%Y%m%d")])
         file_name = re.sub("\\W", "_", file_name).lower()
+        return file_name + "." + card_format
+
+    @staticmethod
+    def get_manifest_path(flight_number, departure_date, card_format, output="files"):
+        """
+        Construct the path to the manifest of card hashes for a flight, card format and output mode. Each output mode
+        has its own manifest, as the hashes in one don't describe the cards written using the other
+
+        :param flight_number: Flight number
+        :param departure_date: Departure date and time
+        :param card_format: Boarding card format
+        :param output: Output mode, one of OUTPUT_MODES
+        :return: The manifest path
+        """
         return os.path.join(BoardingCardsGenerator._get_boarding_card_folder(),
-                            file_name.lower() + "." + card_format)
+                            BoardingCardsGenerator._get_flight_file_name(flight_number, departure_date, card_format) +
+                            f".{output}.manifest.json")
+
+    @staticmethod
+    def get_archive_path(flight_number, departure_date, card_format):
+        """
+        Construct the path to the archive containing all the boarding cards for a flight in a given format
+
+        :param flight_number: Flight number
+        :param departure_date: Departure date and time
+        :param card_format: Boarding card format
+        :return: The archive path
+        """
+        return os.path.join(BoardingCardsGenerator._get_boarding_card_folder(),
+                            BoardingCardsGenerator.get_archive_file_name(flight_number, departure_date, card_format))
+
+    @staticmethod
+    def _get_flight_file_name(flight_number, departure_date, card_format):
+        """
+        Construct the base name for files that relate to all the boarding cards for a flight in a given format
+
+        :param flight_number: Flight number
+        :param departure_date: Departure date and time
+        :param card_format: Boarding card format
+        :return: The file name, without an extension
+        """
+        file_name = "_".join([flight_number, departure_date.strftime("%Y%m%d"), card_format])
+        return re.sub("\\W", "_", file_name).lower()
+
+    @staticmethod
+    def get_archive_file_name(flight_number, departure_date, card_format):
+        """
+        Construct the name of the archive containing all the boarding cards for a flight in a given format
+
+        :param flight_number: Flight number
+        :param departure_date: Departure date and time
+        :param card_format: Boarding card format
+        :return: The archive file name
+        """
+        return BoardingCardsGenerator._get_flight_file_name(flight_number, departure_date, card_format) + ".zip"
 
     @staticmethod
     def _get_boarding_card_folder():
@@ -169,3 +606,31 @@ class BoardingCardsGenerator(threading.Thread):
             os.makedirs(card_folder)
 
         return card_folder
+
+
+class _ArchiveStream(io.RawIOBase):
+    """
+    Unseekable, write-only stream that buffers the data written to it until it's read back as a chunk. Used as the
+    target for a zip archive that's streamed rather than written to a file
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer.extend(data)
+        return len(data)
+
+    def read_chunk(self):
+        """
+        Return the data written since the last chunk was read and clear the buffer
+
+        :return: The buffered data
+        """
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
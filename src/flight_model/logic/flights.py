@@ -4,9 +4,10 @@ Flight business logic
 
 import datetime
 
-import pytz
 import sqlalchemy as db
-from ..model import Session, Airline, Airport, Flight
+from sqlalchemy.orm import raiseload, selectinload, with_expression
+from .pagination import paginate
+from ..model import Session, Airline, Airport, Flight, FlightPassenger, Passenger, Seat, reference_cache, local_to_utc
 
 
 def _construct_date_and_time(date_string, time_string):
@@ -62,9 +63,7 @@ def create_flight(airline_name, embarkation_code, destination_code, number, depa
         # Construct the departure date and time as a naive datetime then localize them with the
         # departure timezone (which is what it's assumed they're expressed in) and convert to UTC
         departure_date_and_time_naive = _construct_date_and_time(departure_date, departure_time)
-        departure_date_and_time = pytz.timezone(embarkation.timezone)\
-            .localize(departure_date_and_time_naive)\
-            .astimezone(pytz.UTC)
+        departure_date_and_time = local_to_utc(departure_date_and_time_naive, embarkation.timezone)
 
         flight = Flight(airline=airline,
                         embarkation_airport=embarkation,
@@ -74,39 +73,128 @@ def create_flight(airline_name, embarkation_code, destination_code, number, depa
                         duration=flight_duration)
         session.add(flight)
 
+    reference_cache.invalidate(Flight.__tablename__)
     return flight
 
 
-def list_flights(airline_id=None):
+def flight_loader_options(seats=False, passengers=False, allocations=False):
+    """
+    Return the loader options for a Flight query that loads only the collections the caller will use. Each requested
+    collection is loaded using a separate SELECT ... IN query, to avoid the cartesian product of seats and passengers
+    that joined eager loading would produce. Collections that aren't requested raise an error if accessed
+
+    :param seats: True to load the seats for the flight
+    :param passengers: True to load the passengers on the flight
+    :param allocations: True to load the seat allocations for each passenger, if passengers are loaded
+    :return: A list of loader options to apply to a Flight query
+    """
+    seat_option = selectinload(Flight.seats) if seats else raiseload(Flight.seats)
+
+    if passengers:
+        passenger_option = selectinload(Flight.passengers)
+        passenger_option = passenger_option.selectinload(Passenger.seats) if allocations \
+            else passenger_option.raiseload(Passenger.seats)
+    else:
+        passenger_option = raiseload(Flight.passengers)
+
+    return [seat_option, passenger_option]
+
+
+def summary_options():
+    """
+    Return the loader options used to populate the capacity and passenger counts for a flight using correlated
+    aggregate subqueries, rather than by loading the seats and passengers
+
+    :return: A list of loader options to apply to a Flight query
+    """
+    capacity = db.select(db.func.count(Seat.id)) \
+        .where(Seat.flight_id == Flight.id) \
+        .scalar_subquery()
+
+    passenger_count = db.select(db.func.count(FlightPassenger.passenger_id)) \
+        .where(FlightPassenger.flight_id == Flight.id) \
+        .scalar_subquery()
+
+    return [
+        with_expression(Flight.summary_capacity, capacity),
+        with_expression(Flight.summary_passenger_count, passenger_count)
+    ]
+
+
+def _list_flights_query(session, airline_id, summary):
+    """
+    Construct the query used to list flights
+
+    :param session: Session in which to create the query
+    :param airline_id: ID for the airline for which to list flights or None for all airlines
+    :param summary: True to load the flights in summary mode
+    :return: An unordered query returning Flight instances
+    """
+    query = session.query(Flight)
+    if summary:
+        query = query.options(*summary_options(), *flight_loader_options())
+
+    if airline_id:
+        query = query.filter(Flight.airline_id == airline_id)
+
+    return query
+
+
+def list_flights(airline_id=None, summary=False):
     """
     List all flights or, optionally, all  flights for the specified airline
 
+    In summary mode, the seats and passengers are not loaded. Instead, the capacity and passenger counts are
+    calculated in the database and accessing the seats or passengers collections raises an error
+
     :param airline_id: ID for the airline for which to list flights or None for all airlines
+    :param summary: True to load the flights in summary mode
     :return: A list of instances of the Flight object with relevant associated attributes eager-loaded
     """
     with Session.begin() as session:
-        if airline_id:
-            flights = session.query(Flight) \
-                .filter(Flight.airline_id == airline_id) \
-                .order_by(db.asc(Flight.departure_date)) \
-                .all()
-        else:
-            flights = session.query(Flight) \
-                .order_by(db.asc(Flight.departure_date)) \
-                .all()
+        flights = _list_flights_query(session, airline_id, summary) \
+            .order_by(db.asc(Flight.departure_date)) \
+            .all()
 
     return flights
 
 
-def get_flight(flight_id):
+def list_flights_page(page_size, after=None, before=None, airline_id=None, summary=False):
     """
-    Return a single flight given its ID
+    Return one page of flights, ordered by departure date, using keyset pagination
+
+    :param page_size: Maximum number of flights on the page
+    :param after: ID of the flight after which the page starts or None
+    :param before: ID of the flight before which the page ends or None
+    :param airline_id: ID for the airline for which to list flights or None for all airlines
+    :param summary: True to load the flights in summary mode
+    :return: A Page instance containing Flight instances
+    """
+    with Session.begin() as session:
+        query = _list_flights_query(session, airline_id, summary)
+        page = paginate(query, [Flight.departure_date, Flight.id], page_size, after, before)
+
+    return page
+
+
+def get_flight(flight_id, seats=True, passengers=True, allocations=True, summary=False):
+    """
+    Return a single flight given its ID. By default, the seats, passengers and passenger seat allocations are all
+    loaded but callers should request only the collections they use
 
     :param flight_id: ID of the flight to return
+    :param seats: True to load the seats for the flight
+    :param passengers: True to load the passengers on the flight
+    :param allocations: True to load the seat allocations for each passenger, if passengers are loaded
+    :param summary: True to calculate the capacity and passenger counts in the database
     :return: Flight object for the record with the specified ID
     """
     with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+        query = session.query(Flight).options(*flight_loader_options(seats, passengers, allocations))
+        if summary:
+            query = query.options(*summary_options())
+
+        flight = query.get(flight_id)
 
     return flight
 
@@ -121,6 +209,8 @@ def delete_flight(flight_id):
         flight = session.query(Flight).get(flight_id)
         session.delete(flight)
 
+    reference_cache.invalidate(Flight.__tablename__, Seat.__tablename__, FlightPassenger.__tablename__)
+
 
 def add_passenger(flight_id, passenger):
     """
@@ -130,5 +220,9 @@ def add_passenger(flight_id, passenger):
     :param passenger: Passenger instance to add
     """
     with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+        flight = session.query(Flight) \
+            .options(*flight_loader_options(passengers=True)) \
+            .get(flight_id)
         flight.passengers.append(passenger)
+
+    reference_cache.invalidate(Passenger.__tablename__, FlightPassenger.__tablename__)
@@ -0,0 +1,117 @@
+"""
+Keyset (cursor-based) pagination of query results. Rather than skipping a number of rows, which gets slower the
+further through a table the page is, each page is found by comparing the sort key with the sort key of the row at
+the edge of the current page. This lets the database seek directly to the start of the page using an index, so
+page latency doesn't depend on the size of the table or how far through it the page is.
+
+Cursors are the IDs of the rows at either end of a page:
+
++-----------------+------------------------------------------------------------------------------------------+
+| next_cursor     | ID of the last row on the page, to be passed as "after" to get the next page             |
++-----------------+------------------------------------------------------------------------------------------+
+| previous_cursor | ID of the first row on the page, to be passed as "before" to get the previous page       |
++-----------------+------------------------------------------------------------------------------------------+
+
+Each is None if there is no page in that direction.
+"""
+
+import sqlalchemy as db
+
+
+class Page:
+    """
+    A page of results from a keyset-paginated query
+    """
+
+    def __init__(self, items, previous_cursor, next_cursor):
+        self._items = items
+        self._previous_cursor = previous_cursor
+        self._next_cursor = next_cursor
+
+    @property
+    def items(self):
+        return self._items
+
+    @property
+    def previous_cursor(self):
+        return self._previous_cursor
+
+    @property
+    def next_cursor(self):
+        return self._next_cursor
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" \
+               f"items={len(self._items)}, " \
+               f"previous_cursor={self._previous_cursor!r}, " \
+               f"next_cursor={self._next_cursor!r})"
+
+
+def _first_page(query, sort_columns, page_size):
+    """
+    Return the first page of results for a query
+
+    :param query: Query to paginate
+    :param sort_columns: Columns defining the sort order
+    :param page_size: Maximum number of items on the page
+    :return: A Page instance
+    """
+    rows = query.order_by(*[db.asc(column) for column in sort_columns]).limit(page_size + 1).all()
+    items = rows[:page_size]
+    next_cursor = items[-1].id if len(rows) > page_size else None
+    return Page(items, None, next_cursor)
+
+
+def paginate(query, sort_columns, page_size, after=None, before=None):
+    """
+    Return one page of results for a query, ordered by the specified sort columns. The last sort column must be
+    the primary key of the entity being queried, so the sort order is unique. If the cursor row no longer exists
+    or the requested page would be empty, the first page is returned
+
+    :param query: Query to paginate
+    :param sort_columns: Columns defining the sort order, ending with the ID column
+    :param page_size: Maximum number of items on the page
+    :param after: ID of the row after which the page starts or None
+    :param before: ID of the row before which the page ends or None
+    :return: A Page instance
+    :raises ValueError: If the page size is invalid
+    """
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+
+    cursor = after if after is not None else before
+    if cursor is None:
+        return _first_page(query, sort_columns, page_size)
+
+    # Look up the sort key for the row at the cursor
+    boundary = query.session.query(*sort_columns).filter(sort_columns[-1] == cursor).one_or_none()
+    if boundary is None:
+        return _first_page(query, sort_columns, page_size)
+
+    sort_key = db.tuple_(*sort_columns)
+    boundary_key = db.tuple_(*[db.literal(value, column.type) for value, column in zip(boundary, sort_columns)])
+
+    if after is not None:
+        rows = query.filter(sort_key > boundary_key) \
+            .order_by(*[db.asc(column) for column in sort_columns]) \
+            .limit(page_size + 1) \
+            .all()
+        items = rows[:page_size]
+        has_more = len(rows) > page_size
+        previous_cursor = items[0].id if items else None
+        next_cursor = items[-1].id if items and has_more else None
+    else:
+        # Read backwards from the cursor then reverse the results to restore the sort order
+        rows = query.filter(sort_key < boundary_key) \
+            .order_by(*[db.desc(column) for column in sort_columns]) \
+            .limit(page_size + 1) \
+            .all()
+        items = list(reversed(rows[:page_size]))
+        has_more = len(rows) > page_size
+        previous_cursor = items[0].id if items and has_more else None
+        next_cursor = items[-1].id if items else None
+
+    if not items:
+        return _first_page(query, sort_columns, page_size)
+
+    return Page(items, previous_cursor, next_cursor)
@@ -3,7 +3,8 @@ Passenger management business logic
 """
 
 from sqlalchemy.exc import IntegrityError
-from ..model import Session, Passenger, Flight, Seat
+from .flights import flight_loader_options
+from ..model import Session, Passenger, FlightPassenger, Flight, Seat, reference_cache
 
 
 def create_passenger(name, gender, dob, nationality, residency, passport_number):
@@ -29,6 +30,7 @@ def create_passenger(name, gender, dob, nationality, residency, passport_number)
     except IntegrityError as e:
         raise ValueError("A passenger with the specified passport number already exists") from e
 
+    reference_cache.invalidate(Passenger.__tablename__)
     return passenger
 
 
@@ -42,7 +44,9 @@ def delete_passenger(flight_id, passenger_id):
     :param passenger_id: ID of the passenger to delete
     """
     with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+        flight = session.query(Flight) \
+            .options(*flight_loader_options(passengers=True)) \
+            .get(flight_id)
         passenger = session.query(Passenger).get(passenger_id)
         flight.passengers.remove(passenger)
 
@@ -52,3 +56,5 @@ def delete_passenger(flight_id, passenger_id):
             seat.passenger_id = None
 
         session.delete(passenger)
+
+    reference_cache.invalidate(Passenger.__tablename__, FlightPassenger.__tablename__, Seat.__tablename__)
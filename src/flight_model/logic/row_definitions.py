@@ -3,7 +3,18 @@ Row definition business logic
 """
 
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from ..model import Session, AircraftLayout, RowDefinition
+from ..model import Session, AircraftLayout, RowDefinition, reference_cache
+
+
+def _validate_seat_letters(seat_letters):
+    """
+    Confirm that each seat letter appears only once in a row, so every seat on a flight has a unique seat number
+
+    :param seat_letters: String of seat letters for the row e.g. ABCDEF
+    :raises ValueError: If a seat letter is repeated
+    """
+    if seat_letters and seat_letters.strip() and len(set(seat_letters)) != len(seat_letters):
+        raise ValueError("Seat letters for a row cannot be repeated")
 
 
 def add_row_to_layout(aircraft_layout_id, row_number, seating_class, seat_letters):
@@ -14,13 +25,16 @@ def add_row_to_layout(aircraft_layout_id, row_number, seating_class, seat_letter
     :param row_number: Row number
     :param seating_class: Seating class for the row
     :param seat_letters: String of seat letters for the row e.g. ABCDEF
+    :raises ValueError: If a seat letter is repeated
     """
+    _validate_seat_letters(seat_letters)
     with Session.begin() as session:
         row_definition = RowDefinition(aircraft_layout_id=aircraft_layout_id,
                                        number=row_number,
                                        seating_class=seating_class,
                                        seats=seat_letters)
         session.add(row_definition)
+    reference_cache.invalidate(RowDefinition.__tablename__)
 
     return row_definition
 
@@ -40,6 +54,7 @@ def delete_row_from_layout(layout_id, row_number):
                         RowDefinition.number == row_number)\
                 .one()
             session.delete(row_definition)
+        reference_cache.invalidate(RowDefinition.__tablename__)
     except NoResultFound as e:
         raise ValueError("Aircraft layout or row number not found") from e
 
@@ -54,6 +69,7 @@ def update_row_definition(layout_id, row_number, seating_class, seat_letters):
     :param seat_letters: New seat letters
     :raises ValueError: If the new details are invalid or the row definition doesn't exist
     """
+    _validate_seat_letters(seat_letters)
     try:
         with Session.begin() as session:
             layout = session.query(AircraftLayout).get(layout_id)
@@ -66,5 +82,6 @@ def update_row_definition(layout_id, row_number, seating_class, seat_letters):
 
             row_definitions[0].seating_class = seating_class
             row_definitions[0].seats = seat_letters
+        reference_cache.invalidate(RowDefinition.__tablename__)
     except IntegrityError as e:
         raise ValueError("Seat letters and the seating class cannot be empty") from e
@@ -2,117 +2,144 @@
 Seat allocation business logic
 """
 
-from ..model import Session, Flight
+import sqlalchemy as db
+from ..model import Session, FlightPassenger, Seat, reference_cache
 
 
-def allocate_seat(flight_id, passenger_id, seat_number):
+def _get_allocation_error(passenger_id, is_on_flight, seat_exists, seat_passenger_id):
     """
-    Allocate a seat to a passenger
+    Check whether a seat can be allocated to a passenger
 
-    :param flight_id: ID of the flight
     :param passenger_id: ID of the passenger
-    :param seat_number: Seat number to allocate e.g. 28A
+    :param is_on_flight: True if the passenger is on the flight
+    :param seat_exists: True if the seat exists on the flight
+    :param seat_passenger_id: ID of the passenger the seat is currently allocated to or None
+    :return: A message describing why the seat can't be allocated or None if it can
     """
-    with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+    if not is_on_flight:
+        return "The passenger doesn't belong to the specified flight"
 
-        if not flight.seats:
-            raise ValueError("The flight does not have an aircraft layout")
+    if not seat_exists:
+        return "The specified seat does not exist on the flight"
 
-        passenger_ids = [passenger.id for passenger in flight.passengers]
-        if passenger_id not in passenger_ids:
-            raise ValueError("The passenger doesn't belong to the specified flight")
-
-        required_seat = [seat for seat in flight.seats if seat.seat_number == seat_number]
-        if not required_seat:
-            raise ValueError("The specified seat does not exist on the flight")
-
-        if required_seat[0].passenger_id == passenger_id:
-            raise ValueError("The seat is already allocated to the passenger")
-
-        if required_seat[0].passenger_id is not None:
-            raise ValueError("The seat is already allocated to another passenger")
-
-        current_seat = [seat for seat in flight.seats if seat.passenger_id == passenger_id]
-        if current_seat:
-            current_seat[0].passenger_id = None
-
-        required_seat[0].passenger_id = passenger_id
-
-
-def get_current_seat_allocations(flight_id):
-    """
-    Return the current seat allocations for a flight
-
-    :param flight_id: ID of the flight for which to get allocations
-    :return: A list of (seat number, passenger ID) tuples for current passenger seat allocations
-    """
-    with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+    if seat_passenger_id == passenger_id:
+        return "The seat is already allocated to the passenger"
 
-        if flight.seats:
-            current_allocations = [(seat.seat_number, seat.passenger_id)
-                                   for seat in flight.seats
-                                   if seat.passenger_id is not None]
-        else:
-            current_allocations = []
+    if seat_passenger_id is not None:
+        return "The seat is already allocated to another passenger"
 
-    return current_allocations
+    return None
 
 
-def remove_seats(flight_id):
+def allocate_seat(flight_id, passenger_id, seat_number):
     """
-    Remove the current seats from the specified flight
+    Allocate a seat to a passenger. The seat and the passenger's membership of the flight are found using indexed
+    lookups and the seat is claimed using a conditional UPDATE, so the cost doesn't depend on the size of the flight
 
-    :param flight_id: ID of the flight for which to remove seats
+    :param flight_id: ID of the flight
+    :param passenger_id: ID of the passenger
+    :param seat_number: Seat number to allocate e.g. 28A
+    :raises ValueError: If the seat can't be allocated to the passenger
     """
     with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
+        required_seat = session.query(Seat.id, Seat.passenger_id) \
+            .filter(Seat.flight_id == flight_id, Seat.seat_number == seat_number) \
+            .one_or_none()
+
+        if required_seat is None:
+            has_seats = session.query(Seat.id).filter(Seat.flight_id == flight_id).first()
+            if not has_seats:
+                raise ValueError("The flight does not have an aircraft layout")
+
+        is_on_flight = session.query(FlightPassenger) \
+            .filter(FlightPassenger.flight_id == flight_id,
+                    FlightPassenger.passenger_id == passenger_id) \
+            .first()
+        error = _get_allocation_error(passenger_id,
+                                      is_on_flight is not None,
+                                      required_seat is not None,
+                                      required_seat.passenger_id if required_seat else None)
+        if error:
+            raise ValueError(error)
+
+        # Release the passenger's current seat, if they have one
+        session.execute(db.update(Seat)
+                        .where(Seat.flight_id == flight_id, Seat.passenger_id == passenger_id)
+                        .values(passenger_id=None)
+                        .execution_options(synchronize_session=False))
+
+        # Claim the required seat only if it's still free, in case it's been allocated since it was read
+        result = session.execute(db.update(Seat)
+                                 .where(Seat.id == required_seat.id, Seat.passenger_id.is_(None))
+                                 .values(passenger_id=passenger_id)
+                                 .execution_options(synchronize_session=False))
+        if result.rowcount != 1:
+            raise ValueError("The seat is already allocated to another passenger")
 
-        if flight.seats:
-            for seat in flight.seats:
-                session.delete(seat)
+    reference_cache.invalidate(Seat.__tablename__)
 
 
-def copy_seat_allocations(flight_id, allocations):
+def allocate_seats(flight_id, allocations):
     """
-    Re-apply a set of seat allocations
+    Allocate seats to a group of passengers in a single transaction. The allocations are validated and applied in
+    order against an in-memory map of the seats on the flight, so a seat vacated by one passenger in the batch is
+    available to those that follow. Allocations that can't be made are reported rather than failing the batch
 
-    :param flight_id: ID for the flight to apply the allocations  to
-    :param allocations: A list of (seat number, passenger ID) tuples for the seat allocations to apply
-    :return: A list of passenger IDs for passengers whose seat allocations couldn't be preserved
+    :param flight_id: ID of the flight
+    :param allocations: Iterable of (passenger ID, seat number) tuples
+    :return: A list of (passenger ID, seat number, reason) tuples for the allocations that couldn't be made
+    :raises ValueError: If the flight has no aircraft layout
     """
     with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
-
-        # Generate a dictionary of the new seats to make it easier to find and allocate a seat by
-        # seat number. A seat number from an original layout isn't guaranteed to be available in the
-        # new layout so capture passengers that can't be put in the same seat number
-        not_allocated = []
-        new_seats = {seat.seat_number: seat for seat in flight.seats}
-        for seat_number, passenger_id in allocations:
-            if seat_number in new_seats:
-                new_seats[seat_number].passenger_id = passenger_id
-            else:
-                not_allocated.append(passenger_id)
-
-    return not_allocated
-
-
-def allocate_available_seats(flight_id, passenger_ids):
-    """
-    Allocate available seats to a set of passengers
-
-    :param flight_id: ID for the flight
-    :param passenger_ids: IDs for the passengers requiring seat allocations
-    """
-
-    # Local map transformation function to allocate a seat to a passenger
-    def _allocate_seat(unallocated_passenger_id, seat):
-        seat.passenger_id = unallocated_passenger_id
+        seats = session.query(Seat.id, Seat.seat_number, Seat.passenger_id) \
+            .filter(Seat.flight_id == flight_id) \
+            .all()
+        if not seats:
+            raise ValueError("The flight does not have an aircraft layout")
 
-    with Session.begin() as session:
-        flight = session.query(Flight).get(flight_id)
-        available_seats = [seat for seat in sorted(flight.seats, key=lambda s: s.id) if seat.passenger_id is None]
-        for _ in map(_allocate_seat, passenger_ids, available_seats):
-            pass
+        passenger_ids = {passenger_id for passenger_id, in session.query(FlightPassenger.passenger_id)
+                         .filter(FlightPassenger.flight_id == flight_id)}
+
+        # Build the seat map and an index of the seat currently allocated to each passenger
+        seat_ids = {seat.seat_number: seat.id for seat in seats}
+        seat_map = {seat.seat_number: seat.passenger_id for seat in seats}
+        original_seat_map = dict(seat_map)
+        current_seats = {seat.passenger_id: seat.seat_number for seat in seats if seat.passenger_id is not None}
+
+        conflicts = []
+        changed = set()
+        for passenger_id, seat_number in allocations:
+            error = _get_allocation_error(passenger_id,
+                                          passenger_id in passenger_ids,
+                                          seat_number in seat_map,
+                                          seat_map.get(seat_number))
+            if error:
+                conflicts.append((passenger_id, seat_number, error))
+                continue
+
+            current_seat_number = current_seats.get(passenger_id)
+            if current_seat_number is not None:
+                seat_map[current_seat_number] = None
+                changed.add(current_seat_number)
+
+            seat_map[seat_number] = passenger_id
+            current_seats[passenger_id] = seat_number
+            changed.add(seat_number)
+
+        # Write the changed seats, each only if it's still allocated as it was when the seat map was read, so
+        # allocations made concurrently with this batch aren't overwritten
+        if changed:
+            seat_table = Seat.__table__
+            result = session.execute(seat_table.update()
+                                     .where(seat_table.c.id == db.bindparam("seat_id"),
+                                            seat_table.c.passenger_id.is_(db.bindparam("original_passenger_id")))
+                                     .values(passenger_id=db.bindparam("allocated_passenger_id")),
+                                     [{"seat_id": seat_ids[seat_number],
+                                       "original_passenger_id": original_seat_map[seat_number],
+                                       "allocated_passenger_id": seat_map[seat_number]}
+                                      for seat_number in changed])
+            if result.rowcount != len(changed):
+                raise ValueError("Seat allocations were changed by another user, please try again")
+
+    reference_cache.invalidate(Seat.__tablename__)
+    return conflicts
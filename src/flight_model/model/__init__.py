@@ -1,22 +1,43 @@
-from .database import create_database, Engine, Session
+from .database import create_database, upgrade_database, get_engine, Session
 from .airport import Airport
 from .airline import Airline
 from .flight import Flight
-from .passenger import Passenger
+from .passenger import Passenger, FlightPassenger
 from .seat import Seat
 from .aircraft_layout import AircraftLayout, RowDefinition
 from .utils import get_data_path
+from .reference_cache import ReferenceDataCache, reference_cache
+from .timezones import get_timezone, get_timezone_backend, set_timezone_backend, utc_to_local, local_to_utc, \
+    list_timezone_names
 
 __all__ = [
     "Engine",
     "Session",
+    "get_engine",
     "create_database",
+    "upgrade_database",
     "get_data_path",
+    "ReferenceDataCache",
+    "reference_cache",
+    "get_timezone",
+    "get_timezone_backend",
+    "set_timezone_backend",
+    "utc_to_local",
+    "local_to_utc",
+    "list_timezone_names",
     "Airport",
     "Airline",
     "Flight",
     "Passenger",
+    "FlightPassenger",
     "Seat",
     "AircraftLayout",
     "RowDefinition"
 ]
+
+
+def __getattr__(name):
+    # The engine is created on first access, rather than when the package is imported
+    if name == "Engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -36,6 +36,15 @@ class AircraftLayout(Base):
     def capacity(self):
         return sum([len(row.seats) for row in self.row_definitions])
 
+    @property
+    def seat_numbers(self):
+        """
+        Expand the row definitions to generate the seat numbers for the layout e.g. 1A, 1B, ...
+
+        :return: A list of seat numbers in row definition then seat letter order
+        """
+        return [f"{row.number}{seat_letter}" for row in self.row_definitions for seat_letter in row.seats]
+
     def __repr__(self):
         return f"{type(self).__name__}(" \
                f"id={self.id}, " \
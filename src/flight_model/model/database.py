@@ -1,6 +1,37 @@
 """
-Declare methods and module-level variables for creating a SQLite database and establishing a session. The following
-module-level variables are defined:
+Declare methods and module-level variables for creating a SQLite database and establishing a session.
+
+The PRAGMA statements issued on each new connection are controlled by a named performance profile, selected using
+the FLIGHT_BOOKING_DB_PROFILE environment variable. The available profiles are:
+
++-------------+----------------------------------------------------------------------------------------------+
+| **Profile** | **Settings**                                                                                 |
++-------------+----------------------------------------------------------------------------------------------+
+| default     | SQLite defaults (rollback journal, synchronous=FULL). This is used if no profile is set      |
++-------------+----------------------------------------------------------------------------------------------+
+| performance | journal_mode=WAL, synchronous=NORMAL, a 64MB page cache, a 256MB memory map, in-memory       |
+|             | temporary storage and a 5 second busy timeout                                                |
++-------------+----------------------------------------------------------------------------------------------+
+
+Individual settings can then be overridden using the following environment variables:
+
++--------------------------------+------------------------------------------------------------------------+
+| **Variable**                   | **Setting**                                                            |
++--------------------------------+------------------------------------------------------------------------+
+| FLIGHT_BOOKING_DB_JOURNAL_MODE | DELETE, TRUNCATE, PERSIST, MEMORY, WAL or OFF                          |
++--------------------------------+------------------------------------------------------------------------+
+| FLIGHT_BOOKING_DB_SYNCHRONOUS  | OFF, NORMAL, FULL or EXTRA                                             |
++--------------------------------+------------------------------------------------------------------------+
+| FLIGHT_BOOKING_DB_CACHE_SIZE   | Page cache size in pages or, if negative, in KiB                       |
++--------------------------------+------------------------------------------------------------------------+
+| FLIGHT_BOOKING_DB_MMAP_SIZE    | Maximum number of bytes of the database file to memory-map             |
++--------------------------------+------------------------------------------------------------------------+
+| FLIGHT_BOOKING_DB_TEMP_STORE   | DEFAULT, FILE or MEMORY                                                |
++--------------------------------+------------------------------------------------------------------------+
+| FLIGHT_BOOKING_DB_BUSY_TIMEOUT | Time to wait for a lock, in milliseconds, before failing               |
++--------------------------------+------------------------------------------------------------------------+
+
+The following module-level variables are defined:
 
 +----------+-----------------------------------------------------------------------------+
 | **Name** | **Comments**                                                                |
@@ -9,13 +40,18 @@ module-level variables are defined:
 +----------+-----------------------------------------------------------------------------+
 | Session  | Definition of the Session class returned by the sessionmaker for the Engine |
 +----------+-----------------------------------------------------------------------------+
+
+The engine isn't created, and the profile settings aren't read, until the Engine is first accessed or a session is
+first created. This keeps importing the model cheap and means the environment variables can be set after import.
 """
 
 import os
+import threading
 import sqlalchemy as db
 from sqlalchemy.orm import sessionmaker
 from .utils import get_data_path
 from .base import Base
+from .reference_cache import reference_cache
 
 
 def _get_db_path():
@@ -32,15 +68,79 @@ def _get_db_path():
     return db_path
 
 
+#: Named SQLite performance profiles, mapping PRAGMA names to values. The busy timeout is listed first so it
+#: applies to the other statements, some of which need a lock on the database
+SQLITE_PROFILES = {
+    "default": {},
+    "performance": {
+        "busy_timeout": "5000",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-65536",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY"
+    }
+}
+
+#: Valid values for each of the PRAGMA statements that can be set via the environment. None indicates an integer
+_PRAGMA_VALUES = {
+    "busy_timeout": None,
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "cache_size": None,
+    "mmap_size": None,
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"}
+}
+
+
+def get_sqlite_pragmas():
+    """
+    Return the PRAGMA settings to apply to each new connection. These are the settings for the profile named in the
+    FLIGHT_BOOKING_DB_PROFILE environment variable, overridden by any of the FLIGHT_BOOKING_DB_<PRAGMA> variables
+
+    :return: A dictionary of PRAGMA names and values
+    :raises ValueError: If the profile doesn't exist or a setting has an invalid value
+    """
+    profile_name = os.environ.get("FLIGHT_BOOKING_DB_PROFILE") or "default"
+    try:
+        pragmas = dict(SQLITE_PROFILES[profile_name.lower()])
+    except KeyError as e:
+        raise ValueError(f"Unknown SQLite performance profile {profile_name}") from e
+
+    for pragma, valid_values in _PRAGMA_VALUES.items():
+        value = os.environ.get(f"FLIGHT_BOOKING_DB_{pragma.upper()}")
+        if not value:
+            continue
+
+        value = value.strip().upper()
+        if valid_values is None:
+            try:
+                value = str(int(value))
+            except ValueError as e:
+                raise ValueError(f"SQLite {pragma} must be an integer") from e
+        elif value not in valid_values:
+            raise ValueError(f"Invalid SQLite {pragma} {value}")
+
+        pragmas[pragma] = value
+
+    # Retain the order in which the settings are listed so the busy timeout is applied first
+    return {pragma: pragmas[pragma] for pragma in _PRAGMA_VALUES if pragma in pragmas}
+
+
 def _delete_db():
     """
-    Remove the database file at the default path
+    Remove the database file at the default path, with its write-ahead log and shared memory files. Connections held
+    by the engine are closed first, so SQLite can't apply a leftover log to the new database
     """
+    if _engine is not None:
+        _engine.dispose()
+
     db_path = _get_db_path()
-    try:
-        os.unlink(db_path)
-    except FileNotFoundError:
-        pass
+    for file_path in [db_path, db_path + "-wal", db_path + "-shm"]:
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
 
 
 def _create_engine():
@@ -59,20 +159,123 @@ def create_database():
     _delete_db()
     engine = _create_engine()
     Base.metadata.create_all(engine)
+    engine.dispose()
+    reference_cache.clear()
+
+
+def _find_duplicate_keys(connection, index, limit=10):
+    """
+    Find values of the columns covered by a unique index that appear in more than one row of its table, so the index
+    can't be created
+
+    :param connection: Connection to the database
+    :param index: Unique index to check
+    :param limit: Maximum number of duplicated values to return
+    :return: A list of (tuple of column values, number of rows) tuples
+    """
+    columns = list(index.columns)
+    query = db.select(*columns, db.func.count().label("row_count")) \
+        .group_by(*columns) \
+        .having(db.func.count() > 1) \
+        .order_by(*columns) \
+        .limit(limit)
+    return [(tuple(row[:-1]), row[-1]) for row in connection.execute(query)]
+
+
+def upgrade_database():
+    """
+    Upgrade an existing Flight Booking SQLite database in place, without deleting its content. Tables that don't
+    exist are created and indexes declared on the model that are missing from existing tables are added. Unique
+    indexes are checked against the existing data before any index is created, so the upgrade either creates all the
+    missing indexes or none of them
+
+    :return: A list of the names of the indexes that were created
+    :raises ValueError: If existing rows contain duplicate values for the columns of a missing unique index
+    """
+    engine = _create_engine()
+    Base.metadata.create_all(engine)
+
+    inspector = db.inspect(engine)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in sorted(table.indexes, key=lambda ix: ix.name) if index.name not in existing)
+
+    with engine.begin() as connection:
+        for index in missing:
+            duplicates = _find_duplicate_keys(connection, index) if index.unique else []
+            if duplicates:
+                column_names = ", ".join(column.name for column in index.columns)
+                details = "; ".join(f"({', '.join(str(value) for value in values)}) x {row_count}"
+                                    for values, row_count in duplicates)
+                raise ValueError(f"Unable to create unique index {index.name}: {index.table.name} has more than one "
+                                 f"row with the same {column_names}: {details}. Remove the duplicate rows and "
+                                 f"upgrade again")
+
+        for index in missing:
+            index.create(connection)
+
+    engine.dispose()
+    return [index.name for index in missing]
+
+
+#: PRAGMA settings applied to each new connection, read when the engine is created
+_sqlite_pragmas = {}
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Return the SQLAlchemy engine for the Flight Booking database, creating it on first use
+
+    :return: Instance of the SQLAlchemy Engine class
+    :raises ValueError: If the SQLite settings in the environment are invalid
+    """
+    global _engine, _sqlite_pragmas
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _sqlite_pragmas = get_sqlite_pragmas()
+                engine = _create_engine()
+                db.event.listen(engine, "connect", set_sqlite_pragma)
+                _engine = engine
+
+    return _engine
+
+
+class _LazySessionMaker(sessionmaker):
+    """
+    Session factory that binds to the engine when the first session is created, rather than when it's defined
+    """
 
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
 
-#: Instance of the SQLAlchemy database engine
-Engine = _create_engine()
 
 #: Session class for the engine, used  to create session instances
-Session = sessionmaker(Engine, expire_on_commit=False)
+Session = _LazySessionMaker(expire_on_commit=False)
+
+
+def __getattr__(name):
+    """
+    Create the engine when the Engine module-level variable is first accessed
+
+    :param name: Attribute name
+    :return: The attribute value
+    """
+    if name == "Engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-@db.event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, _):
     """
-    Intercept connection events for the database engine and ensure foreign keys are enabled. From the SQLAlchemy
-    SQLite documentation:
+    Intercept connection events for the database engine, ensure foreign keys are enabled and apply the settings
+    for the selected performance profile. From the SQLAlchemy SQLite documentation:
 
     "SQLite supports FOREIGN KEY syntax when emitting CREATE statements for tables, however by default these
     constraints have no effect on the operation of the table" and, aside from pre-requisites concerning the SQLite
@@ -84,4 +287,7 @@ def set_sqlite_pragma(dbapi_connection, _):
     """
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    for pragma, value in _sqlite_pragmas.items():
+        # Values are validated against a fixed set of options or as integers, so can safely be formatted in
+        cursor.execute(f"PRAGMA {pragma}={value}")
     cursor.close()
@@ -1,7 +1,8 @@
-import pytz
-from sqlalchemy import Column, Integer, String, DateTime, Interval, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
+import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Interval, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, query_expression
 from .base import Base
+from .timezones import utc_to_local
 
 
 class Flight(Base):
@@ -9,7 +10,11 @@ class Flight(Base):
     Class representing a numbered flight for a named airline on a given date and at a given time
     """
     __tablename__ = "FLIGHTS"
-    __table_args__ = (UniqueConstraint('number', 'departure_date', name='NUMBER_DEPARTURE_UX'),)
+    __table_args__ = (
+        UniqueConstraint('number', 'departure_date', name='NUMBER_DEPARTURE_UX'),
+        Index("FLIGHT_DEPARTURE_DATE_IX", "departure_date"),
+        Index("FLIGHT_AIRLINE_IX", "airline_id")
+    )
 
     #: Primary key
     id = Column(Integer, primary_key=True)
@@ -37,9 +42,13 @@ class Flight(Base):
     #: Aircraft layout associated with this flight
     aircraft_layout = relationship("AircraftLayout")
     #: Collection of passengers on this flight
-    passengers = relationship("Passenger", secondary="FLIGHT_PASSENGERS", back_populates="flights", lazy="joined")
+    passengers = relationship("Passenger", secondary="FLIGHT_PASSENGERS", back_populates="flights", lazy="selectin")
     #: Collection of seats associated with this flight
-    seats = relationship("Seat", back_populates="flight", cascade="all, delete, delete-orphan", lazy="joined")
+    seats = relationship("Seat", back_populates="flight", cascade="all, delete, delete-orphan", lazy="selectin")
+    #: Seat count populated by aggregate queries, when the flight is loaded in summary mode, otherwise None
+    summary_capacity = query_expression()
+    #: Passenger count populated by aggregate queries, when the flight is loaded in summary mode, otherwise None
+    summary_passenger_count = query_expression()
 
     @property
     def departs_utc(self):
@@ -49,7 +58,7 @@ class Flight(Base):
 
         :return: The departure date and time as a UTC timezone-aware date and time
         """
-        return pytz.UTC.localize(self.departure_date)
+        return self.departure_date.replace(tzinfo=datetime.timezone.utc)
 
     @property
     def departs_localtime(self):
@@ -58,8 +67,7 @@ class Flight(Base):
 
         :return: The departure time converted to localtime for the point of embarkation
         """
-        embarkation_timezone = pytz.timezone(self.embarkation_airport.timezone)
-        return self.departs_utc.astimezone(embarkation_timezone)
+        return self._get_local_times()[1]
 
     @property
     def arrives_localtime(self):
@@ -68,9 +76,25 @@ class Flight(Base):
 
         :return: The arrival date and time converted to localtime for the destination
         """
-        arrives_utc = self.departs_utc + self.duration
-        destination_timezone = pytz.timezone(self.destination_airport.timezone)
-        return arrives_utc.astimezone(destination_timezone)
+        return self._get_local_times()[2]
+
+    def _get_local_times(self):
+        """
+        Return the local departure and arrival times, calculating them on first use and only recalculating them if
+        the departure date, duration or airports have changed since
+
+        :return: Tuple of the values the times were calculated from, the local departure time and the local arrival time
+        """
+        key = (self.departure_date,
+               self.duration,
+               self.embarkation_airport.timezone,
+               self.destination_airport.timezone)
+        local_times = self.__dict__.get("_local_times")
+        if local_times is None or local_times[0] != key:
+            departs = utc_to_local(self.departure_date, key[2])
+            arrives = utc_to_local(self.departure_date + self.duration, key[3])
+            local_times = self._local_times = (key, departs, arrives)
+        return local_times
 
     @property
     def formatted_duration(self):
@@ -90,6 +114,8 @@ class Flight(Base):
 
         :return: The total number of seats on the flight or 0 if no layout has been applied
         """
+        if self.summary_capacity is not None:
+            return self.summary_capacity
         return len(self.seats) if self.seats else 0
 
     @property
@@ -99,6 +125,8 @@ class Flight(Base):
 
         :return: The number of passengers or 0 if there are none
         """
+        if self.summary_passenger_count is not None:
+            return self.summary_passenger_count
         return len(self.passengers) if self.passengers else 0
 
     @property
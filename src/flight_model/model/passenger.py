@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -27,7 +27,7 @@ class Passenger(Base):
     #: Collection of flights for this passenger
     flights = relationship("Flight", secondary="FLIGHT_PASSENGERS", back_populates="passengers")
     #: Collection of seat allocations for this passenger
-    seats = relationship("Seat", back_populates="passenger", lazy="joined")
+    seats = relationship("Seat", back_populates="passenger", lazy="selectin")
 
     __tableargs__ = (
         CheckConstraint(gender.in_(["M", "F"])),
@@ -49,6 +49,8 @@ class FlightPassenger(Base):
     Many-to-many mapping between flights and passengers
     """
     __tablename__ = "FLIGHT_PASSENGERS"
+    # The primary key covers lookups by flight. This index covers lookups of the flights for a passenger
+    __table_args__ = (Index("FLIGHT_PASSENGER_PASSENGER_IX", "passenger_id"),)
 
     #: ID for the related flight
     flight_id = Column(Integer, ForeignKey("FLIGHTS.id"), primary_key=True)
@@ -0,0 +1,258 @@
+"""
+Declare a read-through, in-process cache for reference data lists, such as the lists of airlines, airports and aircraft
+layouts and the pages of those lists, that are read far more often than they change.
+
+Each cached list records the version of each table it was loaded from. The version of a table is incremented when the
+business logic creates, updates or deletes records in it, so a list is reloaded the next time it's requested after any
+of its tables change. Entries also expire after a fixed time, which bounds how stale a list can become if another
+process changes the database, and the least recently used entries are discarded once the cache is full.
+
+Cached values are shared between all callers, on every thread, so the model instances in them are replaced with
+read-only snapshots of their loaded attributes before they're cached. Snapshots of related instances are taken in the
+same way and lists of them become tuples, so a caller can't change the data another caller receives.
+
+The same table versions are used to build version tags, which the web application sends as HTTP entity tags so that
+unchanged pages can be answered with "304 Not Modified" without being queried or rendered.
+
+The cache is configured using the following environment variables:
+
++---------------------------+--------------------------------------------------------------------------------+
+| **Variable**              | **Setting**                                                                    |
++---------------------------+--------------------------------------------------------------------------------+
+| FLIGHT_BOOKING_CACHE_TTL  | Time, in seconds, for which cached lists are used. 0 disables the cache        |
++---------------------------+--------------------------------------------------------------------------------+
+| FLIGHT_BOOKING_CACHE_SIZE | Maximum number of cached lists                                                 |
++---------------------------+--------------------------------------------------------------------------------+
+"""
+
+import copy
+import functools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+import sqlalchemy as db
+from sqlalchemy.orm.base import instance_state
+
+
+class Snapshot:
+    """
+    Read-only copy of the attributes of a model instance that were loaded when the snapshot was taken. Properties of
+    the model class are evaluated against the snapshot, so derived values such as the capacity of an aircraft layout
+    remain available
+    """
+
+    __slots__ = ("_model_class", "_values")
+
+    def __init__(self, instance, memo):
+        """
+        Take a snapshot of a model instance
+
+        :param instance: Model instance
+        :param memo: Dictionary of the snapshots already taken, keyed by the ID of their instance, so instances that
+                     refer to each other are only copied once
+        """
+        object.__setattr__(self, "_model_class", type(instance))
+        object.__setattr__(self, "_values", {})
+        memo[id(instance)] = self
+
+        loaded = instance_state(instance).dict
+        for attribute in db.inspect(type(instance)).attrs:
+            if attribute.key in loaded:
+                self._values[attribute.key] = freeze(loaded[attribute.key], memo)
+
+    def __getattr__(self, name):
+        if name in self._values:
+            return self._values[name]
+
+        attribute = getattr(self._model_class, name, None)
+        if isinstance(attribute, property):
+            return attribute.fget(self)
+
+        raise AttributeError(f"{self._model_class.__name__} snapshot has no attribute {name}, or it wasn't loaded")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cached reference data is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Cached reference data is read-only")
+
+    def __repr__(self):
+        return self._model_class.__repr__(self)
+
+
+def freeze(value, memo=None):
+    """
+    Return a copy of a value that can be shared between callers. Model instances are replaced with snapshots, lists
+    and tuples with tuples of frozen values and other objects with a shallow copy whose attributes are frozen
+
+    :param value: Value to freeze
+    :param memo: Dictionary of the snapshots already taken, keyed by the ID of their instance
+    :return: The frozen value
+    """
+    memo = {} if memo is None else memo
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item, memo) for item in value)
+
+    if hasattr(value, "_sa_instance_state"):
+        return memo.get(id(value)) or Snapshot(value, memo)
+
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        frozen = copy.copy(value)
+        for name, attribute_value in vars(value).items():
+            setattr(frozen, name, freeze(attribute_value, memo))
+        return frozen
+
+    return value
+
+
+class ReferenceDataCache:
+    """
+    Class representing a bounded, time-limited cache of read-only reference data lists, invalidated by table
+    """
+    def __init__(self, max_entries=128, ttl=300):
+        """
+        Initialise the cache
+
+        :param max_entries: Maximum number of cached lists
+        :param ttl: Time, in seconds, for which cached lists are used. 0 disables the cache
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = defaultdict(int)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._generation = 0
+        self._instance_id = uuid.uuid4().hex[:12]
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def get(self, key, table_names, loader):
+        """
+        Return a cached value, calling the loader to load and cache it if it's not cached, has expired or any of the
+        tables it was loaded from have changed since it was cached
+
+        :param key: Hashable key identifying the value
+        :param table_names: Names of the tables the value is loaded from
+        :param loader: Callable that loads and returns the value
+        :return: The cached or loaded value
+        """
+        if self._ttl <= 0 or self._max_entries < 1:
+            return loader()
+
+        with self._lock:
+            versions = self._get_versions(table_names)
+            entry = self._entries.get(key)
+            if entry and entry[0] == versions and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2]
+
+            self._misses += 1
+
+        value = loader()
+
+        with self._lock:
+            # If any of the tables changed while the value was being loaded, it may already be stale
+            if versions == self._get_versions(table_names):
+                self._entries[key] = (versions, time.monotonic() + self._ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, *table_names):
+        """
+        Increment the version of one or more tables, so values loaded from them are reloaded when next requested
+
+        :param table_names: Names of the tables that have changed
+        """
+        with self._lock:
+            for table_name in table_names:
+                self._versions[table_name] += 1
+
+    def clear(self):
+        """
+        Discard all cached values and invalidate all tables
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            for table_name in self._versions.keys():
+                self._versions[table_name] += 1
+
+    def get_version_tag(self, *table_names):
+        """
+        Return a tag identifying the current versions of one or more tables. The tag changes when any of the tables
+        change, when the cache is cleared and, to bound staleness in the same way as cached values, at least once per
+        TTL period. Tags include an ID unique to this cache, so tags issued by another process never match
+
+        :param table_names: Names of the tables
+        :return: The version tag or None if the cache is disabled
+        """
+        if self._ttl <= 0 or self._max_entries < 1:
+            return None
+
+        with self._lock:
+            versions = self._get_versions(table_names)
+            generation = self._generation
+
+        period = int(time.monotonic() // self._ttl)
+        return "-".join([self._instance_id, str(generation), str(period), *[str(version) for version in versions]])
+
+    def cached(self, *table_names):
+        """
+        Decorator that caches the value returned by a function, keyed by the function and its arguments. The value is
+        frozen before it's cached so callers can't modify the shared copy. If the function returns a list, each caller
+        receives a new list of the frozen items
+
+        :param table_names: Names of the tables the function reads
+        :return: The decorator
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+                value = self.get(key, table_names, lambda: _freeze_result(func(*args, **kwargs)))
+                return list(value.items) if isinstance(value, _FrozenList) else value
+            return wrapper
+        return decorator
+
+    def _get_versions(self, table_names):
+        return tuple(self._versions[table_name] for table_name in table_names)
+
+
+class _FrozenList:
+    """
+    Wrapper that marks a cached tuple of frozen items as having been returned by the cached function as a list
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = items
+
+
+def _freeze_result(value):
+    """
+    Freeze the value returned by a cached function, recording whether it was a list
+
+    :param value: Value returned by the function
+    :return: The frozen value
+    """
+    return _FrozenList(freeze(value)) if isinstance(value, list) else freeze(value)
+
+
+#: Cache for reference data lists, configured from the environment
+reference_cache = ReferenceDataCache(max_entries=int(os.environ.get("FLIGHT_BOOKING_CACHE_SIZE") or "128"),
+                                     ttl=float(os.environ.get("FLIGHT_BOOKING_CACHE_TTL") or "300"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -9,10 +9,13 @@ class Seat(Base):
     """
     __tablename__ = "SEATS"
 
-    # Applying new seating layouts to flights involves removing the existing seats and creating
-    # new ones within the same session so that errors will rollback both operations. This constraint
-    # prevents that process from working
-    # __table_args__ = (UniqueConstraint('flight_id', 'seat_number', name='FLIGHT_SEAT_UX'),)
+    # Applying a new seating layout to a flight only deletes and inserts the seats that differ between the
+    # layouts, so seat numbers can be unique per flight. The unique index also serves seat lookups by flight
+    # and seat number and, as its leading column is the flight ID, lookups of all the seats on a flight
+    __table_args__ = (
+        Index("FLIGHT_SEAT_UX", "flight_id", "seat_number", unique=True),
+        Index("SEAT_PASSENGER_IX", "passenger_id")
+    )
 
     #: Primary key
     id = Column(Integer, primary_key=True)
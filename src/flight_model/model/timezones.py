@@ -0,0 +1,131 @@
+"""
+Declare methods for converting flight times between UTC and the local time at an airport.
+
+The timezone library is only imported when a timezone is first needed, so loading the model doesn't import it.
+
+Timezone objects are created once per timezone name and cached, so they aren't looked up again each time a flight's
+local departure or arrival time is calculated. The library used to provide them is selected using the
+FLIGHT_BOOKING_TIMEZONE_BACKEND environment variable:
+
++----------+-------------------------------------------------------------------------------------------------+
+| **Name** | **Comments**                                                                                    |
++----------+-------------------------------------------------------------------------------------------------+
+| pytz     | Use the pytz library. This is used if no backend is set                                         |
++----------+-------------------------------------------------------------------------------------------------+
+| zoneinfo | Use the zoneinfo module from the standard library. This requires the system timezone database  |
+|          | or the tzdata package                                                                           |
++----------+-------------------------------------------------------------------------------------------------+
+"""
+
+import datetime
+import functools
+import os
+
+#: Names of the supported timezone backends
+TIMEZONE_BACKENDS = ["pytz", "zoneinfo"]
+
+_backend = None
+
+
+def _pytz_timezone(name):
+    import pytz
+    return pytz.timezone(name)
+
+
+def _pytz_timezone_names():
+    import pytz
+    return list(pytz.all_timezones)
+
+
+def _zoneinfo_timezone(name):
+    import zoneinfo
+    return zoneinfo.ZoneInfo(name)
+
+
+def _zoneinfo_timezone_names():
+    import zoneinfo
+    return sorted(zoneinfo.available_timezones())
+
+
+_timezone_factories = {
+    "pytz": _pytz_timezone,
+    "zoneinfo": _zoneinfo_timezone
+}
+
+_timezone_name_lists = {
+    "pytz": _pytz_timezone_names,
+    "zoneinfo": _zoneinfo_timezone_names
+}
+
+
+def set_timezone_backend(backend):
+    """
+    Select the library used to provide timezone objects, discarding any cached timezones
+
+    :param backend: Name of the backend, one of TIMEZONE_BACKENDS
+    :raises ValueError: If the backend is not supported
+    """
+    global _backend
+    if backend not in TIMEZONE_BACKENDS:
+        raise ValueError(f"Timezone backend must be one of {', '.join(TIMEZONE_BACKENDS)}")
+    _backend = backend
+    get_timezone.cache_clear()
+
+
+def get_timezone_backend():
+    """
+    Return the name of the library used to provide timezone objects
+
+    :return: Name of the backend
+    """
+    if _backend is None:
+        set_timezone_backend(os.environ.get("FLIGHT_BOOKING_TIMEZONE_BACKEND") or "pytz")
+    return _backend
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(name):
+    """
+    Return the timezone object for a named timezone, creating it on first use
+
+    :param name: Timezone name e.g. Europe/London
+    :return: Timezone object from the selected backend
+    """
+    return _timezone_factories[get_timezone_backend()](name)
+
+
+def utc_to_local(utc_date_and_time, timezone_name):
+    """
+    Convert a naive UTC date and time to the local date and time in a named timezone
+
+    :param utc_date_and_time: Naive date and time (UTC), as read from the database
+    :param timezone_name: Timezone name e.g. Europe/London
+    :return: Timezone-aware local date and time
+    """
+    return utc_date_and_time.replace(tzinfo=datetime.timezone.utc).astimezone(get_timezone(timezone_name))
+
+
+def local_to_utc(local_date_and_time, timezone_name):
+    """
+    Convert a naive local date and time in a named timezone to UTC
+
+    :param local_date_and_time: Naive date and time in the named timezone
+    :param timezone_name: Timezone name e.g. Europe/London
+    :return: Timezone-aware UTC date and time
+    """
+    timezone = get_timezone(timezone_name)
+    if hasattr(timezone, "localize"):
+        # pytz timezones must be attached using localize() to pick up the UTC offset in force on the date
+        local_date_and_time = timezone.localize(local_date_and_time)
+    else:
+        local_date_and_time = local_date_and_time.replace(tzinfo=timezone)
+    return local_date_and_time.astimezone(datetime.timezone.utc)
+
+
+def list_timezone_names():
+    """
+    List the names of the timezones available from the selected backend
+
+    :return: A sorted list of timezone names
+    """
+    return _timezone_name_lists[get_timezone_backend()]()
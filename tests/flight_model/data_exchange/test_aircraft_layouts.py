@@ -1,9 +1,15 @@
+import importlib.util
+import io
+import os
+import tempfile
 import unittest
+from werkzeug.datastructures import FileStorage
 from src.flight_model.model import create_database
 from src.flight_model.logic import create_airline
 from src.flight_model.logic import list_layouts
 from src.flight_model.data_exchange import import_aircraft_layout_from_file, import_aircraft_layout_from_stream, \
-    get_layout_file_path
+    import_aircraft_layout_from_workbook, import_aircraft_layouts_from_folder, get_layout_file_path
+from src.flight_model.data_exchange.aircraft_layouts import ROW_BATCH_SIZE
 
 
 class TestAircraftLayouts(unittest.TestCase):
@@ -47,3 +53,117 @@ class TestAircraftLayouts(unittest.TestCase):
         import_aircraft_layout_from_file("EasyJet", "A320", None)
         with self.assertRaises(ValueError):
             import_aircraft_layout_from_file("EasyJet", "A320", None)
+
+    def test_can_import_layout_from_file_storage(self):
+        layout_file = get_layout_file_path("EasyJet", "A320", None)
+        with open(layout_file, mode="rb") as f:
+            file_storage = FileStorage(stream=io.BytesIO(f.read()), filename="layout.csv")
+            import_aircraft_layout_from_stream("EasyJet", "A320", None, file_storage)
+
+        aircraft_layout = list_layouts(None)[0]
+        self.confirm_layout_properties(aircraft_layout)
+
+    def test_can_import_layout_in_batches(self):
+        number_of_rows = 2 * ROW_BATCH_SIZE + 1
+        csv_text = "Row,Class,Seats\r\n" + "".join(f"{row},Economy,ABCDEF\r\n" for row in range(1, number_of_rows + 1))
+        import_aircraft_layout_from_stream("EasyJet", "A320", None, io.BytesIO(csv_text.encode("utf-8")))
+
+        aircraft_layout = list_layouts(None)[0]
+        self.assertEqual(number_of_rows, len(aircraft_layout.row_definitions))
+        self.assertEqual(6 * number_of_rows, aircraft_layout.capacity)
+
+    def test_cannot_import_layout_with_invalid_row(self):
+        for row in ["X,Economy,ABCDEF", "2,,ABCDEF", "2,Economy", "1,Economy,ABCDEF", "2,Economy,ABCA"]:
+            with self.subTest(row=row):
+                csv_text = f"Row,Class,Seats\n1,Economy,ABCDEF\n{row}\n"
+                with self.assertRaises(ValueError):
+                    import_aircraft_layout_from_stream("EasyJet", "A320", None, io.StringIO(csv_text))
+
+                self.assertEqual(0, len(list_layouts(None)))
+
+    def test_can_import_layouts_from_folder(self):
+        for workers in [None, 2]:
+            with self.subTest(workers=workers):
+                create_database()
+                create_airline("EasyJet")
+                results = import_aircraft_layouts_from_folder(workers=workers)
+
+                self.assertEqual(["easyjet_a320.csv", "easyjet_a320_1.csv", "easyjet_a321_neo.csv"],
+                                 [result.file_name for result in results])
+                self.assertEqual([("EasyJet", "A320", None), ("EasyJet", "A320", "1"), ("EasyJet", "A321", "neo")],
+                                 [(result.airline_name, result.aircraft, result.layout_name) for result in results])
+                self.assertEqual([None, None, None], [result.error for result in results])
+
+                layouts = {(layout.aircraft, layout.name): layout for layout in list_layouts(None)}
+                self.assertEqual(3, len(layouts))
+                self.confirm_layout_properties(layouts[("A320", "")])
+                for result in results:
+                    layout = layouts[(result.aircraft, result.layout_name or "")]
+                    self.assertEqual(len(layout.row_definitions), result.rows)
+                    self.assertEqual(layout.capacity, result.capacity)
+
+    def test_folder_import_reports_errors_for_each_file(self):
+        files = {
+            "easyjet_a319.csv": "Row,Class,Seats\n1,Economy,ABCDEF\n2,Economy,ABCDEF\n",
+            "easyjet_a320_bad.csv": "Row,Class,Seats\n1,Economy,ABCDEF\nX,Economy,ABCDEF\n",
+            "unknown_a320.csv": "Row,Class,Seats\n1,Economy,ABCDEF\n",
+            "notes.txt": "Not a layout"
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            for file_name, content in files.items():
+                with open(os.path.join(folder, file_name), mode="wt", encoding="utf-8") as f:
+                    f.write(content)
+
+            results = import_aircraft_layouts_from_folder(folder)
+
+        self.assertEqual(["easyjet_a319.csv", "easyjet_a320_bad.csv", "unknown_a320.csv"],
+                         [result.file_name for result in results])
+        self.assertIsNone(results[0].error)
+        self.assertEqual((2, 12), (results[0].rows, results[0].capacity))
+        self.assertIn("line 3", results[1].error)
+        self.assertIsNotNone(results[2].error)
+
+        layouts = list_layouts(None)
+        self.assertEqual(1, len(layouts))
+        self.assertEqual("A319", layouts[0].aircraft)
+
+
+@unittest.skipUnless(importlib.util.find_spec("openpyxl"), "The openpyxl package is required to import XLSX layouts")
+class TestWorkbookLayouts(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        create_airline("EasyJet")
+
+    @staticmethod
+    def get_workbook_path(aircraft, layout_name):
+        return os.path.splitext(get_layout_file_path("EasyJet", aircraft, layout_name))[0] + ".xlsx"
+
+    def test_can_import_layout_from_workbook(self):
+        import_aircraft_layout_from_workbook("EasyJet", "A321", "neo", self.get_workbook_path("A321", "neo"))
+        with open(get_layout_file_path("EasyJet", "A321", "neo"), mode="rb") as f:
+            import_aircraft_layout_from_stream("EasyJet", "A321", "csv", f)
+
+        layouts = {layout.name: layout for layout in list_layouts(None)}
+        self.assertEqual([(row.number, row.seating_class, row.seats) for row in layouts["csv"].row_definitions],
+                         [(row.number, row.seating_class, row.seats) for row in layouts["neo"].row_definitions])
+
+    def test_can_import_layout_from_workbook_stream(self):
+        with open(self.get_workbook_path("A320", None), mode="rb") as f:
+            file_storage = FileStorage(stream=io.BytesIO(f.read()), filename="layout.xlsx")
+            import_aircraft_layout_from_workbook("EasyJet", "A320", None, file_storage)
+
+        TestAircraftLayouts.confirm_layout_properties(self, list_layouts(None)[0])
+
+    def test_cannot_import_invalid_workbook(self):
+        with open(get_layout_file_path("EasyJet", "A320", None), mode="rb") as f:
+            with self.assertRaises(ValueError):
+                import_aircraft_layout_from_workbook("EasyJet", "A320", None, f)
+
+        self.assertEqual(0, len(list_layouts(None)))
+
+    def test_can_import_workbooks_from_folder(self):
+        results = import_aircraft_layouts_from_folder(workers=2, file_format="xlsx")
+        self.assertEqual(["easyjet_a320.xlsx", "easyjet_a320_1.xlsx", "easyjet_a321_neo.xlsx"],
+                         [result.file_name for result in results])
+        self.assertEqual([None, None, None], [result.error for result in results])
+        self.assertEqual([186, 186, 235], [result.capacity for result in results])
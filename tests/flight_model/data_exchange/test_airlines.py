@@ -15,3 +15,9 @@ class TestAircraftLayouts(unittest.TestCase):
             self.assertTrue("British Airways" in airline_names)
             self.assertTrue("EasyJet" in airline_names)
             self.assertTrue("Ryanair" in airline_names)
+
+    def test_reimport_leaves_airlines_unchanged(self):
+        first = import_airline_details()
+        second = import_airline_details()
+        self.assertEqual((3, 0, 0), (first.inserted, first.updated, first.unchanged))
+        self.assertEqual((0, 0, 3), (second.inserted, second.updated, second.unchanged))
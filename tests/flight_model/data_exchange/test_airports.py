@@ -1,3 +1,6 @@
+import json
+import os
+import tempfile
 import unittest
 from src.flight_model.model import create_database, Session, Airport
 from src.flight_model.data_exchange import import_airport_details
@@ -22,3 +25,38 @@ class TestAircraftLayouts(unittest.TestCase):
                 self.assertEqual(airport_code, airport.code)
                 self.assertEqual(airports[airport_code]["name"], airport.name)
                 self.assertEqual(airports[airport_code]["tz"], airport.timezone)
+
+    def test_reimport_leaves_airports_unchanged(self):
+        first = import_airport_details()
+        second = import_airport_details()
+        self.assertEqual((3, 0, 0), (first.inserted, first.updated, first.unchanged))
+        self.assertEqual((0, 0, 3), (second.inserted, second.updated, second.unchanged))
+
+    def test_import_inserts_and_updates_airports(self):
+        import_airport_details()
+        airports = {
+            "ALC": {"code": "ALC", "name": "Alicante", "tz": "Europe/Madrid"},
+            "LGW": {"code": "LGW", "name": "Gatwick", "tz": "Europe/London"},
+            "BCN": {"code": "BCN", "name": "Barcelona", "tz": "Europe/Madrid"}
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "airports.json")
+            with open(file_path, mode="wt", encoding="utf-8") as f:
+                json.dump({"airports": airports}, f)
+
+            summary = import_airport_details(file_path)
+
+        self.assertEqual((1, 1, 1), (summary.inserted, summary.updated, summary.unchanged))
+        with Session.begin() as session:
+            names = {airport.code: airport.name for airport in session.query(Airport).all()}
+        self.assertEqual({"ALC": "Alicante", "BCN": "Barcelona", "LGW": "Gatwick",
+                          "RMU": "Murcia International Airport"}, names)
+
+    def test_cannot_import_incomplete_airport(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "airports.json")
+            with open(file_path, mode="wt", encoding="utf-8") as f:
+                json.dump({"airports": {"ALC": {"code": "ALC", "name": "Alicante"}}}, f)
+
+            with self.assertRaises(ValueError):
+                import_airport_details(file_path)
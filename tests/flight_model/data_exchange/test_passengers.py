@@ -0,0 +1,136 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from werkzeug.datastructures import FileStorage
+from src.flight_model.model import create_database, Session, Passenger, Flight
+from src.flight_model.logic import create_airport
+from src.flight_model.logic import create_airline
+from src.flight_model.logic import create_flight
+from src.flight_model.logic import create_passenger, get_flight
+from src.flight_model.data_exchange import import_passenger_manifest, import_passenger_manifest_from_file
+
+CSV_MANIFEST = "name,gender,dob,nationality,residency,passport_number\r\n" \
+               "Some One,F,01/02/1970,UK,UK,1234567890\r\n" \
+               "Some One Else,m,1980-03-04,UK,Spain,2345678901\r\n"
+
+
+class TestPassengerManifests(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        create_airline("EasyJet")
+        create_airport("LGW", "London Gatwick", "Europe/London")
+        create_airport("RMU", "Murcia International Airport", "Europe/Madrid")
+        self._flight_id = create_flight("EasyJet", "LGW", "RMU", "U28549", "20/11/2021", "10:45", "2:25").id
+
+    def confirm_manifest_imported(self):
+        flight = get_flight(self._flight_id, seats=False, allocations=False)
+        passengers = sorted(flight.passengers, key=lambda p: p.passport_number)
+        self.assertEqual(2, len(passengers))
+        self.assertEqual("Some One", passengers[0].name)
+        self.assertEqual("F", passengers[0].gender)
+        self.assertEqual(datetime.date(1970, 2, 1), passengers[0].dob)
+        self.assertEqual("Some One Else", passengers[1].name)
+        self.assertEqual("M", passengers[1].gender)
+        self.assertEqual(datetime.date(1980, 3, 4), passengers[1].dob)
+        self.assertEqual("Spain", passengers[1].residency)
+
+    def confirm_nothing_imported(self):
+        with Session.begin() as session:
+            self.assertEqual(0, session.query(Flight).one().passenger_count)
+
+    def test_can_import_csv_manifest_from_text_stream(self):
+        count = import_passenger_manifest(self._flight_id, io.StringIO(CSV_MANIFEST))
+        self.assertEqual(2, count)
+        self.confirm_manifest_imported()
+
+    def test_can_import_csv_manifest_from_uploaded_file(self):
+        manifest = FileStorage(stream=io.BytesIO(CSV_MANIFEST.encode("utf-8")), filename="manifest.csv")
+        import_passenger_manifest(self._flight_id, manifest)
+        self.confirm_manifest_imported()
+
+    def test_can_import_json_manifest_from_file(self):
+        passengers = [
+            {"name": "Some One", "gender": "F", "dob": "1970-02-01", "nationality": "UK", "residency": "UK",
+             "passport_number": "1234567890"},
+            {"name": "Some One Else", "gender": "M", "dob": "04/03/1980", "nationality": "UK", "residency": "Spain",
+             "passport_number": "2345678901"}
+        ]
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "manifest.json")
+            with open(file_path, mode="wt", encoding="utf-8") as f:
+                json.dump({"passengers": passengers}, f)
+            count = import_passenger_manifest_from_file(self._flight_id, file_path)
+
+        self.assertEqual(2, count)
+        self.confirm_manifest_imported()
+
+    @patch("src.flight_model.data_exchange.passengers.PASSENGER_BATCH_SIZE", 2)
+    def test_can_import_manifest_in_batches(self):
+        manifest = "name,gender,dob,nationality,residency,passport_number\r\n" + \
+                   "".join(f"Passenger {i},F,01/02/1970,UK,UK,P{i}\r\n" for i in range(5))
+        count = import_passenger_manifest(self._flight_id, io.StringIO(manifest))
+        self.assertEqual(5, count)
+        with Session.begin() as session:
+            self.assertEqual(5, session.query(Flight).one().passenger_count)
+
+    def test_cannot_import_existing_passport_number(self):
+        create_passenger("Some One", "F", datetime.date(1970, 2, 1), "UK", "UK", "2345678901")
+        with self.assertRaises(ValueError) as context:
+            import_passenger_manifest(self._flight_id, io.StringIO(CSV_MANIFEST))
+        self.assertIn("2345678901", str(context.exception))
+
+        # The whole manifest is rejected, including passengers that don't collide
+        with Session.begin() as session:
+            self.assertEqual(1, session.query(Passenger).count())
+        self.confirm_nothing_imported()
+
+    def test_cannot_import_passport_number_added_during_import(self):
+        def insert_passenger_batch(session, _, batch):
+            # Simulate another passenger with the same passport number being added after the check for existing
+            # passengers, by inserting without checking
+            session.execute(Passenger.__table__.insert(), batch)
+
+        create_passenger("Some One", "F", datetime.date(1970, 2, 1), "UK", "UK", "2345678901")
+        with patch("src.flight_model.data_exchange.passengers._insert_passenger_batch",
+                   side_effect=insert_passenger_batch), self.assertRaises(ValueError):
+            import_passenger_manifest(self._flight_id, io.StringIO(CSV_MANIFEST))
+
+        with Session.begin() as session:
+            self.assertEqual(1, session.query(Passenger).count())
+        self.confirm_nothing_imported()
+
+    def test_cannot_import_duplicate_passport_number(self):
+        manifest = CSV_MANIFEST + "Some One Again,F,01/02/1970,UK,UK,1234567890\r\n"
+        with self.assertRaises(ValueError):
+            import_passenger_manifest(self._flight_id, io.StringIO(manifest))
+        self.confirm_nothing_imported()
+
+    def test_cannot_import_invalid_passengers(self):
+        for row in ["Some Body,F,01/02/1970,UK,UK,",
+                    "Some Body,X,01/02/1970,UK,UK,3456789012",
+                    "Some Body,F,31/02/1970,UK,UK,3456789012"]:
+            with self.subTest(row=row), self.assertRaises(ValueError) as context:
+                import_passenger_manifest(self._flight_id, io.StringIO(f"{CSV_MANIFEST}{row}\r\n"))
+            self.assertIn("line 4", str(context.exception))
+        self.confirm_nothing_imported()
+
+    def test_cannot_import_manifest_with_missing_columns(self):
+        with self.assertRaises(ValueError):
+            import_passenger_manifest(self._flight_id, io.StringIO("name,gender,dob\r\nSome One,F,01/02/1970\r\n"))
+
+    def test_cannot_import_invalid_json_manifest(self):
+        for manifest in ["[", "[]", '{"passengers": [1]}']:
+            with self.subTest(manifest=manifest), self.assertRaises(ValueError):
+                import_passenger_manifest(self._flight_id, io.StringIO(manifest), "json")
+
+    def test_cannot_import_manifest_for_missing_flight(self):
+        with self.assertRaises(ValueError):
+            import_passenger_manifest(self._flight_id + 1, io.StringIO(CSV_MANIFEST))
+
+    def test_cannot_import_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            import_passenger_manifest(self._flight_id, io.StringIO(CSV_MANIFEST), "xml")
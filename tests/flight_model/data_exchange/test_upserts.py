@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import patch
+from src.flight_model.model import create_database, Session, Airport
+from src.flight_model.data_exchange.upserts import upsert_records
+
+
+class TestUpserts(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+
+    def upsert_airports(self, airports):
+        records = [{"code": code, "name": name, "timezone": "Europe/London"} for code, name in airports]
+        with Session.begin() as session:
+            return upsert_records(session, Airport.__table__, "code", records)
+
+    @patch("src.flight_model.data_exchange.upserts.UPSERT_BATCH_SIZE", 2)
+    def test_can_upsert_in_batches(self):
+        summary = self.upsert_airports([("AAA", "A"), ("BBB", "B"), ("CCC", "C"), ("DDD", "D"), ("EEE", "E")])
+        self.assertEqual((5, 0, 0), (summary.inserted, summary.updated, summary.unchanged))
+
+        summary = self.upsert_airports([("AAA", "A"), ("BBB", "B2"), ("CCC", "C"), ("FFF", "F"), ("EEE", "E2")])
+        self.assertEqual((1, 2, 2), (summary.inserted, summary.updated, summary.unchanged))
+
+        with Session.begin() as session:
+            names = {airport.code: airport.name for airport in session.query(Airport).all()}
+        self.assertEqual({"AAA": "A", "BBB": "B2", "CCC": "C", "DDD": "D", "EEE": "E2", "FFF": "F"}, names)
+
+    def test_last_duplicate_in_batch_is_used(self):
+        summary = self.upsert_airports([("AAA", "A"), ("AAA", "A2")])
+        self.assertEqual((1, 0, 0), (summary.inserted, summary.updated, summary.unchanged))
+        with Session.begin() as session:
+            self.assertEqual("A2", session.query(Airport).one().name)
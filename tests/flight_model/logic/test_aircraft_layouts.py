@@ -1,12 +1,13 @@
 import unittest
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
-from src.flight_model.model import create_database, Session, Flight, AircraftLayout, Airline
+from src.flight_model.model import create_database, Session, Flight, AircraftLayout, Airline, Seat, RowDefinition
 from src.flight_model.logic import create_airport
 from src.flight_model.logic import create_airline, get_airline
 from src.flight_model.logic import create_flight, list_flights
 from src.flight_model.logic import apply_aircraft_layout, list_layouts, create_layout, add_row_to_layout, get_layout, \
     delete_layout, update_layout
+from src.flight_model.logic import allocate_seat
 from tests.flight_model.utils import create_test_layout, create_test_passengers_on_flight
 
 
@@ -75,6 +76,44 @@ class TestAircraftLayouts(unittest.TestCase):
                 for letter in "ABC":
                     self.assertTrue(f"{row}{letter}" in seat_numbers)
 
+    def test_swapping_layout_keeps_unchanged_seats(self):
+        airline = get_airline("EasyJet")
+        layouts = {layout.aircraft: layout for layout in list_layouts(airline.id)}
+        flight_id = list_flights(airline.id)[0].id
+
+        apply_aircraft_layout(flight_id, layouts["A320"].id)
+        with Session.begin() as session:
+            original_ids = {seat.seat_number: seat.id for seat in session.query(Seat).all()}
+
+        apply_aircraft_layout(flight_id, layouts["A321"].id)
+        with Session.begin() as session:
+            seat_ids = {seat.seat_number: seat.id for seat in session.query(Seat).all()}
+
+        # Seats 1A-1C are common to both layouts so should be retained, 1D-1F should have been removed
+        self.assertEqual(30, len(seat_ids))
+        for seat_number in ["1A", "1B", "1C"]:
+            self.assertEqual(original_ids[seat_number], seat_ids[seat_number])
+        for seat_number in ["1D", "1E", "1F"]:
+            self.assertNotIn(seat_number, seat_ids)
+
+    def test_swapping_layout_moves_displaced_passengers_to_first_available_seat(self):
+        create_test_passengers_on_flight(2)
+        airline = get_airline("EasyJet")
+        layouts = {layout.aircraft: layout for layout in list_layouts(airline.id)}
+        flight = list_flights(airline.id)[0]
+
+        apply_aircraft_layout(flight.id, layouts["A320"].id)
+        allocate_seat(flight.id, flight.passengers[0].id, "1B")
+        allocate_seat(flight.id, flight.passengers[1].id, "1E")
+        apply_aircraft_layout(flight.id, layouts["A321"].id)
+
+        with Session.begin() as session:
+            allocations = {seat.passenger_id: seat.seat_number
+                           for seat in session.query(Seat).filter(Seat.passenger_id.isnot(None)).all()}
+
+        self.assertEqual("1B", allocations[flight.passengers[0].id])
+        self.assertEqual("1A", allocations[flight.passengers[1].id])
+
     def test_cannot_reapply_same_aircraft_layout(self):
         # Get the flight that the seating plan will be associated with and find the aircraft layout
         with Session.begin() as session:
@@ -125,6 +164,22 @@ class TestAircraftLayouts(unittest.TestCase):
         with self.assertRaises(ValueError):
             apply_aircraft_layout(flight.id, aircraft_layout_id)
 
+    def test_cannot_apply_aircraft_layout_with_repeated_seat_numbers(self):
+        # Layouts created before repeated seat letters were rejected may still contain them
+        airline = get_airline("EasyJet")
+        layout = create_layout(airline.id, "A319", "")
+        with Session.begin() as session:
+            session.add(RowDefinition(aircraft_layout_id=layout.id, number=1, seating_class="Economy", seats="ABCA"))
+
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+
+        with self.assertRaises(ValueError):
+            apply_aircraft_layout(flight.id, layout.id)
+
+        with Session.begin() as session:
+            self.assertEqual(0, session.query(Seat).count())
+
     def test_cannot_add_duplicate_layout(self):
         with self.assertRaises(IntegrityError):
             create_test_layout("EasyJet", "A321", "Neo", 10, "ABCDEF")
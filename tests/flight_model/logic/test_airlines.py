@@ -3,7 +3,8 @@ from src.flight_model.model import create_database, Session, Airline
 from src.flight_model.logic import create_airport
 from src.flight_model.logic import create_flight, list_flights
 from src.flight_model.logic import create_airline, list_airlines, get_airline, delete_airline, update_airline
-from src.flight_model.logic import create_layout, list_layouts
+from src.flight_model.logic import list_airlines_page
+from src.flight_model.logic import create_layout, list_layouts, add_row_to_layout
 
 
 class TestAirlines(unittest.TestCase):
@@ -86,3 +87,51 @@ class TestAirlines(unittest.TestCase):
         airline = create_airline("British Airways")
         with self.assertRaises(ValueError):
             update_airline(airline.id, "EasyJet")
+
+    def test_airline_list_is_cached_until_airlines_change(self):
+        self.assertEqual(["EasyJet"], [airline.name for airline in list_airlines()])
+
+        # Changes made outside the business logic aren't seen until the cache is invalidated
+        with Session.begin() as session:
+            session.add(Airline(name="British Airways"))
+        self.assertEqual(["EasyJet"], [airline.name for airline in list_airlines()])
+
+        create_airline("SAS")
+        self.assertEqual(["British Airways", "EasyJet", "SAS"], [airline.name for airline in list_airlines()])
+
+        airline = get_airline("SAS")
+        update_airline(airline.id, "Ryanair")
+        self.assertEqual(["British Airways", "EasyJet", "Ryanair"], [airline.name for airline in list_airlines()])
+
+        delete_airline(airline.id)
+        self.assertEqual(["British Airways", "EasyJet"], [airline.name for airline in list_airlines()])
+
+    def test_cached_airlines_are_read_only(self):
+        airlines = list_airlines()
+        with self.assertRaises(AttributeError):
+            airlines[0].name = "British Airways"
+
+        # Changing the returned list doesn't change the list returned to other callers
+        airlines.clear()
+        self.assertEqual(["EasyJet"], [airline.name for airline in list_airlines()])
+
+    def test_cached_airline_page_is_read_only(self):
+        page = list_airlines_page(10)
+        with self.assertRaises(AttributeError):
+            page.items[0].name = "British Airways"
+        with self.assertRaises(TypeError):
+            page.items[0] = None
+        self.assertEqual(["EasyJet"], [airline.name for airline in list_airlines_page(10).items])
+
+    def test_cached_layouts_are_read_only_and_have_properties(self):
+        airline = get_airline("EasyJet")
+        layout = create_layout(airline.id, "A321", "neo")
+        add_row_to_layout(layout.id, 1, "Economy", "ABC")
+
+        layout = list_layouts()[0]
+        self.assertEqual("EasyJet", layout.airline.name)
+        self.assertEqual(3, layout.capacity)
+        self.assertEqual(["1A", "1B", "1C"], layout.seat_numbers)
+        with self.assertRaises(AttributeError):
+            layout.row_definitions[0].seats = "ABCDEF"
+        self.assertEqual(3, list_layouts()[0].capacity)
@@ -0,0 +1,209 @@
+import gc
+import os
+import threading
+import time
+import unittest
+import weakref
+from unittest.mock import patch
+from src.flight_model.model import create_database, Session, Flight
+from src.flight_model.logic import InvalidOperationError
+from src.flight_model.logic import create_airport
+from src.flight_model.logic import create_airline
+from src.flight_model.logic import create_flight
+from src.flight_model.logic import allocate_seat
+from src.flight_model.logic import BoardingCardsGenerator, BoardingCardJobQueue
+from tests.flight_model.utils import create_test_layout, create_test_seating_plan, create_test_passengers_on_flight, \
+    text_card_generator
+
+release_cards = threading.Event()
+
+
+def blocking_card_generator(card_details):
+    """
+    Stub card generator that waits until the test releases it
+
+    :param card_details: Boarding card details
+    """
+    release_cards.wait(5)
+    return text_card_generator(card_details)
+
+
+def failing_card_generator(card_details):
+    """
+    Stub card generator that always fails
+
+    :param card_details: Boarding card details
+    """
+    raise RuntimeError("Rendering failed")
+
+
+CARD_GENERATORS = {
+    "txt": text_card_generator,
+    "blk": blocking_card_generator,
+    "blk2": blocking_card_generator,
+    "blk3": blocking_card_generator,
+    "err": failing_card_generator
+}
+
+
+@patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", CARD_GENERATORS)
+class TestBoardingCardJobs(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        create_airline("EasyJet")
+        create_test_layout("EasyJet", "A321", "Neo", 10, "ABC")
+        create_airport("LGW", "London Gatwick", "Europe/London")
+        create_airport("RMU", "Murcia International Airport", "Europe/Madrid")
+        create_flight("EasyJet", "LGW", "RMU", "U28549", "20/11/2021", "10:45", "2:25")
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(2)
+        with Session.begin() as session:
+            self._flight = session.query(Flight).one()
+            allocate_seat(self._flight.id, self._flight.passengers[0].id, "1A")
+            allocate_seat(self._flight.id, self._flight.passengers[1].id, "1B")
+
+        release_cards.clear()
+        self._job_queue = BoardingCardJobQueue(workers=1, max_queued=1)
+
+    def tearDown(self) -> None:
+        release_cards.set()
+        self._job_queue.join()
+        for card_format in CARD_GENERATORS.keys():
+            manifest_path = BoardingCardsGenerator.get_manifest_path(self._flight.number,
+                                                                     self._flight.departure_date,
+                                                                     card_format)
+            if os.path.exists(manifest_path):
+                os.unlink(manifest_path)
+
+            for seat_number in ["1A", "1B"]:
+                card_file_path = BoardingCardsGenerator.get_boarding_card_path(self._flight.number,
+                                                                               seat_number,
+                                                                               self._flight.departure_date,
+                                                                               card_format)
+                if os.path.exists(card_file_path):
+                    os.unlink(card_file_path)
+
+    def _wait_for_state(self, job, state):
+        for _ in range(500):
+            if job.state == state:
+                return
+            time.sleep(0.01)
+        self.fail(f"Job did not reach state {state}")
+
+    def test_can_run_job(self):
+        job = self._job_queue.submit(self._flight.id, "txt", "28A")
+        self._job_queue.join()
+
+        self.assertEqual("done", job.state)
+        self.assertEqual(2, job.total_cards)
+        self.assertEqual(2, job.cards_rendered)
+        self.assertEqual(job, self._job_queue.get_job(job.job_id))
+        self.assertEqual({
+            "job_id": job.job_id,
+            "flight_id": self._flight.id,
+            "card_format": "txt",
+            "gate": "28A",
+            "state": "done",
+            "total_cards": 2,
+            "cards_rendered": 2,
+            "cards_unchanged": 0,
+            "error": None
+        }, job.to_dict())
+
+    def test_duplicate_jobs_are_not_queued(self):
+        job = self._job_queue.submit(self._flight.id, "blk", "28A")
+        self.assertIs(job, self._job_queue.submit(self._flight.id, "blk", "28A"))
+
+        release_cards.set()
+        self._job_queue.join()
+        self.assertEqual("done", job.state)
+        self.assertIsNot(job, self._job_queue.submit(self._flight.id, "blk", "28A"))
+
+    def test_jobs_for_different_gates_run_in_turn(self):
+        job_queue = BoardingCardJobQueue(workers=2, max_queued=2)
+        first_job = job_queue.submit(self._flight.id, "blk", "28A")
+        self._wait_for_state(first_job, "running")
+        second_job = job_queue.submit(self._flight.id, "blk", "30B")
+        self.assertIsNot(first_job, second_job)
+
+        # The second job writes the same cards, so it mustn't start until the first has finished
+        time.sleep(0.1)
+        self.assertEqual("queued", second_job.state)
+
+        release_cards.set()
+        job_queue.join()
+        self.assertEqual("done", first_job.state)
+        self.assertEqual("done", second_job.state)
+
+        card_file_path = BoardingCardsGenerator.get_boarding_card_path(self._flight.number,
+                                                                       "1A",
+                                                                       self._flight.departure_date,
+                                                                       "blk")
+        with open(card_file_path, mode="rt", encoding="utf-8") as f:
+            self.assertIn("30B", f.read())
+
+    def test_status_is_available_while_flight_is_loaded(self):
+        status_returned = []
+
+        def create_generator(*args, **kwargs):
+            # Request the status from another thread while the generator is being created
+            thread = threading.Thread(target=lambda: status_returned.append(self._job_queue.list_jobs()))
+            thread.start()
+            thread.join(2)
+            return BoardingCardsGenerator(*args, **kwargs)
+
+        with patch("src.flight_model.logic.boarding_card_jobs.BoardingCardsGenerator", side_effect=create_generator):
+            self._job_queue.submit(self._flight.id, "txt", "28A")
+
+        self._job_queue.join()
+        self.assertEqual([[]], status_returned)
+
+    def test_finished_job_releases_generator(self):
+        generators = []
+
+        def create_generator(*args, **kwargs):
+            generator = BoardingCardsGenerator(*args, **kwargs)
+            generators.append(weakref.ref(generator))
+            return generator
+
+        with patch("src.flight_model.logic.boarding_card_jobs.BoardingCardsGenerator", side_effect=create_generator):
+            done_job = self._job_queue.submit(self._flight.id, "txt", "28A")
+            self._job_queue.join()
+            failed_job = self._job_queue.submit(self._flight.id, "err", "28A")
+            self._job_queue.join()
+
+        gc.collect()
+        self.assertEqual([None, None], [generator() for generator in generators])
+        self.assertEqual(("done", 2, 2), (done_job.state, done_job.total_cards, done_job.cards_rendered))
+        self.assertEqual(("failed", "Rendering failed"), (failed_job.state, failed_job.error))
+
+    def test_cannot_exceed_queue_size(self):
+        running_job = self._job_queue.submit(self._flight.id, "blk", "28A")
+        self._wait_for_state(running_job, "running")
+        queued_job = self._job_queue.submit(self._flight.id, "blk2", "28A")
+        self.assertEqual("queued", queued_job.state)
+
+        with self.assertRaises(InvalidOperationError):
+            self._job_queue.submit(self._flight.id, "blk3", "28A")
+
+    def test_failed_job_records_error(self):
+        job = self._job_queue.submit(self._flight.id, "err", "28A")
+        self._job_queue.join()
+
+        self.assertEqual("failed", job.state)
+        self.assertEqual("Rendering failed", job.error)
+        self.assertEqual(0, job.cards_rendered)
+
+    def test_finished_jobs_are_discarded_beyond_history(self):
+        job_queue = BoardingCardJobQueue(workers=1, max_queued=1, history=1)
+        first_job = job_queue.submit(self._flight.id, "txt", "28A")
+        job_queue.join()
+        second_job = job_queue.submit(self._flight.id, "txt", "28A")
+        job_queue.join()
+
+        self.assertIsNone(job_queue.get_job(first_job.job_id))
+        self.assertEqual([second_job], job_queue.list_jobs())
+
+    def test_cannot_create_queue_with_no_workers(self):
+        with self.assertRaises(ValueError):
+            BoardingCardJobQueue(workers=0)
@@ -1,12 +1,16 @@
+import io
 import os
 import unittest
-from unittest.mock import patch
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import patch, Mock
 from src.flight_model.model import create_database, Session, Flight
 from src.flight_model.logic import InvalidOperationError, MissingBoardingCardPluginError
 from src.flight_model.logic import create_airport
 from src.flight_model.logic import create_airline
 from src.flight_model.logic import create_flight
 from src.flight_model.logic import BoardingCardsGenerator
+from src.flight_model.logic.boarding_cards_generator import get_card_generator, OUTPUT_MODES
 from src.flight_model.logic import allocate_seat
 from tests.flight_model.utils import create_test_layout, create_test_seating_plan, create_test_passengers_on_flight, \
     text_card_generator, binary_card_generator
@@ -21,6 +25,19 @@ class TestBoardingCards(unittest.TestCase):
         create_airport("RMU", "Murcia International Airport", "Europe/Madrid")
         create_flight("EasyJet", "LGW", "RMU", "U28549", "20/11/2021", "10:45", "2:25")
 
+    def tearDown(self) -> None:
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+
+        departure_date = flight.departure_date
+        for card_format in ["txt", "dat"]:
+            file_paths = [BoardingCardsGenerator.get_manifest_path(flight.number, departure_date, card_format, output)
+                          for output in OUTPUT_MODES]
+            file_paths.append(BoardingCardsGenerator.get_archive_path(flight.number, departure_date, card_format))
+            for file_path in file_paths:
+                if os.path.exists(file_path):
+                    os.unlink(file_path)
+
     @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
     def test_can_generate_boarding_cards(self):
         create_test_seating_plan("U28549", "A321", "Neo")
@@ -79,6 +96,254 @@ class TestBoardingCards(unittest.TestCase):
         self.assertIn("02:10 PM", contents)
         self.assertIn("Passenger 0", contents)
 
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_boarding_cards_are_generated_for_each_allocated_passenger(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(3)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+            allocate_seat(flight.id, flight.passengers[0].id, "2C")
+            allocate_seat(flight.id, flight.passengers[2].id, "1A")
+            generator = BoardingCardsGenerator(flight.id, "txt", "28A")
+            generator.generate_cards()
+
+        # Each allocated seat should have a card naming the passenger in that seat
+        for seat_number, name in [("2C", "Passenger 0"), ("1A", "Passenger 2")]:
+            boarding_card_file = BoardingCardsGenerator.get_boarding_card_path(flight.number,
+                                                                               seat_number,
+                                                                               flight.departure_date,
+                                                                               "txt")
+            with open(boarding_card_file, mode="rt", encoding="utf-8") as f:
+                contents = f.read()
+            os.unlink(boarding_card_file)
+
+            self.assertIn(name, contents)
+            self.assertIn(seat_number, contents)
+
+        # The unallocated passenger shouldn't have a card
+        self.assertFalse(os.path.exists(BoardingCardsGenerator.get_boarding_card_path(flight.number,
+                                                                                      "1B",
+                                                                                      flight.departure_date,
+                                                                                      "txt")))
+
+    def _generate_all_cards(self, card_format, **kwargs):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(5)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+            for passenger, seat_number in zip(flight.passengers, ["1A", "1B", "1C", "3B", "10C"]):
+                allocate_seat(flight.id, passenger.id, seat_number)
+
+        BoardingCardsGenerator(flight.id, card_format, "28A").generate_cards()
+        serial_cards = self._read_and_remove_cards(flight, card_format)
+
+        BoardingCardsGenerator(flight.id, card_format, "28A", **kwargs).generate_cards()
+        parallel_cards = self._read_and_remove_cards(flight, card_format)
+
+        return serial_cards, parallel_cards
+
+    def _read_and_remove_cards(self, flight, card_format):
+        cards = {}
+        for seat in flight.seats:
+            boarding_card_file = BoardingCardsGenerator.get_boarding_card_path(flight.number,
+                                                                               seat.seat_number,
+                                                                               flight.departure_date,
+                                                                               card_format)
+            if os.path.exists(boarding_card_file):
+                with open(boarding_card_file, mode="rb") as f:
+                    cards[seat.seat_number] = f.read()
+                os.unlink(boarding_card_file)
+
+        return cards
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_thread_pool_generates_same_cards_as_serial(self):
+        serial_cards, parallel_cards = self._generate_all_cards("txt", workers=3, pool="thread")
+        self.assertEqual(5, len(serial_cards))
+        self.assertEqual(serial_cards, parallel_cards)
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"dat": binary_card_generator})
+    def test_process_pool_generates_same_cards_as_serial(self):
+        serial_cards, parallel_cards = self._generate_all_cards("dat", workers=2, pool="process")
+        self.assertEqual(5, len(serial_cards))
+        self.assertEqual(serial_cards, parallel_cards)
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_cannot_generate_boarding_cards_with_invalid_pool(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(1)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+
+        with self.assertRaises(ValueError):
+            BoardingCardsGenerator(flight.id, "txt", "28A", workers=2, pool="cluster")
+
+        with self.assertRaises(ValueError):
+            BoardingCardsGenerator(flight.id, "txt", "28A", workers=0)
+
+        with self.assertRaises(ValueError):
+            BoardingCardsGenerator(flight.id, "txt", "28A", output="tar")
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_only_changed_boarding_cards_are_regenerated(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(3)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        for passenger, seat_number in zip(flight.passengers, ["1A", "1B", "1C"]):
+            allocate_seat(flight.id, passenger.id, seat_number)
+
+        generator = BoardingCardsGenerator(flight.id, "txt", "28A")
+        generator.generate_cards()
+        self.assertEqual(3, generator.cards_rendered)
+
+        # Nothing has changed, so no cards should be rendered
+        generator = BoardingCardsGenerator(flight.id, "txt", "28A")
+        generator.generate_cards()
+        self.assertEqual(0, generator.cards_rendered)
+        self.assertEqual(3, generator.cards_unchanged)
+
+        # Moving one passenger should render their new card and remove the card for the seat they've left
+        allocate_seat(flight.id, flight.passengers[0].id, "2B")
+        generator = BoardingCardsGenerator(flight.id, "txt", "28A")
+        generator.generate_cards()
+        self.assertEqual(1, generator.cards_rendered)
+        self.assertEqual(2, generator.cards_unchanged)
+
+        cards = self._read_and_remove_cards(flight, "txt")
+        self.assertEqual(["1B", "1C", "2B"], sorted(cards.keys()))
+        self.assertIn("Passenger 0", cards["2B"].decode("utf-8"))
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_boarding_cards_are_regenerated_when_gate_changes(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(2)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        for passenger, seat_number in zip(flight.passengers, ["1A", "1B"]):
+            allocate_seat(flight.id, passenger.id, seat_number)
+
+        BoardingCardsGenerator(flight.id, "txt", "28A").generate_cards()
+        generator = BoardingCardsGenerator(flight.id, "txt", "30B")
+        generator.generate_cards()
+        self.assertEqual(2, generator.cards_rendered)
+
+        cards = self._read_and_remove_cards(flight, "txt")
+        self.assertIn("30B", cards["1A"].decode("utf-8"))
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_all_boarding_cards_are_regenerated_if_not_incremental(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(2)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        for passenger, seat_number in zip(flight.passengers, ["1A", "1B"]):
+            allocate_seat(flight.id, passenger.id, seat_number)
+
+        BoardingCardsGenerator(flight.id, "txt", "28A").generate_cards()
+        generator = BoardingCardsGenerator(flight.id, "txt", "28A", incremental=False)
+        generator.generate_cards()
+        self.assertEqual(2, generator.cards_rendered)
+        self._read_and_remove_cards(flight, "txt")
+
+    def _read_archive(self, flight, card_format):
+        archive_path = BoardingCardsGenerator.get_archive_path(flight.number, flight.departure_date, card_format)
+        with zipfile.ZipFile(archive_path) as archive:
+            return {
+                info.filename: archive.read(info.filename)
+                for info in archive.infolist()
+                if info.compress_type == zipfile.ZIP_STORED
+            }
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"dat": binary_card_generator})
+    def test_archive_contains_same_cards_as_files(self):
+        serial_cards, _ = self._generate_all_cards("dat", workers=1, pool="thread")
+
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        BoardingCardsGenerator(flight.id, "dat", "28A", output="archive").generate_cards()
+
+        expected = {
+            BoardingCardsGenerator.get_boarding_card_file_name(flight.number, seat_number, flight.departure_date, "dat"):
+                card_data
+            for seat_number, card_data in serial_cards.items()
+        }
+        self.assertEqual(expected, self._read_archive(flight, "dat"))
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_only_changed_boarding_cards_are_regenerated_in_archive(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(2)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        for passenger, seat_number in zip(flight.passengers, ["1A", "1B"]):
+            allocate_seat(flight.id, passenger.id, seat_number)
+
+        BoardingCardsGenerator(flight.id, "txt", "28A", output="archive").generate_cards()
+
+        # Moving one passenger should render their new card, copy the other and drop the seat they've left
+        allocate_seat(flight.id, flight.passengers[0].id, "2B")
+        generator = BoardingCardsGenerator(flight.id, "txt", "28A", output="archive", workers=2, pool="thread")
+        generator.generate_cards()
+        self.assertEqual(1, generator.cards_rendered)
+        self.assertEqual(1, generator.cards_unchanged)
+
+        cards = self._read_archive(flight, "txt")
+        self.assertEqual(["u28549_1b_20211120.txt", "u28549_2b_20211120.txt"], sorted(cards.keys()))
+        self.assertIn("Passenger 0", cards["u28549_2b_20211120.txt"].decode("utf-8"))
+        self.assertFalse(os.path.exists(BoardingCardsGenerator.get_boarding_card_path(flight.number,
+                                                                                      "2B",
+                                                                                      flight.departure_date,
+                                                                                      "txt")))
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
+    def test_output_modes_have_separate_manifests(self):
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(2)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        for passenger, seat_number in zip(flight.passengers, ["1A", "1B"]):
+            allocate_seat(flight.id, passenger.id, seat_number)
+
+        # Changing the gate for an archive run mustn't mark the card files written by an earlier run as current
+        BoardingCardsGenerator(flight.id, "txt", "28A").generate_cards()
+        BoardingCardsGenerator(flight.id, "txt", "30B", output="archive").generate_cards()
+        generator = BoardingCardsGenerator(flight.id, "txt", "30B")
+        generator.generate_cards()
+        self.assertEqual(2, generator.cards_rendered)
+
+        cards = self._read_and_remove_cards(flight, "txt")
+        self.assertIn("30B", cards["1A"].decode("utf-8"))
+
+    @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"dat": binary_card_generator})
+    def test_can_stream_boarding_card_archive(self):
+        serial_cards, _ = self._generate_all_cards("dat", workers=1, pool="thread")
+
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+        generator = BoardingCardsGenerator(flight.id, "dat", "28A", workers=2, pool="thread")
+        chunks = list(generator.stream_archive())
+
+        # There should be a chunk per card plus one for the end of the archive
+        self.assertEqual(6, len(chunks))
+        self.assertEqual(5, generator.cards_rendered)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            streamed_cards = {info.filename: archive.read(info.filename) for info in archive.infolist()}
+
+        expected = {
+            BoardingCardsGenerator.get_boarding_card_file_name(flight.number, seat_number, flight.departure_date, "dat"):
+                card_data
+            for seat_number, card_data in serial_cards.items()
+        }
+        self.assertEqual(expected, streamed_cards)
+
+        # Nothing should have been written to disk
+        self.assertEqual({}, self._read_and_remove_cards(flight, "dat"))
+        self.assertFalse(os.path.exists(BoardingCardsGenerator.get_archive_path(flight.number,
+                                                                                flight.departure_date,
+                                                                                "dat")))
+
     @patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {"txt": text_card_generator})
     def test_cannot_print_boarding_cards_with_no_gate(self):
         create_test_seating_plan("U28549", "A321", "Neo")
@@ -123,3 +388,55 @@ class TestBoardingCards(unittest.TestCase):
             flight = session.query(Flight).one()
             generator = BoardingCardsGenerator(flight.id, "txt", "28A")
             generator.generate_cards()
+
+
+def create_plugin_entry_point(name, card_format, card_generator):
+    """
+    Create a mock plugin entry point whose load() method returns a plugin module
+
+    :param name: Entry point name
+    :param card_format: Card format exposed by the plugin
+    :param card_generator: Card generator exposed by the plugin
+    :return: The mock entry point
+    """
+    entry_point = Mock()
+    entry_point.name = name
+    entry_point.load.return_value = SimpleNamespace(card_format=card_format, card_generator=card_generator)
+    return entry_point
+
+
+@patch("src.flight_model.logic.boarding_cards_generator.card_generator_map", {})
+@patch("src.flight_model.logic.boarding_cards_generator._plugin_entry_points", None)
+class TestBoardingCardPlugins(unittest.TestCase):
+    def setUp(self) -> None:
+        self._txt_entry_point = create_plugin_entry_point("txt", "txt", text_card_generator)
+        self._dat_entry_point = create_plugin_entry_point("dat", "dat", binary_card_generator)
+        self._unnamed_entry_point = create_plugin_entry_point("other", "html", text_card_generator)
+
+    def test_only_plugin_for_format_is_loaded(self):
+        entry_points = [self._txt_entry_point, self._dat_entry_point, self._unnamed_entry_point]
+        with patch("src.flight_model.logic.boarding_cards_generator._find_plugin_entry_points",
+                   return_value=entry_points) as find_plugins:
+            self.assertEqual(binary_card_generator, get_card_generator("dat"))
+            self.assertEqual(binary_card_generator, get_card_generator("dat"))
+
+        find_plugins.assert_called_once()
+        self._dat_entry_point.load.assert_called_once()
+        self._txt_entry_point.load.assert_not_called()
+        self._unnamed_entry_point.load.assert_not_called()
+
+    def test_plugin_not_named_after_format_is_found(self):
+        entry_points = [self._txt_entry_point, self._unnamed_entry_point]
+        with patch("src.flight_model.logic.boarding_cards_generator._find_plugin_entry_points",
+                   return_value=entry_points):
+            self.assertEqual(text_card_generator, get_card_generator("html"))
+            self.assertEqual(text_card_generator, get_card_generator("txt"))
+
+        self._txt_entry_point.load.assert_called_once()
+        self._unnamed_entry_point.load.assert_called_once()
+
+    def test_missing_plugin_raises_error(self):
+        with patch("src.flight_model.logic.boarding_cards_generator._find_plugin_entry_points",
+                   return_value=[self._txt_entry_point]):
+            with self.assertRaises(MissingBoardingCardPluginError):
+                get_card_generator("pdf")
@@ -1,10 +1,12 @@
 import datetime
 import unittest
-from src.flight_model.model import create_database, Session, Flight
+from sqlalchemy.exc import InvalidRequestError
+from src.flight_model.model import create_database, Session, Flight, FlightPassenger, reference_cache
 from src.flight_model.logic import create_flight, get_flight, list_flights, delete_flight
 from src.flight_model.logic import create_airport
 from src.flight_model.logic import create_airline, list_airlines
 from src.flight_model.logic import create_passenger, add_passenger
+from tests.flight_model.utils import create_test_layout, create_test_seating_plan, create_test_passengers_on_flight
 
 
 class TestFlights(unittest.TestCase):
@@ -37,6 +39,31 @@ class TestFlights(unittest.TestCase):
         self.assertEqual("20/11/2021", flight.departs_localtime.strftime("%d/%m/%Y"))
         self.assertEqual("2:25", flight.formatted_duration)
 
+    def test_get_flight_loads_only_requested_collections(self):
+        create_test_layout("EasyJet", "A321", "Neo", 10, "ABCDEF")
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(1)
+
+        with Session.begin() as session:
+            flight_id = session.query(Flight).one().id
+
+        flight = get_flight(flight_id, seats=True, passengers=False)
+        self.assertEqual(60, len(flight.seats))
+        with self.assertRaises(InvalidRequestError):
+            _ = flight.passengers
+
+    def test_can_get_flight_in_summary_mode(self):
+        create_test_layout("EasyJet", "A321", "Neo", 10, "ABCDEF")
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(2)
+
+        with Session.begin() as session:
+            flight_id = session.query(Flight).one().id
+
+        flight = get_flight(flight_id, seats=False, passengers=False, summary=True)
+        self.assertEqual(60, flight.capacity)
+        self.assertEqual(2, flight.passenger_count)
+
     def test_can_list_all_flights(self):
         flights = list_flights()
         self.assertEqual(1, len(flights))
@@ -46,6 +73,22 @@ class TestFlights(unittest.TestCase):
         flights = list_flights(airline.id)
         self.assertEqual(1, len(flights))
 
+    def test_can_list_flights_in_summary_mode(self):
+        create_test_layout("EasyJet", "A321", "Neo", 10, "ABCDEF")
+        create_test_seating_plan("U28549", "A321", "Neo")
+        create_test_passengers_on_flight(10)
+
+        flights = list_flights(summary=True)
+        self.assertEqual(1, len(flights))
+        self.assertEqual(60, flights[0].capacity)
+        self.assertEqual(10, flights[0].passenger_count)
+        self.assertEqual(50, flights[0].available_capacity)
+
+    def test_flights_listed_in_summary_mode_with_no_layout_have_no_capacity(self):
+        flights = list_flights(summary=True)
+        self.assertEqual(0, flights[0].capacity)
+        self.assertEqual(0, flights[0].passenger_count)
+
     def test_cannot_list_flights_for_missing_airline(self):
         flights = list_flights(-1)
         self.assertEqual(0, len(flights))
@@ -69,6 +112,18 @@ class TestFlights(unittest.TestCase):
         flight = get_flight(flight_id)
         self.assertEqual(1, len(flight.passengers))
 
+    def test_flight_changes_update_version_tag(self):
+        with Session.begin() as session:
+            flight_id = session.query(Flight).one().id
+
+        tables = [Flight.__tablename__, FlightPassenger.__tablename__]
+        tag = reference_cache.get_version_tag(*tables)
+        passenger = create_passenger("Some One", "F", datetime.datetime(1970, 2, 1).date(), "UK", "UK", "123456789")
+        add_passenger(flight_id, passenger)
+        passenger_tag = reference_cache.get_version_tag(*tables)
+        delete_flight(flight_id)
+        self.assertEqual(3, len({tag, passenger_tag, reference_cache.get_version_tag(*tables)}))
+
     def test_cannot_add_flight_with_same_departure_and_destination(self):
         with self.assertRaises(ValueError):
             create_flight("EasyJet", "LGW", "LGW", "U28549", "20/11/2021", "10:45", "2:25")
@@ -0,0 +1,83 @@
+import unittest
+from src.flight_model.model import create_database
+from src.flight_model.logic import create_airline, list_airlines_page
+from src.flight_model.logic import create_airport, list_airports_page
+from src.flight_model.logic import create_flight, list_flights_page
+from src.flight_model.logic import create_layout, list_layouts_page
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        for i in range(7):
+            create_airline(f"Airline {i}")
+
+    def test_first_page_has_no_previous_page(self):
+        page = list_airlines_page(3)
+        self.assertEqual(["Airline 0", "Airline 1", "Airline 2"], [airline.name for airline in page.items])
+        self.assertIsNone(page.previous_cursor)
+        self.assertEqual(page.items[-1].id, page.next_cursor)
+
+    def test_can_page_forwards(self):
+        page = list_airlines_page(3)
+        page = list_airlines_page(3, after=page.next_cursor)
+        self.assertEqual(["Airline 3", "Airline 4", "Airline 5"], [airline.name for airline in page.items])
+        self.assertEqual(page.items[0].id, page.previous_cursor)
+
+        page = list_airlines_page(3, after=page.next_cursor)
+        self.assertEqual(["Airline 6"], [airline.name for airline in page.items])
+        self.assertIsNone(page.next_cursor)
+
+    def test_can_page_backwards(self):
+        page = list_airlines_page(3)
+        page = list_airlines_page(3, after=page.next_cursor)
+        page = list_airlines_page(3, after=page.next_cursor)
+        page = list_airlines_page(3, before=page.previous_cursor)
+        self.assertEqual(["Airline 3", "Airline 4", "Airline 5"], [airline.name for airline in page.items])
+
+        page = list_airlines_page(3, before=page.previous_cursor)
+        self.assertEqual(["Airline 0", "Airline 1", "Airline 2"], [airline.name for airline in page.items])
+        self.assertIsNone(page.previous_cursor)
+
+    def test_missing_cursor_returns_first_page(self):
+        page = list_airlines_page(3, after=-1)
+        self.assertEqual("Airline 0", page.items[0].name)
+        self.assertIsNone(page.previous_cursor)
+
+    def test_cannot_use_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            list_airlines_page(0)
+
+    def test_can_page_airports(self):
+        for code in ["LGW", "RMU", "ALC", "MAN"]:
+            create_airport(code, code, "Europe/London")
+
+        page = list_airports_page(2)
+        self.assertEqual(["ALC", "LGW"], [airport.code for airport in page.items])
+        page = list_airports_page(2, after=page.next_cursor)
+        self.assertEqual(["MAN", "RMU"], [airport.code for airport in page.items])
+        self.assertIsNone(page.next_cursor)
+
+    def test_can_page_flights_by_departure_date(self):
+        create_airport("LGW", "London Gatwick", "Europe/London")
+        create_airport("RMU", "Murcia International Airport", "Europe/Madrid")
+        for day in [24, 20, 22, 21, 23]:
+            create_flight("Airline 0", "LGW", "RMU", f"U2{day}", f"{day}/11/2021", "10:45", "2:25")
+
+        page = list_flights_page(2, summary=True)
+        self.assertEqual(["U220", "U221"], [flight.number for flight in page.items])
+        page = list_flights_page(2, after=page.next_cursor, summary=True)
+        self.assertEqual(["U222", "U223"], [flight.number for flight in page.items])
+        self.assertEqual(0, page.items[0].capacity)
+        page = list_flights_page(2, after=page.next_cursor, summary=True)
+        self.assertEqual(["U224"], [flight.number for flight in page.items])
+
+    def test_can_page_layouts(self):
+        airline = list_airlines_page(1).items[0]
+        for aircraft in ["A321", "A319", "A320"]:
+            create_layout(airline.id, aircraft, "")
+
+        page = list_layouts_page(2)
+        self.assertEqual(["A319", "A320"], [layout.aircraft for layout in page.items])
+        page = list_layouts_page(2, after=page.next_cursor)
+        self.assertEqual(["A321"], [layout.aircraft for layout in page.items])
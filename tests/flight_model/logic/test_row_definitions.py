@@ -65,6 +65,18 @@ class TestRowDefinitions(unittest.TestCase):
         with self.assertRaises(IntegrityError):
             add_row_to_layout(layout.id, 100, "        ", "ABCDEF")
 
+    def test_cannot_add_row_with_repeated_seat_letters(self):
+        layout = list_layouts()[0]
+        with self.assertRaises(ValueError):
+            add_row_to_layout(layout.id, 100, "Economy", "ABCA")
+        self.assertEqual(10, len(get_layout(layout.id).row_definitions))
+
+    def test_cannot_update_row_with_repeated_seat_letters(self):
+        layout = list_layouts()[0]
+        with self.assertRaises(ValueError):
+            update_row_definition(layout.id, 1, "Economy", "ABCA")
+        self.assertEqual("ABC", [row for row in get_layout(layout.id).row_definitions if row.number == 1][0].seats)
+
     def test_cannot_update_row_definition_for_missing_layout(self):
         with self.assertRaises(ValueError):
             update_row_definition(-1, 1, "Business", "XYZ")
@@ -1,9 +1,11 @@
 import unittest
-from src.flight_model.model import create_database, Session, Flight, AircraftLayout, Seat
+import sqlalchemy as db
+from src.flight_model.model import create_database, Engine, Session, Flight, AircraftLayout, Seat
 from src.flight_model.logic import create_airport
 from src.flight_model.logic import create_airline
 from src.flight_model.logic import create_flight
-from src.flight_model.logic import apply_aircraft_layout, allocate_seat, create_layout, add_row_to_layout
+from src.flight_model.logic import apply_aircraft_layout, allocate_seat, allocate_seats, create_layout, \
+    add_row_to_layout
 from tests.flight_model.utils import create_test_passengers_on_flight
 
 
@@ -191,3 +193,89 @@ class TestSeatAllocations(unittest.TestCase):
 
             seat = session.query(Seat).filter(Seat.seat_number == "1B").one()
             self.assertIsNotNone(seat.passenger_id)
+
+    def test_allocation_uses_fixed_number_of_statements(self):
+        create_test_passengers_on_flight(1)
+
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+            aircraft_layout = session.query(AircraftLayout) \
+                .filter(AircraftLayout.airline_id == flight.airline.id,
+                        AircraftLayout.aircraft == "A321",
+                        AircraftLayout.name == "Neo")\
+                .one()
+
+        apply_aircraft_layout(flight.id, aircraft_layout.id)
+
+        statements = []
+
+        def _record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        db.event.listen(Engine, "before_cursor_execute", _record_statement)
+        try:
+            allocate_seat(flight.id, flight.passengers[0].id, "1A")
+        finally:
+            db.event.remove(Engine, "before_cursor_execute", _record_statement)
+
+        # Seat lookup, passenger membership, release of the current seat and the conditional update
+        self.assertEqual(4, len(statements))
+
+    def _apply_a321_layout(self, number_of_passengers):
+        create_test_passengers_on_flight(number_of_passengers)
+
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+            aircraft_layout = session.query(AircraftLayout) \
+                .filter(AircraftLayout.airline_id == flight.airline.id,
+                        AircraftLayout.aircraft == "A321",
+                        AircraftLayout.name == "Neo")\
+                .one()
+
+        apply_aircraft_layout(flight.id, aircraft_layout.id)
+        return flight
+
+    def _get_allocations(self):
+        with Session.begin() as session:
+            return {seat.passenger_id: seat.seat_number
+                    for seat in session.query(Seat).filter(Seat.passenger_id.isnot(None)).all()}
+
+    def test_can_allocate_seats_in_batch(self):
+        flight = self._apply_a321_layout(3)
+        passenger_ids = [passenger.id for passenger in flight.passengers]
+
+        conflicts = allocate_seats(flight.id, zip(passenger_ids, ["1A", "1B", "2C"]))
+
+        self.assertEqual([], conflicts)
+        self.assertEqual(dict(zip(passenger_ids, ["1A", "1B", "2C"])), self._get_allocations())
+
+    def test_batch_allocation_reports_conflicts(self):
+        flight = self._apply_a321_layout(3)
+        passenger_ids = [passenger.id for passenger in flight.passengers]
+        allocate_seat(flight.id, passenger_ids[0], "1A")
+
+        conflicts = allocate_seats(flight.id, [(passenger_ids[1], "1A"),
+                                               (passenger_ids[2], "1000A"),
+                                               (-1, "2A"),
+                                               (passenger_ids[1], "2B")])
+
+        self.assertEqual([passenger_ids[1], passenger_ids[2], -1], [conflict[0] for conflict in conflicts])
+        self.assertEqual({passenger_ids[0]: "1A", passenger_ids[1]: "2B"}, self._get_allocations())
+
+    def test_batch_allocation_can_reuse_seat_vacated_in_batch(self):
+        flight = self._apply_a321_layout(2)
+        passenger_ids = [passenger.id for passenger in flight.passengers]
+        allocate_seat(flight.id, passenger_ids[0], "1A")
+
+        conflicts = allocate_seats(flight.id, [(passenger_ids[0], "1B"), (passenger_ids[1], "1A")])
+
+        self.assertEqual([], conflicts)
+        self.assertEqual({passenger_ids[0]: "1B", passenger_ids[1]: "1A"}, self._get_allocations())
+
+    def test_cannot_allocate_seats_in_batch_with_no_layout(self):
+        create_test_passengers_on_flight(1)
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+
+        with self.assertRaises(ValueError):
+            allocate_seats(flight.id, [(flight.passengers[0].id, "1A")])
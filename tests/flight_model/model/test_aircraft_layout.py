@@ -27,6 +27,15 @@ class TestAircraftLayout(unittest.TestCase):
                 self.assertTrue(row in row_numbers)
                 self.assertEqual("ABCDEF", aircraft_layout.row_definitions[row - 1].seats)
 
+    def test_layout_generates_seat_numbers(self):
+        with Session.begin() as session:
+            aircraft_layout = session.query(AircraftLayout).one()
+            seat_numbers = aircraft_layout.seat_numbers
+
+        self.assertEqual(60, len(seat_numbers))
+        self.assertEqual(["1A", "1B", "1C", "1D", "1E", "1F"], seat_numbers[:6])
+        self.assertEqual("10F", seat_numbers[-1])
+
     def test_cannot_update_layout_to_create_duplicate(self):
         create_test_layout("EasyJet", "A320", "1", 10, "ABCDEF")
         with self.assertRaises(IntegrityError), Session.begin() as session:
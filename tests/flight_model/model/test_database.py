@@ -0,0 +1,106 @@
+import os
+import unittest
+from unittest.mock import patch
+from src.flight_model.model import create_database, upgrade_database, get_engine, Engine, Session, Airline
+from src.flight_model.model.database import get_sqlite_pragmas, _get_db_path
+from src.flight_model.logic import create_airline, create_airport, create_flight
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        create_airline("EasyJet")
+
+    def get_missing_indexes(self):
+        with Engine.connect() as connection:
+            rows = connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")
+            names = {row[0] for row in rows}
+        return sorted({"FLIGHT_DEPARTURE_DATE_IX", "FLIGHT_SEAT_UX"} - names)
+
+    def test_new_database_has_no_missing_indexes(self):
+        created = upgrade_database()
+        self.assertEqual([], created)
+
+    def test_can_upgrade_database_with_missing_indexes(self):
+        with Engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX FLIGHT_SEAT_UX")
+            connection.exec_driver_sql("DROP INDEX FLIGHT_DEPARTURE_DATE_IX")
+
+        created = upgrade_database()
+        self.assertEqual(["FLIGHT_DEPARTURE_DATE_IX", "FLIGHT_SEAT_UX"], sorted(created))
+
+    def test_cannot_upgrade_database_with_duplicate_seats(self):
+        create_airport("LGW", "London Gatwick", "Europe/London")
+        create_airport("RMU", "Murcia International Airport", "Europe/Madrid")
+        flight_id = create_flight("EasyJet", "LGW", "RMU", "U28549", "20/11/2021", "10:45", "2:25").id
+        with Engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX FLIGHT_SEAT_UX")
+            connection.exec_driver_sql("DROP INDEX FLIGHT_DEPARTURE_DATE_IX")
+            for _ in range(2):
+                connection.exec_driver_sql("INSERT INTO SEATS (flight_id, seat_number) VALUES (?, '1A')", (flight_id,))
+
+        with self.assertRaises(ValueError) as context:
+            upgrade_database()
+        self.assertIn("FLIGHT_SEAT_UX", str(context.exception))
+        self.assertIn(f"({flight_id}, 1A) x 2", str(context.exception))
+
+        # None of the missing indexes are created until the duplicates have been removed
+        self.assertEqual(["FLIGHT_DEPARTURE_DATE_IX", "FLIGHT_SEAT_UX"], self.get_missing_indexes())
+        with Engine.begin() as connection:
+            connection.exec_driver_sql("DELETE FROM SEATS WHERE id > 1")
+        self.assertEqual(["FLIGHT_DEPARTURE_DATE_IX", "FLIGHT_SEAT_UX"], sorted(upgrade_database()))
+
+    def test_recreating_database_removes_write_ahead_log(self):
+        db_path = _get_db_path()
+        for suffix in ["-wal", "-shm"]:
+            with open(db_path + suffix, mode="wb") as f:
+                f.write(b"stale")
+
+        create_database()
+        self.assertFalse(os.path.exists(db_path + "-wal"))
+        self.assertFalse(os.path.exists(db_path + "-shm"))
+        with Session.begin() as session:
+            self.assertEqual(0, session.query(Airline).count())
+
+    def test_engine_is_created_once(self):
+        self.assertIs(Engine, get_engine())
+        with Session() as session:
+            self.assertIs(Engine, session.get_bind())
+
+    def test_upgrade_preserves_data(self):
+        upgrade_database()
+        with Session.begin() as session:
+            airline = session.query(Airline).one()
+            self.assertEqual("EasyJet", airline.name)
+
+    @patch.dict(os.environ, {"FLIGHT_BOOKING_DB_PROFILE": ""})
+    def test_default_profile_has_no_pragmas(self):
+        self.assertEqual({}, get_sqlite_pragmas())
+
+    @patch.dict(os.environ, {"FLIGHT_BOOKING_DB_PROFILE": "performance"})
+    def test_performance_profile_enables_wal(self):
+        pragmas = get_sqlite_pragmas()
+        self.assertEqual("WAL", pragmas["journal_mode"])
+        self.assertEqual("NORMAL", pragmas["synchronous"])
+        self.assertEqual("busy_timeout", list(pragmas.keys())[0])
+
+    @patch.dict(os.environ, {"FLIGHT_BOOKING_DB_PROFILE": "performance", "FLIGHT_BOOKING_DB_SYNCHRONOUS": "full"})
+    def test_can_override_profile_setting(self):
+        pragmas = get_sqlite_pragmas()
+        self.assertEqual("WAL", pragmas["journal_mode"])
+        self.assertEqual("FULL", pragmas["synchronous"])
+
+    @patch.dict(os.environ, {"FLIGHT_BOOKING_DB_PROFILE": "missing"})
+    def test_cannot_use_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_sqlite_pragmas()
+
+    @patch.dict(os.environ, {"FLIGHT_BOOKING_DB_JOURNAL_MODE": "WAL; DROP TABLE SEATS"})
+    def test_cannot_use_invalid_pragma_value(self):
+        with self.assertRaises(ValueError):
+            get_sqlite_pragmas()
+
+    @patch.dict(os.environ, {"FLIGHT_BOOKING_DB_BUSY_TIMEOUT": "five seconds"})
+    def test_cannot_use_non_integer_pragma_value(self):
+        with self.assertRaises(ValueError):
+            get_sqlite_pragmas()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch, Mock
+from src.flight_model.model import ReferenceDataCache
+
+
+class TestReferenceDataCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cache = ReferenceDataCache(max_entries=2, ttl=60)
+
+    def test_value_is_loaded_once(self):
+        loader = Mock(return_value=[1, 2, 3])
+        self.assertEqual([1, 2, 3], self._cache.get("key", ["TABLE"], loader))
+        self.assertEqual([1, 2, 3], self._cache.get("key", ["TABLE"], loader))
+        loader.assert_called_once()
+        self.assertEqual(1, self._cache.hits)
+        self.assertEqual(1, self._cache.misses)
+
+    def test_value_is_reloaded_when_table_changes(self):
+        loader = Mock(side_effect=[[1], [2]])
+        self._cache.get("key", ["TABLE", "OTHER"], loader)
+        self._cache.invalidate("OTHER")
+        self.assertEqual([2], self._cache.get("key", ["TABLE", "OTHER"], loader))
+
+    def test_value_is_not_reloaded_when_unrelated_table_changes(self):
+        loader = Mock(return_value=[1])
+        self._cache.get("key", ["TABLE"], loader)
+        self._cache.invalidate("OTHER")
+        self._cache.get("key", ["TABLE"], loader)
+        loader.assert_called_once()
+
+    def test_value_is_reloaded_when_expired(self):
+        loader = Mock(side_effect=[[1], [2]])
+        with patch("src.flight_model.model.reference_cache.time.monotonic", return_value=1000):
+            self._cache.get("key", ["TABLE"], loader)
+        with patch("src.flight_model.model.reference_cache.time.monotonic", return_value=1061):
+            self.assertEqual([2], self._cache.get("key", ["TABLE"], loader))
+
+    def test_least_recently_used_value_is_discarded(self):
+        loaders = {key: Mock(return_value=[key]) for key in ["a", "b", "c"]}
+        self._cache.get("a", ["TABLE"], loaders["a"])
+        self._cache.get("b", ["TABLE"], loaders["b"])
+        self._cache.get("a", ["TABLE"], loaders["a"])
+        self._cache.get("c", ["TABLE"], loaders["c"])
+
+        self._cache.get("a", ["TABLE"], loaders["a"])
+        self._cache.get("b", ["TABLE"], loaders["b"])
+        self.assertEqual(1, loaders["a"].call_count)
+        self.assertEqual(2, loaders["b"].call_count)
+
+    def test_value_changed_during_load_is_not_cached(self):
+        def load_while_table_changes():
+            self._cache.invalidate("TABLE")
+            return [1]
+
+        loader = Mock(side_effect=load_while_table_changes)
+        self._cache.get("key", ["TABLE"], loader)
+        self._cache.get("key", ["TABLE"], loader)
+        self.assertEqual(2, loader.call_count)
+
+    def test_cache_can_be_disabled(self):
+        cache = ReferenceDataCache(ttl=0)
+        loader = Mock(return_value=[1])
+        cache.get("key", ["TABLE"], loader)
+        cache.get("key", ["TABLE"], loader)
+        self.assertEqual(2, loader.call_count)
+
+    def test_clear_discards_values(self):
+        loader = Mock(return_value=[1])
+        self._cache.get("key", ["TABLE"], loader)
+        self._cache.clear()
+        self._cache.get("key", ["TABLE"], loader)
+        self.assertEqual(2, loader.call_count)
+
+    def test_cached_function_returns_copy(self):
+        loader = Mock(return_value=[1, 2])
+
+        @self._cache.cached("TABLE")
+        def list_values(value):
+            return loader(value)
+
+        values = list_values(1)
+        values.append(3)
+        self.assertEqual([1, 2], list_values(1))
+        loader.assert_called_once_with(1)
+
+        list_values(2)
+        self.assertEqual(2, loader.call_count)
+
+    def test_version_tag_changes_when_table_changes(self):
+        tag = self._cache.get_version_tag("TABLE", "OTHER")
+        self._cache.invalidate("UNRELATED")
+        self.assertEqual(tag, self._cache.get_version_tag("TABLE", "OTHER"))
+        self._cache.invalidate("OTHER")
+        self.assertNotEqual(tag, self._cache.get_version_tag("TABLE", "OTHER"))
+
+    def test_version_tag_changes_when_cleared_or_expired(self):
+        with patch("src.flight_model.model.reference_cache.time.monotonic", return_value=1000):
+            tag = self._cache.get_version_tag("TABLE")
+            self._cache.clear()
+            cleared_tag = self._cache.get_version_tag("TABLE")
+        with patch("src.flight_model.model.reference_cache.time.monotonic", return_value=1060):
+            expired_tag = self._cache.get_version_tag("TABLE")
+        self.assertEqual(3, len({tag, cleared_tag, expired_tag}))
+
+    def test_version_tags_are_unique_to_cache(self):
+        self.assertNotEqual(self._cache.get_version_tag("TABLE"),
+                            ReferenceDataCache(ttl=60).get_version_tag("TABLE"))
+
+    def test_no_version_tag_when_disabled(self):
+        self.assertIsNone(ReferenceDataCache(ttl=0).get_version_tag("TABLE"))
@@ -0,0 +1,84 @@
+import unittest
+import datetime
+import subprocess
+import sys
+from src.flight_model.model import create_database, Session, Flight, get_timezone, get_timezone_backend, \
+    set_timezone_backend, utc_to_local, local_to_utc, list_timezone_names
+from src.flight_model.logic import create_airport
+from src.flight_model.logic import create_airline
+from src.flight_model.logic import create_flight
+
+
+class TestTimezones(unittest.TestCase):
+    def setUp(self) -> None:
+        self._backend = get_timezone_backend()
+
+    def tearDown(self) -> None:
+        set_timezone_backend(self._backend)
+
+    def test_timezone_is_cached(self):
+        self.assertIs(get_timezone("Europe/Madrid"), get_timezone("Europe/Madrid"))
+
+    def test_backends_agree_on_local_time(self):
+        utc_times = [datetime.datetime(2021, 3, 28, 0, 30), datetime.datetime(2021, 3, 28, 1, 30),
+                     datetime.datetime(2021, 10, 31, 0, 30), datetime.datetime(2021, 10, 31, 1, 30)]
+        local_times = {}
+        for backend in ["pytz", "zoneinfo"]:
+            set_timezone_backend(backend)
+            local_times[backend] = [utc_to_local(utc_time, "Europe/London").strftime("%H:%M %Z")
+                                    for utc_time in utc_times]
+
+        self.assertEqual(["00:30 GMT", "02:30 BST", "01:30 BST", "01:30 GMT"], local_times["pytz"])
+        self.assertEqual(local_times["pytz"], local_times["zoneinfo"])
+
+    def test_backends_agree_on_utc_time(self):
+        local_times = [datetime.datetime(2021, 1, 15, 10, 45), datetime.datetime(2021, 7, 15, 10, 45)]
+        utc_times = {}
+        for backend in ["pytz", "zoneinfo"]:
+            set_timezone_backend(backend)
+            utc_times[backend] = [local_to_utc(local_time, "Europe/Madrid") for local_time in local_times]
+
+        self.assertEqual([datetime.datetime(2021, 1, 15, 9, 45, tzinfo=datetime.timezone.utc),
+                          datetime.datetime(2021, 7, 15, 8, 45, tzinfo=datetime.timezone.utc)], utc_times["pytz"])
+        self.assertEqual(utc_times["pytz"], utc_times["zoneinfo"])
+
+    def test_can_list_timezone_names(self):
+        for backend in ["pytz", "zoneinfo"]:
+            with self.subTest(backend=backend):
+                set_timezone_backend(backend)
+                names = list_timezone_names()
+                self.assertIn("Europe/London", names)
+                self.assertEqual(sorted(names), names)
+
+    def test_loading_model_does_not_import_timezone_library(self):
+        code = "import sys; import src.flight_model.model; print('pytz' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual("False", result.stdout.strip())
+
+    def test_cannot_set_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            set_timezone_backend("missing")
+
+
+class TestFlightLocalTimes(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        create_airline("EasyJet")
+        create_airport("LGW", "London Gatwick", "Europe/London")
+        create_airport("RMU", "Murcia International Airport", "Europe/Madrid")
+        create_flight("EasyJet", "LGW", "RMU", "U28549", "20/11/2021", "10:45", "2:25")
+
+    def test_local_times(self):
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+            self.assertEqual("20/11/2021 10:45", flight.departs_localtime.strftime("%d/%m/%Y %H:%M"))
+            self.assertEqual("20/11/2021 14:10", flight.arrives_localtime.strftime("%d/%m/%Y %H:%M"))
+
+    def test_local_times_are_recalculated_when_flight_changes(self):
+        with Session.begin() as session:
+            flight = session.query(Flight).one()
+            self.assertEqual("10:45", flight.departs_localtime.strftime("%H:%M"))
+            flight.departure_date = datetime.datetime(2021, 11, 20, 12, 0)
+            flight.duration = datetime.timedelta(hours=3)
+            self.assertEqual("12:00", flight.departs_localtime.strftime("%H:%M"))
+            self.assertEqual("16:00", flight.arrives_localtime.strftime("%H:%M"))
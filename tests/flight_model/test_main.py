@@ -0,0 +1,24 @@
+import unittest
+from src.flight_model.__main__ import main
+from src.flight_model.model import create_database, Session, Airline
+from src.flight_model.logic import create_airline
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self) -> None:
+        create_database()
+        create_airline("EasyJet")
+
+    def confirm_database_unchanged(self):
+        with Session.begin() as session:
+            self.assertEqual(["EasyJet"], [airline.name for airline in session.query(Airline).all()])
+
+    def test_invalid_arguments_do_not_recreate_database(self):
+        for argv in [["--unknown"],
+                     ["--import-layouts"],
+                     ["--xlsx"],
+                     ["--upgrade", "--import-layouts", "layouts"]]:
+            with self.subTest(argv=argv), self.assertRaises(SystemExit) as context:
+                main(argv)
+            self.assertEqual(2, context.exception.code)
+        self.confirm_database_unchanged()